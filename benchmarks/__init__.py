@@ -0,0 +1 @@
+"""Performance tooling: cold-start report and recommender benchmarks."""
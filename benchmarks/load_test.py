@@ -0,0 +1,208 @@
+"""Concurrent HTTP load test for `recsys.service`.
+
+From the repo root:
+
+    python -m benchmarks.load_test --url http://127.0.0.1:8600
+    python -m benchmarks.load_test --synthetic 100k --concurrency 64 --duration 30
+
+`--synthetic ROWS` starts a private service on synthetic data (temporary
+feedback file, nothing under data/ is touched) and stops it afterwards.
+Each of `--concurrency` clients loops over a weighted mix of operations for
+`--duration` seconds; per operation it reports request count, errors,
+latency percentiles (p50/p95/p99) and requests per second.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+from benchmarks import synthetic
+from benchmarks.run import parse_scale
+from recsys import datasets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE = "New York"
+DISH_QUERIES = ["chicken, rice", "tomato, basil, pasta", "beef, onion, garlic", "egg, flour, sugar, butter"]
+ASPECT_MIXES = [["Food"], ["Service", "Price"], ["Ambiance"], ["Food", "Service", "Price", "Ambiance"]]
+
+
+# -------------------- Workload --------------------
+# Each entry: name -> (weight, request(rng) -> (method, path, json body or None)).
+OPERATIONS = {
+    "dishes": (3, lambda rng: ("POST", "/dishes", {"ingredients": rng.choice(DISH_QUERIES)})),
+    "rank": (3, lambda rng: ("POST", "/restaurants/rank", {"q": 0.70, "top_n": rng.choice([5, 10, 20])})),
+    "aspects": (2, lambda rng: ("POST", "/aspects", {"aspects": rng.choice(ASPECT_MIXES), "top_n": 10})),
+    "state_restaurants": (1, lambda rng: ("GET", f"/states/{STATE}/restaurants?limit=20", None)),
+    "recent_feedback": (1, lambda rng: ("GET", "/feedback?limit=10", None)),
+}
+WRITE = ("add_feedback", lambda rng: ("POST", "/feedback", {"rating": rng.randint(1, 5), "comment": "load test"}))
+
+
+async def client(session, url: str, ops: list, weights: list, deadline: float, seed: int, samples: dict) -> None:
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        name, request = rng.choices(ops, weights)[0]
+        method, path, body = request(rng)
+        t = time.perf_counter()
+        try:
+            async with session.request(method, url + path, json=body) as resp:
+                await resp.read()
+                ok = resp.status < 400
+        except Exception:
+            ok = False
+        samples.setdefault(name, []).append((time.perf_counter() - t, ok))
+
+
+async def run_load(url: str, concurrency: int, duration: float, write_weight: float, seed: int) -> tuple[dict, float]:
+    import aiohttp  # imported lazily: only the load test needs it
+
+    ops = [(name, request) for name, (_, request) in OPERATIONS.items()]
+    weights = [weight for weight, _ in OPERATIONS.values()]
+    if write_weight > 0:
+        ops.append(WRITE)
+        weights.append(write_weight)
+
+    samples: dict = {}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            client(session, url, ops, weights, deadline, seed + i, samples) for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    results = {}
+    everything = [s for name in samples for s in samples[name]]
+    for name, rows in {**samples, "total": everything}.items():
+        lat = np.array([t for t, _ in rows]) * 1000
+        results[name] = {
+            "requests": len(rows),
+            "errors": sum(not ok for _, ok in rows),
+            "p50_ms": float(np.percentile(lat, 50)) if len(lat) else 0.0,
+            "p95_ms": float(np.percentile(lat, 95)) if len(lat) else 0.0,
+            "p99_ms": float(np.percentile(lat, 99)) if len(lat) else 0.0,
+            "req_per_s": len(rows) / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+def report(results: dict) -> str:
+    lines = [f"{'operation':<20}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"]
+    for name, r in results.items():
+        lines.append(f"{name:<20}{r['requests']:>10}{r['errors']:>8}{r['p50_ms']:>10.1f}"
+                     f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['req_per_s']:>10.1f}")
+    return "\n".join(lines)
+
+
+# -------------------- Synthetic service --------------------
+def serve_synthetic(rows: int, port: int, threads: int | None) -> None:
+    """Run the service on synthetic frames (blocks; used by the child process)."""
+    from aiohttp import web
+
+    from recsys.engine import RecommenderEngine
+    from recsys.service import create_app
+
+    tmp = tempfile.mkdtemp(prefix="recsys-load-")
+    trip_path = os.path.join(tmp, "trip.csv")
+    synthetic.tripadvisor(rows).to_csv(trip_path, index=False)
+    state_paths = {}
+    for i, state in enumerate(datasets.STATES):
+        state_paths[state] = os.path.join(tmp, f"state{i}.csv")
+        synthetic.state(max(rows // 10, 100), seed=i).to_csv(state_paths[state], index=False)
+    feedback_path = os.path.join(tmp, "feedback.csv")
+    synthetic.feedback(1_000).to_csv(feedback_path, index=False)
+
+    engine = RecommenderEngine(
+        frames={
+            "recipes": synthetic.recipes(rows),
+            "trip": datasets.load_trip_sentiment(trip_path),
+            "states": {state: datasets.load_state(path) for state, path in state_paths.items()},
+            "sentiment": synthetic.final_sentiment(rows),
+        },
+        feedback_path=feedback_path,
+    )
+    engine.preload()
+    web.run_app(create_app(engine, threads), host="127.0.0.1", port=port, print=None)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_synthetic(rows: int, threads: int | None, timeout: float = 300) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    cmd = [sys.executable, "-m", "benchmarks.load_test", "--serve", str(rows), "--port", str(port)]
+    if threads:
+        cmd += ["--threads", str(threads)]
+    proc = subprocess.Popen(cmd, cwd=ROOT)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Synthetic service exited with code {proc.returncode}.")
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1):
+                return proc, url
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Synthetic service did not become healthy in time.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running service.")
+    target.add_argument("--synthetic", help="Start a service on this many synthetic rows, e.g. 100k.")
+    target.add_argument("--serve", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8600, help=argparse.SUPPRESS)
+    parser.add_argument("--threads", type=int, default=None, help="Service worker threads (--synthetic only).")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load.")
+    parser.add_argument("--write-weight", type=float, default=0.0,
+                        help="Relative weight of POST /feedback (0 = read-only).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write results to this file.")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve_synthetic(parse_scale(args.serve), args.port, args.threads)
+        return
+
+    proc = None
+    url = args.url.rstrip("/") if args.url else None
+    if args.synthetic:
+        proc, url = start_synthetic(parse_scale(args.synthetic), args.threads)
+    try:
+        samples, elapsed = asyncio.run(run_load(url, args.concurrency, args.duration, args.write_weight, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    results = summarize(samples, elapsed)
+    print(report(results))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+    sys.exit(1 if results["total"]["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
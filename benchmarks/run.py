@@ -0,0 +1,309 @@
+"""Benchmarks for every recommender / data path on synthetic data.
+
+From the repo root:
+
+    python -m benchmarks.run                                  # 1k,10k,100k
+    python -m benchmarks.run --scales 1k,1m --only recommend_dishes
+    python -m benchmarks.run --save-baseline                  # record p50s
+    python -m benchmarks.run --check                          # fail on regressions
+
+Per operation and scale it reports latency percentiles (p50/p95/p99),
+throughput (rows/s and ops/s) and peak traced memory of one extra run.
+`--check` compares p50 against `benchmarks/baseline.json` and exits non-zero
+when any entry is more than `--tolerance` slower.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from recsys import aggregate, feedback, recommenders, resolve, sentiment, similarity
+from recsys.geo import GeoIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+DISH_QUERY = "chicken, salt, rice, tomato, lettuce, pepper, cucumber"
+
+
+# -------------------- Benchmarks --------------------
+# Each entry: name -> (setup(rows, tmpdir) -> state, run(state)).
+def _dishes_setup(n, tmp):
+    return synthetic.recipes(n)[["Title", "Cleaned_Ingredients"]]
+
+
+def _ranker_setup(n, tmp):
+    df = synthetic.tripadvisor(n)
+    cols = recommenders.sentiment_columns(df)
+    X, y, _ = recommenders.make_labels(df, cols, 0.7)
+    return {"df": df, "X": X, "y": y}
+
+
+def _ranker_predict_setup(n, tmp):
+    state = _ranker_setup(n, tmp)
+    state["clf"], _, _ = recommenders.train_ranker(state["X"], state["y"])
+    return state
+
+
+def _feedback_setup(n, tmp):
+    path = os.path.join(tmp, "feedback.csv")
+    synthetic.feedback(n).to_csv(path, index=False)
+    return {"path": path, "size": os.path.getsize(path)}
+
+
+def _feedback_write(s):
+    os.truncate(s["path"], s["size"])  # back to the n-row file, so every run appends to the same one
+    feedback.append_feedback(s["path"], 4, "benchmark comment")
+
+
+def _zomato_csv_setup(n, tmp):
+    path = os.path.join(tmp, "zomato.csv")
+    synthetic.zomato(n).to_csv(path, index=False)
+    return path
+
+
+def _sentiment_setup(n, tmp):
+    df = synthetic.tripadvisor(n, sentiment=False)
+    return df["Name"].tolist(), df["Comments"].tolist()
+
+
+def _sentiment_update_setup(n, tmp):
+    """Store already holding n scored feedback rows; each run appends and scores 10 more."""
+    path = os.path.join(tmp, "feedback.csv")
+    synthetic.feedback(n).to_csv(path, index=False)
+    store = sentiment.SentimentStore(os.path.join(tmp, "sentiment.sqlite"))
+    sentiment.update_source(store, "feedback", path, "Restaurant", "Comments", workers=1)
+    return {"store": store, "path": path, "extra": synthetic.feedback(10, seed=1)}
+
+
+def _sentiment_update(s):
+    s["extra"].to_csv(s["path"], mode="a", header=False, index=False)
+    sentiment.update_source(s["store"], "feedback", s["path"], "Restaurant", "Comments", workers=1)
+
+
+def _similarity_setup(n, tmp):
+    return similarity.CommentSimilarity(similarity.build(synthetic.tripadvisor(n)))
+
+
+def _engine_setup(cache_size):
+    def setup(n, tmp):
+        from recsys.engine import RecommenderEngine
+
+        engine = RecommenderEngine(frames={"recipes": synthetic.recipes(n)}, cache_size=cache_size)
+        engine.dishes(DISH_QUERY)  # build the index (and, when cached, the entry)
+        return engine
+    return setup
+
+
+def _resolve_setup(n, tmp):
+    """n TripAdvisor rows plus a re-spelled copy of half of them without street addresses."""
+    df = synthetic.tripadvisor(n, sentiment=False)
+    copy = df.sample(frac=0.5, random_state=0)
+    copy = copy.assign(Name="The " + copy["Name"].str.upper(), **{"Street Address": ""})
+    return pd.concat([
+        resolve.standardize(df, "tripadvisor", resolve.TRIPADVISOR_COLUMNS),
+        resolve.standardize(copy, "copy", resolve.TRIPADVISOR_COLUMNS),
+    ], ignore_index=True)
+
+
+def _geo_setup(n, tmp):
+    return GeoIndex(synthetic.lat_lon(n))
+
+
+BENCHMARKS = {
+    "recommend_dishes": (
+        _dishes_setup,
+        lambda df: recommenders.recommend_dishes(df, DISH_QUERY),
+    ),
+    "engine_dishes_uncached": (
+        _engine_setup(0),
+        lambda engine: engine.dishes(DISH_QUERY),
+    ),
+    "engine_dishes_cached": (
+        _engine_setup(1024),
+        lambda engine: engine.dishes(DISH_QUERY),
+    ),
+    "ranker_train": (
+        _ranker_setup,
+        lambda s: recommenders.train_ranker(s["X"], s["y"]),
+    ),
+    "ranker_top_n": (
+        _ranker_predict_setup,
+        lambda s: recommenders.rank_restaurants(s["clf"], s["df"], s["X"], 10),
+    ),
+    "recommend_restaurants": (
+        lambda n, tmp: synthetic.final_sentiment(n),
+        lambda df: recommenders.recommend_restaurants(df, ["Food", "Service"], 10),
+    ),
+    "feedback_write": (
+        _feedback_setup,
+        _feedback_write,
+    ),
+    "insights_in_memory": (
+        lambda n, tmp: synthetic.zomato(n),
+        lambda df: aggregate.aggregate_in_memory(df),
+    ),
+    "insights_chunked": (
+        _zomato_csv_setup,
+        lambda path: aggregate.aggregate_csv(path),
+    ),
+    "sentiment_score": (
+        _sentiment_setup,
+        lambda s: sentiment.score_chunk(*s),
+    ),
+    "sentiment_incremental": (
+        _sentiment_update_setup,
+        _sentiment_update,
+    ),
+    "comment_similarity_build": (
+        lambda n, tmp: synthetic.tripadvisor(n),
+        lambda df: similarity.build(df),
+    ),
+    "comment_similarity_lookup": (
+        _similarity_setup,
+        lambda index: index.similar("Restaurant 0", 10),
+    ),
+    "resolve_restaurants": (
+        _resolve_setup,
+        resolve.resolve,
+    ),
+    "geo_radius": (
+        _geo_setup,
+        lambda idx: idx.radius(40.75, -73.98, 5.0),
+    ),
+    "geo_nearest": (
+        _geo_setup,
+        lambda idx: idx.nearest(40.75, -73.98, 10, cuisine="pizza"),
+    ),
+}
+
+
+# -------------------- Runner --------------------
+def parse_scale(s: str) -> int:
+    s = s.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(s[-1], 1)
+    return int(float(s[:-1] if s[-1] in "km" else s) * mult)
+
+
+def bench(name: str, rows: int, repeat: int, max_seconds: float) -> dict:
+    """Time one benchmark at one scale (setup excluded)."""
+    setup, run = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        state = setup(rows, tmp)
+        run(state)  # warm-up
+
+        times = []
+        started = time.perf_counter()
+        while len(times) < repeat:
+            t = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - t)
+            if len(times) >= 3 and time.perf_counter() - started > max_seconds:
+                break
+
+        tracemalloc.start()
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    lat = np.array(times) * 1000
+    p50 = float(np.percentile(lat, 50))
+    return {
+        "rows": rows,
+        "runs": len(times),
+        "p50_ms": p50,
+        "p95_ms": float(np.percentile(lat, 95)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "ops_per_s": 1000 / p50 if p50 else float("inf"),
+        "rows_per_s": rows * 1000 / p50 if p50 else float("inf"),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def key(name: str, rows: int) -> str:
+    return f"{name}@{rows}"
+
+
+def check(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """p50 regressions against the baseline (entries missing there are skipped)."""
+    problems = []
+    for k, r in results.items():
+        base = baseline.get(k)
+        if base and r["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            problems.append(f"{k}: p50 {r['p50_ms']:.2f} ms vs baseline {base['p50_ms']:.2f} ms "
+                            f"(+{tolerance:.0%} allowed)")
+    return problems
+
+
+def report(results: dict) -> str:
+    lines = [f"{'benchmark':<34}{'runs':>5}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}"
+             f"{'rows/s':>13}{'peak MB':>10}"]
+    for k, r in results.items():
+        lines.append(f"{k:<34}{r['runs']:>5}{r['p50_ms']:>11.2f}{r['p95_ms']:>11.2f}{r['p99_ms']:>11.2f}"
+                     f"{r['rows_per_s']:>13,.0f}{r['peak_mb']:>10.1f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1k,10k,100k", help="Comma-separated row counts, e.g. 1k,10k,1m.")
+    parser.add_argument("--only", default="", help="Comma-separated benchmark names.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="Stop repeating (after 3 runs) once this much time is spent.")
+    parser.add_argument("--json", help="Also write results to this file.")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    names = [n for n in args.only.split(",") if n] or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+    scales = [parse_scale(s) for s in args.scales.split(",") if s.strip()]
+
+    results = {}
+    for name in names:
+        for rows in scales:
+            results[key(name, rows)] = bench(name, rows, args.repeat, args.max_seconds)
+            print(report({key(name, rows): results[key(name, rows)]}).splitlines()[1], flush=True)
+
+    print()
+    print(report(results))
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline) as fh:
+                baseline = json.load(fh)
+        baseline.update(results)
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+        print(f"Baseline written to {os.path.relpath(args.baseline, ROOT)}")
+
+    if args.check:
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline) as fh:
+                baseline = json.load(fh)
+        problems = check(results, baseline, args.tolerance)
+        for p in problems:
+            print("REGRESSION:", p)
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Cold-start report: import and first-render cost per page.
+
+Each page runs in a fresh interpreter so nothing is warm. The child times
+the page's *module-level* imports one by one (imports deferred into
+functions are excluded, since that is the point of deferring them), then
+times the first `AppTest` run of the script.
+
+From the repo root:
+
+    python -m benchmarks.startup                                  # report
+    python -m benchmarks.startup --synthetic 3k --save-baseline   # record current numbers
+    python -m benchmarks.startup --synthetic 3k --check           # fail on regressions
+
+`--synthetic ROWS` runs the pages in a temporary working directory whose
+datasets are synthetic (the repo's own are Git LFS pointers, on which most
+pages only render an error); the baseline is recorded that way. `--check`
+exits non-zero when a page raised, when its total exceeds `--budget-ms`, or
+when it is more than `--tolerance` slower than the saved baseline.
+"""
+import argparse
+import ast
+import glob
+import importlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+
+
+def app_scripts() -> list[str]:
+    """Homepage plus every page, as repo-relative paths."""
+    pages = sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+    return ["Homepage.py"] + [os.path.relpath(p, ROOT) for p in pages]
+
+
+def top_level_imports(path: str) -> list[str]:
+    """Modules imported by module-level statements of a script, in order."""
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    mods = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            mods += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            mods.append(node.module)
+    return list(dict.fromkeys(mods))
+
+
+def _child(script: str, timeout: float) -> dict:
+    """Runs inside the fresh interpreter; returns timings in milliseconds."""
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    base_ms = (time.perf_counter() - t0) * 1000
+
+    imports = {}
+    for mod in top_level_imports(os.path.join(ROOT, script)):
+        t = time.perf_counter()
+        importlib.import_module(mod)
+        imports[mod] = (time.perf_counter() - t) * 1000
+
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=timeout)
+    t = time.perf_counter()
+    at.run()
+    render_ms = (time.perf_counter() - t) * 1000
+
+    import_ms = sum(imports.values())
+    return {
+        "streamlit_ms": base_ms,
+        "import_ms": import_ms,
+        "render_ms": render_ms,
+        "total_ms": import_ms + render_ms,
+        "imports": imports,
+        "exceptions": [str(e.value) for e in at.exception],
+    }
+
+
+def synthetic_workdir(rows: int) -> str:
+    """Temporary working directory with the app's assets and synthetic datasets.
+
+    The pages read `data/...` relative to the working directory, so caches and
+    feedback they write land here too, not in the repo.
+    """
+    # Imported here, not at module level: the child must start with nothing warm.
+    from benchmarks import synthetic
+    from recsys import datasets
+
+    workdir = tempfile.mkdtemp(prefix="recsys-startup-")
+    shutil.copytree(os.path.join(ROOT, "data"), os.path.join(workdir, "data"), symlinks=True)
+    os.chdir(workdir)
+    try:
+        synthetic.recipes(rows).to_csv(datasets.RECIPES, index=False)
+        synthetic.trip(rows).to_csv(datasets.TRIP, index=False)
+        synthetic.tripadvisor(rows).to_csv(datasets.TRIP_SENTIMENT, index=False)
+        synthetic.lat_lon(rows).to_excel(datasets.LAT_LON, index=False)
+        synthetic.final_sentiment(rows).to_excel(datasets.SENTIMENT, index=False)
+        synthetic.feedback(max(rows // 10, 100)).to_csv(datasets.FEEDBACK, index=False)
+        synthetic.zomato(rows).to_csv(datasets.ZOMATO, index=False)
+        for i, path in enumerate(datasets.STATES.values()):
+            synthetic.state(max(rows // 5, 100), seed=i).to_csv(path, index=False)
+    finally:
+        os.chdir(ROOT)
+    return workdir
+
+
+def measure(script: str, timeout: float = 120, workdir: str = ROOT) -> dict:
+    """Run `_child` for `script` in a new process started in `workdir`."""
+    path = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": path}
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", script, "--timeout", str(timeout)],
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def check(results: dict, baseline: dict, budget_ms: float, tolerance: float) -> list[str]:
+    """Human-readable regressions (empty when within budget)."""
+    problems = []
+    for script, r in results.items():
+        if "error" in r:
+            problems.append(f"{script}: {r['error']}")
+            continue
+        for exc in r.get("exceptions", []):
+            problems.append(f"{script}: raised {exc}")
+        if r["total_ms"] > budget_ms:
+            problems.append(f"{script}: {r['total_ms']:.0f} ms exceeds budget {budget_ms:.0f} ms")
+        base = baseline.get(script)
+        if base and r["total_ms"] > base["total_ms"] * (1 + tolerance):
+            problems.append(
+                f"{script}: {r['total_ms']:.0f} ms vs baseline {base['total_ms']:.0f} ms "
+                f"(+{tolerance:.0%} allowed)"
+            )
+    return problems
+
+
+def report(results: dict) -> str:
+    lines = [f"{'script':<45}{'import':>10}{'render':>10}{'total':>10}  heaviest imports"]
+    for script, r in results.items():
+        if "error" in r:
+            lines.append(f"{script:<45}{'error: ' + r['error']}")
+            continue
+        heavy = sorted(r["imports"].items(), key=lambda kv: -kv[1])[:3]
+        heavy_s = ", ".join(f"{m} {ms:.0f}" for m, ms in heavy)
+        lines.append(
+            f"{script:<45}{r['import_ms']:>8.0f}ms{r['render_ms']:>8.0f}ms{r['total_ms']:>8.0f}ms  {heavy_s}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scripts", nargs="*", help="Scripts to measure (default: Homepage + pages).")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--synthetic", help="Run on this many synthetic rows per dataset, e.g. 3k.")
+    parser.add_argument("--budget-ms", type=float, default=5000)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(args.child, args.timeout)))
+        return
+
+    workdir = ROOT
+    if args.synthetic:
+        from benchmarks.run import parse_scale
+
+        workdir = synthetic_workdir(parse_scale(args.synthetic))
+    try:
+        results = {s: measure(s, args.timeout, workdir) for s in (args.scripts or app_scripts())}
+    finally:
+        if workdir != ROOT:
+            shutil.rmtree(workdir, ignore_errors=True)
+    print(report(results))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+        print(f"Baseline written to {os.path.relpath(args.baseline, ROOT)}")
+
+    if args.check:
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline) as fh:
+                baseline = json.load(fh)
+        problems = check(results, baseline, args.budget_ms, args.tolerance)
+        for p in problems:
+            print("REGRESSION:", p)
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
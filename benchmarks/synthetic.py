@@ -0,0 +1,196 @@
+"""Schema-faithful synthetic stand-ins for the (Git LFS) datasets.
+
+Every generator is seeded and mostly vectorized; 1M-row frames build in
+seconds rather than minutes.
+Column names and value formats mirror the real files ('4.5 of 5 bubbles',
+'1,234 reviews', "['1 cup flour', ...]", '4.1/5', '1,200', ...).
+"""
+import numpy as np
+import pandas as pd
+
+from recsys.recommenders import ASPECTS
+
+INGREDIENTS = [
+    "salt", "pepper", "olive oil", "garlic", "onion", "butter", "sugar", "flour", "egg",
+    "milk", "chicken", "beef", "pork", "fish", "shrimp", "rice", "pasta", "tomato",
+    "potato", "carrot", "celery", "lemon", "lime", "cilantro", "parsley", "basil",
+    "thyme", "rosemary", "cumin", "paprika", "chili", "ginger", "soy sauce", "vinegar",
+    "honey", "yoghurt", "cream", "cheese", "parmesan", "mozzarella", "zucchini",
+    "spinach", "lettuce", "cucumber", "avocado", "beans", "corn", "mushroom", "bacon",
+]
+UNITS = ["1 cup", "2 tbsp", "1 tsp", "1/2 cup", "3 oz", "1 lb", "2", "1 pinch"]
+CUISINES = [
+    "American", "Italian", "Pizza", "Mexican", "Chinese", "Japanese", "Sushi", "Thai",
+    "Indian", "French", "Mediterranean", "Bar", "Cafe", "Seafood", "Steakhouse",
+    "Vegetarian Friendly", "Fast Food", "Barbecue", "Korean", "Vietnamese",
+]
+ZOMATO_CUISINES = [
+    "North Indian", "Chinese", "South Indian", "Fast Food", "Biryani", "Continental",
+    "Desserts", "Cafe", "Beverages", "Italian", "Bakery", "Street Food", "Pizza",
+    "Burger", "Seafood", "Andhra", "Mughlai", "Kerala", "Momos", "Ice Cream",
+]
+ZOMATO_CITIES = [
+    "BTM", "Banashankari", "Bannerghatta Road", "Basavanagudi", "Bellandur",
+    "Brigade Road", "Brookefield", "Church Street", "Electronic City", "Frazer Town",
+    "HSR", "Indiranagar", "JP Nagar", "Jayanagar", "Kalyan Nagar", "Koramangala",
+    "Lavelle Road", "Malleshwaram", "Marathahalli", "MG Road", "New BEL Road",
+    "Old Airport Road", "Rajajinagar", "Residency Road", "Sarjapur Road", "Whitefield",
+]
+STATE_CITIES = {
+    "NY": ["New York City", "Brooklyn", "Buffalo", "Rochester"],
+    "NJ": ["Newark", "Jersey City", "Hoboken", "Princeton"],
+    "CA": ["Los Angeles", "San Francisco", "San Diego", "San Jose"],
+    "TX": ["Houston", "Austin", "Dallas", "San Antonio"],
+    "WA": ["Seattle", "Spokane", "Tacoma", "Bellevue"],
+}
+WORDS = [
+    "great", "food", "service", "friendly", "staff", "delicious", "slow", "price",
+    "ambiance", "cozy", "loud", "fresh", "portion", "tasty", "rude", "clean", "view",
+    "expensive", "cheap", "amazing", "average", "waiter", "dessert", "wine", "menu",
+]
+BUBBLES = np.array(["3.0", "3.5", "4.0", "4.5", "5.0"])
+
+
+def _rng(seed: int) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def _join_choices(rng, vocab: list[str], n: int, lo: int, hi: int, sep: str) -> list[str]:
+    """n strings, each `sep`-joining between lo and hi distinct-ish vocab items."""
+    vocab = np.asarray(vocab)
+    counts = rng.integers(lo, hi + 1, n)
+    picks = rng.integers(0, len(vocab), counts.sum())
+    items = vocab[picks]
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    return [sep.join(items[bounds[i]:bounds[i + 1]]) for i in range(n)]
+
+
+def _sentences(rng, n: int, lo: int = 8, hi: int = 30) -> list[str]:
+    return _join_choices(rng, WORDS, n, lo, hi, " ")
+
+
+def _addresses(rng, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """('123 Main St', 'Austin, TX 78701')-style street / location pairs."""
+    states = np.array(list(STATE_CITIES))
+    cities = np.array(list(STATE_CITIES.values()))
+    si = rng.integers(0, len(states), n)
+    st = states[si]
+    city = cities[si, rng.integers(0, cities.shape[1], n)]
+    street = pd.Series(rng.integers(1, 9999, n)).astype(str) + " Main St"
+    zipc = pd.Series(rng.integers(10000, 99999, n)).astype(str)
+    location = pd.Series(city) + ", " + pd.Series(st) + " " + zipc
+    return street.to_numpy(), location.to_numpy()
+
+
+def recipes(n: int, seed: int = 0) -> pd.DataFrame:
+    """Food Ingredients and Recipe Dataset."""
+    rng = _rng(seed)
+    counts = rng.integers(3, 12, n)
+    units = np.asarray(UNITS)[rng.integers(0, len(UNITS), counts.sum())]
+    ingr = np.asarray(INGREDIENTS)[rng.integers(0, len(INGREDIENTS), counts.sum())]
+    items = np.char.add(np.char.add(units, " "), ingr)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    cleaned = ["['" + "', '".join(items[bounds[i]:bounds[i + 1]]) + "']" for i in range(n)]
+    return pd.DataFrame({
+        "Title": [f"Dish {i}" for i in range(n)],
+        "Ingredients": cleaned,
+        "Instructions": "Mix and cook.",
+        "Image_Name": [f"dish-{i}" for i in range(n)],
+        "Cleaned_Ingredients": cleaned,
+    })
+
+
+def tripadvisor(n: int, seed: int = 0, sentiment: bool = True) -> pd.DataFrame:
+    """TripAdvisor_RestauarantRecommendation(1).csv; `sentiment` adds the aspect columns."""
+    rng = _rng(seed)
+    street, location = _addresses(rng, n)
+    df = pd.DataFrame({
+        "Name": [f"Restaurant {i}" for i in range(n)],
+        "Street Address": street,
+        "Location": location,
+        "Type": _join_choices(rng, CUISINES, n, 1, 3, ", "),
+        "Reviews": np.char.add(BUBBLES[rng.integers(0, len(BUBBLES), n)], " of 5 bubbles"),
+        "No of Reviews": [f"{v:,} reviews" for v in rng.integers(1, 5000, n)],
+        "Comments": _sentences(rng, n),
+        "Contact Number": "+1 555-0100",
+        "Trip_advisor Url": [f"/Restaurant_Review-{i}.html" for i in range(n)],
+        "Menu": "Check The Website for a Menu",
+        "Price_Range": np.array(["$", "$$ - $$$", "$$$$"])[rng.integers(0, 3, n)],
+    })
+    if sentiment:
+        for aspect in ASPECTS:
+            df[f"Average {aspect} Sentiment"] = rng.uniform(-1, 1, n).round(4)
+    return df
+
+
+def trip(n: int, seed: int = 0) -> pd.DataFrame:
+    """TripAdvisor_RestauarantRecommendation.csv: one 'street, city, ST zip' `address` column."""
+    df = tripadvisor(n, seed, sentiment=False)
+    address = df.pop("Street Address") + ", " + df.pop("Location")
+    df.insert(1, "address", address)
+    return df
+
+
+def state(n: int, seed: int = 0) -> pd.DataFrame:
+    """data/<State>/<State>.csv (TripAdvisor columns without sentiment)."""
+    return tripadvisor(n, seed, sentiment=False)
+
+
+def final_sentiment(n: int, seed: int = 0) -> pd.DataFrame:
+    """final_sentiment_df.xlsx."""
+    rng = _rng(seed)
+    df = pd.DataFrame({
+        "name": [f"Restaurant {i}" for i in range(n)],
+        "url": [f"https://www.tripadvisor.com/Restaurant_Review-{i}.html" for i in range(n)],
+    })
+    for aspect in ASPECTS:
+        df[f"Average {aspect} Sentiment"] = rng.uniform(-1, 1, n).round(4)
+    return df
+
+
+def feedback(n: int, seed: int = 0) -> pd.DataFrame:
+    """feedback.csv."""
+    rng = _rng(seed)
+    return pd.DataFrame({
+        "Reviews": [f"{r} of 5 bubbles" for r in rng.integers(1, 6, n)],
+        "Comments": _sentences(rng, n, 3, 15),
+        "Restaurant": [f"Restaurant {i}" for i in rng.integers(0, max(n // 10, 1), n)],
+    })
+
+
+def lat_lon(n: int, seed: int = 0) -> pd.DataFrame:
+    """df_with_lat_lon.xlsx: TripAdvisor rows with coordinates around the five states."""
+    rng = _rng(seed)
+    df = tripadvisor(n, seed, sentiment=False)
+    centers = np.array([(40.75, -73.98), (40.06, -74.41), (36.78, -119.42), (31.0, -99.0), (47.4, -120.5)])
+    c = centers[rng.integers(0, len(centers), n)]
+    df["lat"] = c[:, 0] + rng.normal(0, 0.3, n)
+    df["lon"] = c[:, 1] + rng.normal(0, 0.3, n)
+    return df
+
+
+def zomato(n: int, seed: int = 0) -> pd.DataFrame:
+    """zomato.csv (Bangalore schema)."""
+    rng = _rng(seed)
+    rate = np.char.add(rng.uniform(2.0, 4.9, n).round(1).astype(str), "/5")
+    rate = np.where(rng.random(n) < 0.1, "NEW", rate)
+    cost = rng.choice([200, 300, 400, 500, 600, 800, 1000, 1200, 1500, 2000, 3000, 4000], n)
+    return pd.DataFrame({
+        "url": [f"https://www.zomato.com/bangalore/r{i}" for i in range(n)],
+        "address": [f"{i}, 1st Main, Bangalore" for i in range(n)],
+        "name": [f"Zomato {i}" for i in range(n)],
+        "online_order": np.where(rng.random(n) < 0.6, "Yes", "No"),
+        "book_table": np.where(rng.random(n) < 0.1, "Yes", "No"),
+        "rate": rate,
+        "votes": rng.integers(0, 5000, n),
+        "phone": "080 12345678",
+        "location": np.asarray(ZOMATO_CITIES)[rng.integers(0, len(ZOMATO_CITIES), n)],
+        "rest_type": "Casual Dining",
+        "dish_liked": "Biryani, Paneer Tikka",
+        "cuisines": _join_choices(rng, ZOMATO_CUISINES, n, 1, 4, ", "),
+        "approx_cost(for two people)": [f"{c:,}" for c in cost],
+        "reviews_list": "[('Rated 4.0', 'RATED\\n  " + pd.Series(_sentences(rng, n, 5, 12)) + "')]",
+        "menu_item": "[]",
+        "listed_in(type)": np.array(["Delivery", "Dine-out", "Cafes"])[rng.integers(0, 3, n)],
+        "listed_in(city)": np.asarray(ZOMATO_CITIES)[rng.integers(0, len(ZOMATO_CITIES), n)],
+    })
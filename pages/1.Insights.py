@@ -4,8 +4,12 @@ import itertools
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from recsys import datasets, tracing
+from recsys.aggregate import aggregate_csv
+
 # Set page layout and sidebar
 st.set_page_config(layout='wide', initial_sidebar_state='expanded')
+tracing.begin("Insights")
 st.sidebar.image('data/App_icon.png')
 
 # Main page title
@@ -15,19 +19,21 @@ Discover fascinating trends and data-driven analysis of the culinary landscape.
 """)
 
 # Load data
-df = pd.read_csv("./data/raw/TripAdvisor_RestauarantRecommendation.csv")
-df = df.drop(['Contact Number', 'Trip_advisor Url', 'Menu'], axis=1)
-df = df.drop([1744, 2866])
-df = df.reset_index(drop=True)
-df.Comments = df.Comments.fillna('')
-df.Type = df.Type.fillna(df.Type.value_counts().index[0])
+with tracing.span("load_csv"):
+    df = pd.read_csv("./data/raw/TripAdvisor_RestauarantRecommendation.csv")
+    df = df.drop(['Contact Number', 'Trip_advisor Url', 'Menu'], axis=1)
+    df = df.drop([1744, 2866])
+    df = df.reset_index(drop=True)
+    df.Comments = df.Comments.fillna('')
+    df.Type = df.Type.fillna(df.Type.value_counts().index[0])
 
 # Sidebar and main content layout
 col1, col2 = st.columns([1, 2])
 
 # Visualization for popular cuisine types
-types = list(itertools.chain(*[t.split(",") for t in df.Type if isinstance(t, str)]))
-types_counts = pd.Series(types).value_counts()[:10]
+with tracing.span("aggregate_cuisines"):
+    types = list(itertools.chain(*[t.split(",") for t in df.Type if isinstance(t, str)]))
+    types_counts = pd.Series(types).value_counts()[:10]
 fig, ax = plt.subplots()
 fig.set_facecolor('#121212') 
 ax.set_facecolor('#121212')
@@ -88,10 +94,11 @@ with col1:
 
 
 # State with the best restaurant
-df['Reviews'] = [float(review.split(" ")[0]) for review in df.Reviews]
-df['No of Reviews'] = [int(reviews.split(" ")[0].replace(",", "")) for reviews in df['No of Reviews']]
-df['weighted_ratings'] = df.Reviews * df['No of Reviews']
-state_avg_ratings = df.groupby('State')['weighted_ratings'].max().reset_index()
+with tracing.span("aggregate_ratings"):
+    df['Reviews'] = [float(review.split(" ")[0]) for review in df.Reviews]
+    df['No of Reviews'] = [int(reviews.split(" ")[0].replace(",", "")) for reviews in df['No of Reviews']]
+    df['weighted_ratings'] = df.Reviews * df['No of Reviews']
+    state_avg_ratings = df.groupby('State')['weighted_ratings'].max().reset_index()
 with col1:
     st.markdown("""
     ## State with the Best Restaurant
@@ -149,3 +156,53 @@ with col2:
     plt.tight_layout()
     st.pyplot(fig)
 
+
+# Zomato insights (streamed in chunks across a process pool; the file is too big for one read_csv)
+@st.cache_data(show_spinner="Aggregating Zomato data...")
+def zomato_insights():
+    return aggregate_csv(datasets.ZOMATO)
+
+if datasets.is_available(datasets.ZOMATO):
+    with tracing.span("aggregate_zomato"):
+        zomato = zomato_insights()
+    st.markdown("""
+    ## Zomato: Top Cuisines and Cost for Two
+    The same lens applied to the Zomato dataset: which cuisines dominate the listings and how much a meal for two typically costs.
+    """)
+    zcol1, zcol2 = st.columns(2)
+
+    with zcol1:
+        top_cuisines = zomato["top_cuisines"].head(10).reset_index()
+        top_cuisines.columns = ["Cuisine", "Restaurants"]
+        fig, ax = plt.subplots()
+        fig.set_facecolor('#121212')
+        ax.set_facecolor('#121212')
+        sns.barplot(x="Restaurants", y="Cuisine", data=top_cuisines, palette="Spectral", ax=ax)
+        ax.set_xlabel('No of Restaurants', color='white')
+        ax.set_ylabel('')
+        ax.tick_params(colors='white')
+        plt.tight_layout()
+        st.pyplot(fig)
+
+    with zcol2:
+        cost = zomato["cost_distribution"].reset_index()
+        cost.columns = ["Cost for Two", "Restaurants"]
+        fig, ax = plt.subplots()
+        fig.set_facecolor('#121212')
+        ax.set_facecolor('#121212')
+        sns.barplot(x="Cost for Two", y="Restaurants", data=cost, palette="mako", ax=ax)
+        ax.set_xlabel('Approx. Cost for Two', color='white')
+        ax.set_ylabel('No of Restaurants', color='white')
+        ax.tick_params(colors='white')
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+        st.pyplot(fig)
+
+    st.markdown("""
+    ## Zomato: Ratings per City
+    Average rating, vote-weighted rating and the best weighted score in each city.
+    """)
+    city_ratings = zomato["city_ratings"].sort_values("weighted_mean", ascending=False)
+    st.dataframe(city_ratings.round(2), use_container_width=True)
+
+tracing.debug_panel()
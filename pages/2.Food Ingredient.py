@@ -1,12 +1,8 @@
 import streamlit as st
 import pandas as pd
-import os
-import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
-import itertools
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from recsys import tracing
+from recsys.client import get_backend
 
 # Define the HTML template for the front end with custom styles
 html_temp = """
@@ -31,6 +27,7 @@ st.set_page_config(
     initial_sidebar_state="auto",
     page_icon=None,
 )
+tracing.begin("Food Ingredient")
 
 # Sidebar
 st.sidebar.image('data/App_icon.png')
@@ -41,7 +38,8 @@ st.markdown(html_temp, unsafe_allow_html=True)
 
 # Add a picture of food
 # Center-align the image using st.image
-st.image("data/food-spread.jpg", use_container_width=True)
+with tracing.span("image"):
+  st.image("data/food-spread.jpg", use_container_width=True)
 
 
 # Add a caption
@@ -49,33 +47,17 @@ st.caption('by Valeria Filippou')
 
 user_input = st.text_input("Enter ingredients separated by commas:")
 
-df = pd.read_csv('data/raw/Food Ingredients and Recipe Dataset with Image Name Mapping.csv')
-
-df = df[['Title', 'Cleaned_Ingredients']]
-
-def recommend_dishes(data, user_input):
-  # Preprocess user input
-  user_input = user_input.lower()
-
-  # Calculate the number of matching ingredients
-  vectorizer = CountVectorizer()
-  ingredients_matrix = vectorizer.fit_transform(data['Cleaned_Ingredients'])
-
-  user_vector = vectorizer.transform([user_input])
-
-  similarities = cosine_similarity(user_vector, ingredients_matrix)
-
-  # Find dishes with at least `threshold` matching ingredients
-  matching_dishes = [(index, row) for index, row in enumerate(similarities[0]) if row >= 0.3]
-
-  recommended_dishes = data.iloc[[index for index, _ in matching_dishes]]
-
-  return recommended_dishes[['Title', 'Cleaned_Ingredients']]
-
+# The recipe table and its ingredient matrix live in the shared backend (loaded once)
+backend = get_backend()
 
 if st.button("Recommend"):
   if user_input:
-    recommended_dishes = recommend_dishes(df, user_input)
+    with tracing.span("recommend"):
+      try:
+        recommended_dishes = pd.DataFrame(backend.dishes(user_input), columns=['Title', 'Cleaned_Ingredients'])
+      except Exception as e:
+        st.error(f"Could not get recommendations. Error: {e}")
+        st.stop()
     st.subheader("Recommended Dishes:")
 
     if not recommended_dishes.empty:
@@ -123,4 +105,4 @@ st.sidebar.info("Example 2: chicken, salt, rice, tomato, lettuce, pepper, cucumb
 st.sidebar.info("Be creative!")
 st.sidebar.info("We hope you find a delicious dish to enjoy. Don't forget to rate this app!")
 
-
+tracing.debug_panel()
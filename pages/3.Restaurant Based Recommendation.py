@@ -1,43 +1,31 @@
 import os
 import re
 import html
-from pathlib import Path
 
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
-from PIL import Image
 
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.metrics import (
-    classification_report,
-    confusion_matrix,
-    roc_auc_score,
-    roc_curve,
-)
+from recsys import tracing
+from recsys.client import get_backend
 
 # -------------------- Paths --------------------
-DATA_TRIP = "data/raw/TripAdvisor_RestauarantRecommendation1.csv"
 ICON_PATH = "data/App_icon.png"
 COVER_IMG = "data/restaurant.jpg"
 FOOTER_IMG = "data/food_2.jpg"
-FEEDBACK_FILE = "data/raw/feedback.csv"
 
 # -------------------- Streamlit Page Config --------------------
 st.set_page_config(page_title="Restaurant Supervised Recommender",
                    layout="centered",
                    initial_sidebar_state="expanded")
+tracing.begin("Restaurant Based Recommendation")
 
 # Sidebar icon (optional)
 if os.path.isfile(ICON_PATH):
     st.sidebar.image(ICON_PATH, use_container_width=True)
 
-# -------------------- Ensure feedback CSV exists --------------------
-Path(FEEDBACK_FILE).parent.mkdir(parents=True, exist_ok=True)
-if not os.path.isfile(FEEDBACK_FILE):
-    pd.DataFrame(columns=["Reviews", "Comments"]).to_csv(FEEDBACK_FILE, index=False)
+# -------------------- Backend --------------------
+# Data, model and feedback live in the shared backend (in-process engine or HTTP service)
+backend = get_backend()
 
 # -------------------- Helpers --------------------
 def stars_from_bubbles(text: str) -> str:
@@ -53,21 +41,15 @@ def stars_from_bubbles(text: str) -> str:
 def render_feedback_grid(max_rows: int = 10) -> None:
     """Show the last N feedback entries in a compact grid."""
     try:
-        df_fb = pd.read_csv(FEEDBACK_FILE)
+        with tracing.span("feedback_read"):
+            last = pd.DataFrame(backend.recent_feedback(max_rows), columns=["Reviews", "Comments"])
     except Exception as e:
         st.caption(f"Could not load feedback: {e}")
         return
-    if df_fb.empty:
-        st.caption("No feedback yet.")
-        return
-
-    df_fb["Comments"] = df_fb["Comments"].astype(str)
-    df_fb = df_fb[df_fb["Comments"].str.strip().ne("")]
-    if df_fb.empty:
+    if last.empty:
         st.caption("No feedback yet.")
         return
 
-    last = df_fb.tail(max_rows).reset_index(drop=True)
     cols = st.columns(2)
     for i, row in last.iterrows():
         col = cols[i % 2]
@@ -84,21 +66,30 @@ def render_feedback_grid(max_rows: int = 10) -> None:
             unsafe_allow_html=True,
         )
 
-# -------------------- Load dataset --------------------
-try:
-    df = pd.read_csv(DATA_TRIP)
-except Exception as e:
-    st.error(f"Could not load dataset at {DATA_TRIP}. Error: {e}")
-    st.stop()
+def render_feedback_section(restaurant: str | None = None) -> None:
+    """Rating form, recent feedback and footer; `restaurant` tags the comment when known."""
+    st.markdown("## Rate Your Experience")
+    rating = st.slider("Rate this restaurant (1-5)", 1, 5)
+    feedback_comment = st.text_area("Your Feedback")
 
-# Minimal cleaning to match prior prep
-if {"Street Address", "Location"}.issubset(df.columns):
-    df["Location"] = df["Street Address"].astype(str) + ", " + df["Location"].astype(str)
-    df = df.drop(columns=["Street Address"], errors="ignore")
+    if st.button("Submit Feedback"):
+        if backend.add_feedback(rating, feedback_comment, restaurant=restaurant):
+            st.success("Thanks for your feedback!")
+        else:
+            st.warning("Please enter a real comment.")
+
+    st.subheader("Recent Feedback")
+    render_feedback_grid(max_rows=10)
+
+    if os.path.isfile(FOOTER_IMG):
+        with tracing.span("image"):
+            st.image(FOOTER_IMG, use_container_width=True)
 
-# Keep unique restaurants
-if "Name" in df.columns:
-    df = df.drop_duplicates(subset="Name").reset_index(drop=True)
+def show_ranking(rows: list[dict], score_col: str, sentiment_cols: list[str]) -> None:
+    out = pd.DataFrame(rows, columns=["Name", score_col] + sentiment_cols)
+    if score_col != "Composite":
+        out[score_col] = out[score_col].round(3)
+    st.dataframe(out, use_container_width=True)
 
 # -------------------- Header --------------------
 st.markdown("<h1 style='text-align:center;'>Restaurant Supervised Recommender</h1>", unsafe_allow_html=True)
@@ -107,7 +98,8 @@ st.markdown(
     "Pick a **Top-N** list, or choose **Similar to a Restaurant** to get targeted suggestions."
 )
 if os.path.isfile(COVER_IMG):
-    st.image(Image.open(COVER_IMG), use_container_width=True)
+    with tracing.span("image"):
+        st.image(COVER_IMG, use_container_width=True)
 
 # -------------------- Sidebar controls --------------------
 st.sidebar.header("Controls")
@@ -118,111 +110,75 @@ q = st.sidebar.slider(
     help="Top (1−q) fraction becomes positive class. q=0.70 → top 30% are positives."
 )
 
-# -------------------- Feature selection --------------------
-# Prefer sentiment columns that contain the word "Sentiment"
-sentiment_cols = [c for c in df.columns if "Sentiment" in c]
-
-if not sentiment_cols:
-    st.error(
-        "No sentiment columns found. Expected columns containing 'Sentiment' "
-        "(e.g., 'Average Food Sentiment', 'Average Service Sentiment')."
-    )
-    st.stop()
-
-# Drop rows with missing sentiments
-df_use = df.dropna(subset=sentiment_cols).copy()
-if df_use.empty:
-    st.error("All rows have missing sentiment values. Please check your dataset.")
+# -------------------- Model ranking --------------------
+# The backend loads the data and trains (then caches) one model per q.
+try:
+    with tracing.span("rank"):
+        ranking = backend.rank(q, top_n)
+except Exception as e:
+    st.error(f"Could not rank restaurants. Error: {e}")
     st.stop()
-
-X = df_use[sentiment_cols].astype(float).values
-composite = df_use[sentiment_cols].astype(float).mean(axis=1)
-threshold = float(np.quantile(composite, q))
-y = (composite >= threshold).astype(int).values
+sentiment_cols = ranking["sentiment_cols"]
 
 # Guard against degenerate labels
-if y.sum() == 0 or y.sum() == len(y):
+if ranking["fallback"]:
     st.warning("Labels degenerated (all same). Falling back to simple sort by composite score.")
-    df_use["Composite"] = composite
-    top_fallback = df_use.sort_values("Composite", ascending=False).head(top_n)
     st.subheader("Top Restaurants (Fallback: Composite Score)")
-    show_cols = ["Name", "Composite"] + sentiment_cols
-    st.dataframe(top_fallback[show_cols])
-    # Feedback + footer
-    st.markdown("## Rate Your Experience")
-    rating = st.slider("Rate this restaurant (1-5)", 1, 5)
-    feedback_comment = st.text_area("Your Feedback")
-    if st.button("Submit Feedback"):
-        df_fb = pd.read_csv(FEEDBACK_FILE) if os.path.isfile(FEEDBACK_FILE) else pd.DataFrame(columns=["Reviews", "Comments"])
-        comment_clean = str(feedback_comment).strip()
-        if comment_clean and comment_clean.lower() != "nan":
-            new_feedback = pd.DataFrame([{"Reviews": f"{rating} of 5 bubbles", "Comments": comment_clean}])
-            df_fb = pd.concat([df_fb, new_feedback], ignore_index=True)
-            df_fb.to_csv(FEEDBACK_FILE, index=False)
-            st.success("Thanks for your feedback!")
-        else:
-            st.warning("Please enter a real comment.")
-    st.subheader("Recent Feedback")
-    render_feedback_grid(max_rows=10)
-    if os.path.isfile(FOOTER_IMG):
-        st.image(Image.open(FOOTER_IMG), use_container_width=True)
+    show_ranking(ranking["rows"], "Composite", sentiment_cols)
+    render_feedback_section()
+    tracing.debug_panel()
     st.stop()
 
-# -------------------- Train/Test split & model --------------------
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.25, stratify=y, random_state=42
-)
-
-clf = GradientBoostingClassifier(
-    n_estimators=200,
-    learning_rate=0.05,
-    max_depth=3,
-    random_state=42,
-)
-clf.fit(X_train, y_train)
-
 # -------------------- Mode switch --------------------
 mode = st.radio("Recommendation Mode:", options=["Top-N Ranking", "Similar to a Restaurant"])
+selected = None
 
 if mode == "Top-N Ranking":
-    probs_all = clf.predict_proba(X)[:, 1]
-    df_rank = df_use.copy()
-    df_rank["Match Probability"] = probs_all
-    top = df_rank.sort_values("Match Probability", ascending=False).head(top_n)
     st.subheader("Top Recommended Restaurants")
-    show_cols = ["Name", "Match Probability"] + sentiment_cols
-    st.dataframe(top[show_cols].assign(**{"Match Probability": top["Match Probability"].round(3)}), use_container_width=True)
+    show_ranking(ranking["rows"], "Match Probability", sentiment_cols)
 
 else:
     st.markdown("### Pick a restaurant to find similar ones")
-    selectable_names = df_use["Name"].dropna().unique().tolist() if "Name" in df_use.columns else []
+    selectable_names = backend.restaurant_names()
     if not selectable_names:
         st.warning("No 'Name' column available to select a restaurant.")
     selected = st.selectbox("Restaurant:", options=selectable_names)
-    if selected:
-        probs_all = clf.predict_proba(X)[:, 1]
-        out = df_use.copy()
-        out["Match Probability"] = probs_all
-        out = out[out["Name"] != selected] if "Name" in out.columns else out
-        top_sim = out.sort_values("Match Probability", ascending=False).head(top_n)
+    source = st.radio("Similarity source:", options=["Sentiment model", "Review comments (TF-IDF)"],
+                      horizontal=True)
+    if selected and source == "Sentiment model":
+        with tracing.span("rank"):
+            top_sim = backend.rank(q, top_n, exclude=selected)
         st.subheader(f"Restaurants similar to '{selected}'")
-        show_cols = ["Name", "Match Probability"] + sentiment_cols
-        st.dataframe(top_sim[show_cols].assign(**{"Match Probability": top_sim["Match Probability"].round(3)}),
-                     use_container_width=True)
+        show_ranking(top_sim["rows"], "Match Probability", sentiment_cols)
+    elif selected:
+        # Precomputed top-K neighbours over TF-IDF vectors of each restaurant's comments
+        try:
+            with tracing.span("similar"):
+                similar_rows = backend.similar(selected, top_n)
+        except Exception as e:
+            st.error(f"Could not load comment similarity. Error: {e}")
+            similar_rows = None
+        if similar_rows is not None:
+            st.subheader(f"Restaurants whose reviews read like '{selected}'")
+            if similar_rows:
+                show_ranking(similar_rows, "Comment Similarity", sentiment_cols)
+            else:
+                st.info("No restaurant has comments similar to this one.")
 
 # -------------------- (Optional) Algorithm tab --------------------
-with st.expander("Show algorithm evaluation (test set)"):
-    y_prob = clf.predict_proba(X_test)[:, 1]
-    y_pred = (y_prob >= 0.5).astype(int)
+# Opt-in: matplotlib is only imported (and the metrics/ROC plot only computed) when requested.
+if st.checkbox("Show algorithm evaluation (test set)"):
+    import matplotlib.pyplot as plt
+
+    with tracing.span("evaluate"):
+        ev = backend.evaluation(q)
     st.markdown("**Classification Report**")
-    st.code(classification_report(y_test, y_pred, digits=3), language="text")
+    st.code(ev["report"], language="text")
 
     st.markdown("**Confusion Matrix**")
-    cm = confusion_matrix(y_test, y_pred)
-    st.dataframe(pd.DataFrame(cm, index=["Actual 0", "Actual 1"], columns=["Pred 0", "Pred 1"]))
+    st.dataframe(pd.DataFrame(ev["confusion"], index=["Actual 0", "Actual 1"], columns=["Pred 0", "Pred 1"]))
 
-    auc = roc_auc_score(y_test, y_prob)
-    fpr, tpr, _ = roc_curve(y_test, y_prob)
+    auc, fpr, tpr = ev["auc"], ev["fpr"], ev["tpr"]
     st.markdown(f"**ROC-AUC:** {auc:.3f}")
     fig, ax = plt.subplots(figsize=(5, 4))
     ax.plot(fpr, tpr, label=f"AUC={auc:.3f}")
@@ -235,23 +191,6 @@ with st.expander("Show algorithm evaluation (test set)"):
     st.pyplot(fig)
 
 # -------------------- Feedback --------------------
-st.markdown("## Rate Your Experience")
-rating = st.slider("Rate this restaurant (1-5)", 1, 5)
-feedback_comment = st.text_area("Your Feedback")
-
-if st.button("Submit Feedback"):
-    df_fb = pd.read_csv(FEEDBACK_FILE) if os.path.isfile(FEEDBACK_FILE) else pd.DataFrame(columns=["Reviews", "Comments"])
-    comment_clean = str(feedback_comment).strip()
-    if comment_clean and comment_clean.lower() != "nan":
-        new_feedback = pd.DataFrame([{"Reviews": f"{rating} of 5 bubbles", "Comments": comment_clean}])
-        df_fb = pd.concat([df_fb, new_feedback], ignore_index=True)
-        df_fb.to_csv(FEEDBACK_FILE, index=False)
-        st.success("Thanks for your feedback!")
-    else:
-        st.warning("Please enter a real comment.")
-
-st.subheader("Recent Feedback")
-render_feedback_grid(max_rows=10)
+render_feedback_section(selected)
 
-if os.path.isfile(FOOTER_IMG):
-    st.image(Image.open(FOOTER_IMG), use_container_width=True)
+tracing.debug_panel()
@@ -1,11 +1,11 @@
-import os
-from pathlib import Path
 import re
 import html  # for safe comment rendering
 
 import pandas as pd
 import streamlit as st
-from PIL import Image
+
+from recsys import tracing
+from recsys.client import get_backend
 
 # ---------- paths (match your repo layout) ----------
 APP_ICON = 'data/App_icon.png'
@@ -14,15 +14,13 @@ COVER_IMG = 'data/food_cover.jpg'
 RATING_IMG_45 = 'data/Ratings/Img4.5.png'
 RATING_IMG_40 = 'data/Ratings/Img4.0.png'
 RATING_IMG_50 = 'data/Ratings/Img5.0.png'
-FEEDBACK_FILE = "data/raw/feedback.csv"
 
-# Ensure feedback CSV exists with correct columns
-Path(FEEDBACK_FILE).parent.mkdir(parents=True, exist_ok=True)
-if not os.path.isfile(FEEDBACK_FILE):
-    pd.DataFrame(columns=['Reviews', 'Comments']).to_csv(FEEDBACK_FILE, index=False)
+# State data and feedback are served by the shared backend
+backend = get_backend()
 
 # ---------- Streamlit config ----------
 st.set_page_config(layout='centered', initial_sidebar_state='expanded')
+tracing.begin("State Based Recommendation")
 # Global styles for feedback cards
 st.markdown("""
 <style>
@@ -59,7 +57,8 @@ st.markdown("""
 <p style='text-align: justify;'>Discover hidden gems, indulge in mouthwatering dishes, and immerse yourself in the vibrant food culture of your chosen destination. From cozy cafes to upscale fine dining establishments, there's something for every palate and occasion.</p>
 """, unsafe_allow_html=True)
 # banner image
-st.image(COVER_IMG, use_container_width=True)
+with tracing.span("image"):
+    st.image(COVER_IMG, use_container_width=True)
 
 # ---------- helpers ----------
 def _stars_from_bubbles(text: str) -> str:
@@ -75,24 +74,17 @@ def _stars_from_bubbles(text: str) -> str:
 
 def render_feedback_grid(max_rows: int = 10):
     """Compact two-column feedback with consistent padding & clear text color."""
+    # The backend already hides empty/'nan' comments
     try:
-        df = pd.read_csv(FEEDBACK_FILE)
+        with tracing.span("feedback_read"):
+            last = pd.DataFrame(backend.recent_feedback(max_rows), columns=['Reviews', 'Comments'])
     except Exception as e:
         st.caption(f"⚠️ Could not load feedback: {e}")
         return
-    if df.empty:
+    if last.empty:
         st.caption("No feedback yet.")
         return
 
-    # Hide empty/'nan' comments
-    df['Comments'] = df['Comments'].astype(str)
-    mask_valid = df['Comments'].str.strip().ne('') & df['Comments'].str.strip().str.lower().ne('nan')
-    df = df[mask_valid]
-    if df.empty:
-        st.caption("No feedback yet.")
-        return
-
-    last = df.tail(max_rows).reset_index(drop=True)
     cols = st.columns(2)
 
     for i, row in last.iterrows():
@@ -142,70 +134,54 @@ def rating_to_image_path(value) -> str | None:
         return RATING_IMG_40
     return None
 
-# ---------- load per-state data ----------
-def load_and_clean(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
-    if "Street Address" in df.columns and "Location" in df.columns:
-        df["Location"] = df["Street Address"] + ", " + df["Location"]
-        df = df.drop(columns=["Street Address"])
-    return df
-
-California  = load_and_clean('data/California/California.csv')
-New_York    = load_and_clean('data/New York/New_York.csv')
-New_Jersey  = load_and_clean('data/New Jersey/New_Jersey.csv')
-Texas       = load_and_clean('data/Texas/Texas.csv')
-Washington  = load_and_clean('data/Washington/Washington.csv')
-
 # ---------- pick state ----------
 option = st.selectbox('Select Your State', ('New York', 'New Jersey', 'California', 'Texas', 'Washington'))
 
 # ---------- details renderer ----------
-def details(dataframe):
-    unique_restaurants = dataframe['Name'].drop_duplicates().head(20)
+def details(state: str):
+    try:
+        with tracing.span("load_csv"):
+            unique_restaurants = backend.state_restaurants(state, limit=20)
+    except Exception as e:
+        st.error(f"Could not load restaurants for {state}. Error: {e}")
+        st.stop()
     title = st.selectbox('Select Your Restaurant (Top 20)', unique_restaurants)
 
-    if title in dataframe['Name'].values:
-        idx = dataframe['Name'].eq(title).idxmax()
-
-        Reviews = dataframe.at[idx, 'Reviews']
+    row = backend.state_details(state, title) if title else None
+    if row:
+        Reviews = row.get('Reviews')
         st.subheader("Restaurant Rating:-")
         img_path = rating_to_image_path(Reviews)
         if img_path:
-            st.image(img_path, use_container_width=True)
+            with tracing.span("image"):
+                st.image(img_path, use_container_width=True)
 
-        if 'Comments' in dataframe.columns:
-            comment = dataframe.at[idx, 'Comments']
+        if 'Comments' in row:
+            comment = row['Comments']
             if pd.notna(comment) and comment != "No Comments":
                 st.subheader("Comments:-")
                 st.warning(str(comment))
 
-        Type = dataframe.at[idx, 'Type']
+        Type = row.get('Type')
         st.subheader("Restaurant Category:-")
         st.error(str(Type))
 
-        Location = dataframe.at[idx, 'Location']
+        Location = row.get('Location')
         st.subheader("The Address:-")
         st.success(str(Location))
 
-        contact_no = dataframe.at[idx, 'Contact Number']
+        contact_no = row.get('Contact Number')
         if str(contact_no) != "Not Available":
             st.subheader("Contact Details:-")
             st.info('Phone:- ' + str(contact_no))
 
     st.text("")
-    st.image(Image.open(FOOTER_IMG), use_container_width=True)
+    with tracing.span("image"):
+        st.image(FOOTER_IMG, use_container_width=True)
+    return title
 
 # ---------- route by state ----------
-if option == 'New Jersey':
-    details(New_Jersey)
-elif option == 'New York':
-    details(New_York)
-elif option == 'California':
-    details(California)
-elif option == 'Texas':
-    details(Texas)
-elif option == 'Washington':
-    details(Washington)
+selected_restaurant = details(option)
 
 # ---------- feedback ----------
 st.markdown("## Rate Your Experience")
@@ -213,15 +189,7 @@ rating = st.slider('Rate this restaurant (1-5)', 1, 5)
 feedback_comment = st.text_area('Your Feedback')
 
 if st.button('Submit Feedback'):
-    if not os.path.isfile(FEEDBACK_FILE):
-        pd.DataFrame(columns=['Reviews', 'Comments']).to_csv(FEEDBACK_FILE, index=False)
-
-    df_fb = pd.read_csv(FEEDBACK_FILE)
-    comment_clean = str(feedback_comment).strip()
-    if comment_clean and comment_clean.lower() != 'nan':
-        new_feedback = pd.DataFrame([{'Reviews': f'{rating} of 5 bubbles', 'Comments': comment_clean}])
-        df_fb = pd.concat([df_fb, new_feedback], ignore_index=True)
-        df_fb.to_csv(FEEDBACK_FILE, index=False)
+    if backend.add_feedback(rating, feedback_comment, restaurant=selected_restaurant):
         st.success('Thanks for your feedback!')
     else:
         st.warning("Please enter a real comment (not empty).")
@@ -229,3 +197,5 @@ if st.button('Submit Feedback'):
 # ---------- last 10 feedback (compact 2-column) ----------
 st.subheader("Recent Feedback")
 render_feedback_grid(max_rows=10)
+
+tracing.debug_panel()
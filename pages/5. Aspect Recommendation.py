@@ -1,6 +1,12 @@
 import streamlit as st
 import pandas as pd
 
+from recsys import tracing
+from recsys.client import get_backend
+from recsys.recommenders import ASPECTS, aspect_columns
+
+tracing.begin("Aspect Recommendation")
+
 # Add title and description for the app
 image_url = "https://images.unsplash.com/photo-1525648199074-cee30ba79a4a?q=80&w=1470&auto=format&fit=crop&ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D"
 
@@ -84,21 +90,11 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Load the DataFrame with caching to avoid repeated loading
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_excel('./data/raw/final_sentiment_df.xlsx')  # Assuming the data file is named 'final_sentiment_df.xlsx'
-        return df
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return None
-
-# Load the data once
-final_sentiment_df = load_data()
+# The sentiment table is loaded once by the shared backend, not per session
+backend = get_backend()
 
 # Create multiple selection widgets
-aspect_options = ['Food', 'Price', 'Service', 'Ambiance']
+aspect_options = ASPECTS
 st.markdown(
     """
     <label style='font-family:"Comic Sans MS", cursive; font-size:18px;'>
@@ -150,12 +146,14 @@ def recommend_restaurants(aspects, top_n):
         st.warning("Please select at least one aspect.")
         return None
 
-    # Filter the DataFrame based on selected aspects
-    filtered_df = final_sentiment_df.copy()
-
     # Sort by selected aspects and keep only the top N
-    sort_columns = [f'Average {aspect} Sentiment' for aspect in aspects]
-    filtered_df = filtered_df.sort_values(by=sort_columns, ascending=False).head(top_n)
+    sort_columns = aspect_columns(aspects)
+    try:
+        with tracing.span("load_data"):
+            filtered_df = pd.DataFrame(backend.aspects(aspects, top_n), columns=['name', *sort_columns, 'url'])
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return None
 
     # Display results
     if filtered_df.empty:
@@ -178,5 +176,7 @@ def recommend_restaurants(aspects, top_n):
 if st.button('Recommend'):
     recommend_restaurants(selected_aspects, top_n)
 
+tracing.debug_panel()
+
 
 
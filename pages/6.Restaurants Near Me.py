@@ -0,0 +1,172 @@
+import os
+
+import folium
+import pandas as pd
+import streamlit as st
+from streamlit_folium import st_folium
+
+from recsys import datasets, tracing
+from recsys.cluster import ClusterIndex, viewport_bounds
+from recsys.geo import GeoIndex, standardize_coords
+from recsys.geocode import GeocodeCache, load_states_with_coords
+
+# -------------------- Paths --------------------
+ICON_PATH = "data/App_icon.png"
+DEFAULT_ZOOM = 13
+
+# -------------------- Streamlit Page Config --------------------
+st.set_page_config(page_title="Restaurants Near Me",
+                   layout="wide",
+                   initial_sidebar_state="expanded")
+tracing.begin("Restaurants Near Me")
+
+if os.path.isfile(ICON_PATH):
+    st.sidebar.image(ICON_PATH, use_container_width=True)
+
+st.markdown("<h1 style='text-align:center;'>Restaurants Near Me</h1>", unsafe_allow_html=True)
+st.markdown(
+    "Find restaurants **within a radius** of a location or the **nearest K**, "
+    "optionally filtered by cuisine and minimum rating."
+)
+
+
+# -------------------- Load data & index --------------------
+@st.cache_resource(show_spinner="Building spatial index...")
+def load_index() -> GeoIndex:
+    frames = []
+    if datasets.is_available(datasets.LAT_LON):
+        frames.append(standardize_coords(datasets.load_lat_lon()))
+    # State rows use coordinates already in the geocode cache (no API calls here);
+    # warm it with `python -m recsys.geocode --backend google`.
+    cache = GeocodeCache()
+    try:
+        states = load_states_with_coords(cache, offline=True)
+    finally:
+        cache.close()
+    if states["lat"].notna().any():
+        frames.append(standardize_coords(states))
+    if not frames:
+        return GeoIndex(pd.DataFrame(columns=["lat", "lon"]))
+    return GeoIndex(pd.concat(frames, ignore_index=True))
+
+
+@st.cache_resource(show_spinner="Precomputing map clusters...")
+def load_all_clusters(_index: GeoIndex) -> ClusterIndex:
+    return ClusterIndex(_index.df["lat"], _index.df["lon"])
+
+
+def result_clusters(query: tuple, results: pd.DataFrame) -> ClusterIndex:
+    """Clusters over this session's results, rebuilt only when the query changes (not on pan/zoom)."""
+    cached = st.session_state.get("near_me_clusters")
+    if cached is None or cached[0] != query:
+        cached = (query, ClusterIndex(results["lat"], results["lon"]))
+        st.session_state["near_me_clusters"] = cached
+    return cached[1]
+
+
+def cluster_icon(count: int) -> folium.DivIcon:
+    size = 28 + 6 * len(str(count))
+    return folium.DivIcon(
+        html=(
+            f'<div style="width:{size}px;height:{size}px;line-height:{size}px;'
+            'border-radius:50%;background:rgba(30,86,160,0.85);color:#fff;'
+            f'text-align:center;font-weight:600;font-size:12px;">{count}</div>'
+        ),
+        icon_size=(size, size),
+        icon_anchor=(size // 2, size // 2),
+    )
+
+
+try:
+    with tracing.span("load_index"):
+        index = load_index()
+except Exception as e:
+    st.error(f"Could not build the spatial index. Error: {e}")
+    st.stop()
+
+if len(index) == 0:
+    st.warning(
+        f"No rows with valid coordinates. Pull the Git LFS data ({datasets.LAT_LON}) "
+        "or geocode the state datasets with `python -m recsys.geocode --backend google`."
+    )
+    st.stop()
+
+# -------------------- Sidebar controls --------------------
+center_lat, center_lon = index.center()
+st.sidebar.header("Location")
+lat = st.sidebar.number_input("Latitude", value=center_lat, min_value=-90.0, max_value=90.0, format="%.5f")
+lon = st.sidebar.number_input("Longitude", value=center_lon, min_value=-180.0, max_value=180.0, format="%.5f")
+
+st.sidebar.header("Search")
+mode = st.sidebar.radio("Mode:", options=["Within Radius", "Nearest K"])
+if mode == "Within Radius":
+    radius_km = st.sidebar.slider("Radius (km)", min_value=0.5, max_value=50.0, value=5.0, step=0.5)
+else:
+    k = st.sidebar.slider("How many restaurants (K):", min_value=1, max_value=50, value=10)
+
+cuisine = st.sidebar.selectbox("Cuisine", options=["Any"] + index.cuisines())
+min_rating = st.sidebar.slider("Minimum rating", min_value=0.0, max_value=5.0, value=0.0, step=0.5)
+
+# -------------------- Query --------------------
+filters = {
+    "cuisine": None if cuisine == "Any" else cuisine,
+    "min_rating": min_rating or None,
+}
+with tracing.span("query", mode=mode):
+    if mode == "Within Radius":
+        results = index.radius(lat, lon, radius_km, **filters)
+        query = (id(index), mode, lat, lon, radius_km, *filters.values())
+    else:
+        results = index.nearest(lat, lon, k, **filters)
+        query = (id(index), mode, lat, lon, k, *filters.values())
+
+# -------------------- Results --------------------
+st.subheader(f"{len(results)} restaurant(s) found")
+show_cols = [c for c in [index.name_col, "distance_km", "rating", "Type", "Location"] if c and c in results.columns]
+st.dataframe(results[show_cols].assign(distance_km=results["distance_km"].round(2)),
+             use_container_width=True)
+
+# -------------------- Map (server-side clustering) --------------------
+# Only the clusters inside the last reported viewport are sent to the browser;
+# panning/zooming reruns the page and swaps the feature group, not the map.
+show_all = st.sidebar.checkbox("Show all restaurants on the map", value=False)
+view = st.session_state.setdefault("near_me_view", {"zoom": DEFAULT_ZOOM, "bounds": None})
+bounds = view["bounds"] or viewport_bounds(lat, lon, view["zoom"])
+
+with tracing.span("cluster", zoom=view["zoom"]):
+    if show_all:
+        points = index.df
+        clusters = load_all_clusters(index).visible(*bounds, view["zoom"])
+    else:
+        points = results
+        clusters = result_clusters(query, results).visible(*bounds, view["zoom"])
+
+fg = folium.FeatureGroup(name="Restaurants")
+fg.add_child(folium.Marker([lat, lon], tooltip="You are here",
+                           icon=folium.Icon(color="red", icon="user")))
+if mode == "Within Radius":
+    fg.add_child(folium.Circle([lat, lon], radius=radius_km * 1000, color="#1E56A0", fill=False))
+
+for c in clusters.itertuples(index=False):
+    if c.count == 1:
+        row = points.iloc[int(c.idx)]
+        name = str(row[index.name_col]) if index.name_col else "Restaurant"
+        tip = f"{name} ({row['distance_km']:.2f} km)" if "distance_km" in row else name
+        fg.add_child(folium.Marker([c.lat, c.lon], tooltip=tip))
+    else:
+        fg.add_child(folium.Marker([c.lat, c.lon], tooltip=f"{c.count} restaurants",
+                                   icon=cluster_icon(int(c.count))))
+
+st.caption(f"{len(clusters)} marker(s) in view.")
+m = folium.Map(location=[center_lat, center_lon], zoom_start=DEFAULT_ZOOM)
+with tracing.span("render_map", markers=len(clusters)):
+    out = st_folium(m, key="near_me_map", center=(lat, lon), feature_group_to_add=fg,
+                    height=520, use_container_width=True, returned_objects=["bounds", "zoom"])
+tracing.debug_panel()
+
+if out and out.get("bounds") and out.get("zoom") is not None:
+    sw, ne = out["bounds"].get("_southWest") or {}, out["bounds"].get("_northEast") or {}
+    new_bounds = (sw.get("lat"), sw.get("lng"), ne.get("lat"), ne.get("lng"))
+    if None not in new_bounds and (new_bounds != view["bounds"] or out["zoom"] != view["zoom"]):
+        st.session_state["near_me_view"] = {"zoom": int(out["zoom"]), "bounds": new_bounds}
+        st.rerun()
@@ -0,0 +1,236 @@
+"""Out-of-core Insights aggregations (top cuisines, city ratings, cost spread).
+
+Each chunk (or partition file) is reduced to a small *partial* in a worker
+process; partials are merged in the parent and finalized once. Everything in a
+partial is a sum, count or max, so merging is order-independent and the result
+matches `aggregate_in_memory` on inputs that fit in RAM.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# -------------------- Schema --------------------
+# Logical field -> column in the raw file. Override for other sources.
+ZOMATO_COLUMNS = {
+    "rating": "rate",
+    "votes": "votes",
+    "cuisines": "cuisines",
+    "city": "listed_in(city)",
+    "cost": "approx_cost(for two people)",
+}
+
+# Left-closed cost buckets (approx. cost for two); the last one is open-ended.
+COST_BINS = [0, 300, 500, 800, 1200, 2000, 3000, np.inf]
+
+CITY_SUMS = ["rating_sum", "rated_count", "votes", "weighted_sum"]
+
+
+def cost_labels() -> list[str]:
+    """Human-readable labels for COST_BINS."""
+    labels = []
+    for lo, hi in zip(COST_BINS[:-1], COST_BINS[1:]):
+        labels.append(f"{lo:g}+" if np.isinf(hi) else f"{lo:g}-{hi:g}")
+    return labels
+
+
+# -------------------- Parsing --------------------
+def parse_rating(s: pd.Series) -> pd.Series:
+    """'4.1/5', '4.1 /5' -> 4.1; 'NEW', '-' and blanks -> NaN."""
+    head = s.astype(str).str.split("/").str[0].str.strip()
+    return pd.to_numeric(head, errors="coerce")
+
+
+def parse_cost(s: pd.Series) -> pd.Series:
+    """'1,200' -> 1200.0; unparsable -> NaN."""
+    return pd.to_numeric(s.astype(str).str.replace(",", "", regex=False), errors="coerce")
+
+
+def prepare(df: pd.DataFrame, columns: dict = ZOMATO_COLUMNS) -> pd.DataFrame:
+    """Normalize raw columns into rating / votes / cuisines / city / cost."""
+    out = pd.DataFrame(index=df.index)
+    out["rating"] = parse_rating(df[columns["rating"]])
+    out["votes"] = pd.to_numeric(df[columns["votes"]], errors="coerce").fillna(0)
+    out["cuisines"] = df[columns["cuisines"]].fillna("").astype(str)
+    out["city"] = df[columns["city"]].fillna("Unknown").astype(str).str.strip()
+    out["cost"] = parse_cost(df[columns["cost"]])
+    out["weighted"] = out["rating"] * out["votes"]
+    return out
+
+
+def _explode_cuisines(s: pd.Series) -> pd.Series:
+    tokens = s.str.split(",").explode().str.strip()
+    return tokens[tokens.notna() & tokens.ne("")]
+
+
+def _rank_counts(counts: pd.Series) -> pd.Series:
+    """Sort counts descending with a stable alphabetical tie-break, named like value_counts()."""
+    counts = counts.astype(int)
+    order = sorted(counts.index, key=lambda k: (-counts[k], k))
+    out = counts.reindex(order).rename("count")
+    out.index.name = "cuisines"
+    return out
+
+
+# -------------------- Partials --------------------
+def empty_partial() -> dict:
+    return {
+        "rows": 0,
+        "cuisines": pd.Series(dtype=float),
+        "city": pd.DataFrame(columns=CITY_SUMS + ["weighted_max"], dtype=float),
+        "cost": np.zeros(len(COST_BINS) - 1, dtype=np.int64),
+    }
+
+
+def partial_aggregate(df: pd.DataFrame, columns: dict = ZOMATO_COLUMNS) -> dict:
+    """Reduce one chunk to mergeable sums / counts / maxima."""
+    d = prepare(df, columns)
+    rated = d.dropna(subset=["rating"])
+    city = rated.groupby("city").agg(
+        rating_sum=("rating", "sum"),
+        rated_count=("rating", "size"),
+        votes=("votes", "sum"),
+        weighted_sum=("weighted", "sum"),
+        weighted_max=("weighted", "max"),
+    ).astype(float)
+
+    codes = pd.cut(d["cost"].dropna(), COST_BINS, right=False, labels=False)
+    cost = np.bincount(codes.dropna().astype(int), minlength=len(COST_BINS) - 1)
+
+    return {
+        "rows": len(d),
+        "cuisines": _explode_cuisines(d["cuisines"]).value_counts().astype(float),
+        "city": city,
+        "cost": cost.astype(np.int64),
+    }
+
+
+def merge_partials(a: dict, b: dict) -> dict:
+    """Combine two partials; associative and commutative."""
+    city = pd.concat([a["city"], b["city"]])
+    if not city.empty:
+        agg = {c: "sum" for c in CITY_SUMS}
+        agg["weighted_max"] = "max"
+        city = city.groupby(level=0).agg(agg)
+    return {
+        "rows": a["rows"] + b["rows"],
+        "cuisines": a["cuisines"].add(b["cuisines"], fill_value=0),
+        "city": city,
+        "cost": a["cost"] + b["cost"],
+    }
+
+
+def finalize(partial: dict) -> dict:
+    """Turn a merged partial into the Insights result tables."""
+    city = partial["city"].sort_index()
+    city_ratings = pd.DataFrame({
+        "mean_rating": city["rating_sum"] / city["rated_count"],
+        "rated_count": city["rated_count"].astype(int),
+        "votes": city["votes"],
+        "weighted_sum": city["weighted_sum"],
+        "weighted_max": city["weighted_max"],
+        "weighted_mean": city["weighted_sum"] / city["votes"].where(city["votes"] > 0),
+    })
+    city_ratings.index.name = "city"
+    return {
+        "rows": int(partial["rows"]),
+        "top_cuisines": _rank_counts(partial["cuisines"]),
+        "city_ratings": city_ratings,
+        "cost_distribution": pd.Series(partial["cost"], index=cost_labels(), name="count"),
+    }
+
+
+# -------------------- In-memory reference --------------------
+def aggregate_in_memory(df: pd.DataFrame, columns: dict = ZOMATO_COLUMNS) -> dict:
+    """Plain pandas groupbys over a frame that fits in RAM."""
+    d = prepare(df, columns)
+    rated = d.dropna(subset=["rating"])
+    g = rated.groupby("city")
+    city_ratings = pd.DataFrame({
+        "mean_rating": g["rating"].mean(),
+        "rated_count": g["rating"].size().astype(int),
+        "votes": g["votes"].sum().astype(float),
+        "weighted_sum": g["weighted"].sum(),
+        "weighted_max": g["weighted"].max(),
+    }).sort_index()
+    city_ratings["weighted_mean"] = (
+        city_ratings["weighted_sum"] / city_ratings["votes"].where(city_ratings["votes"] > 0)
+    )
+    city_ratings.index.name = "city"
+
+    cost = pd.cut(d["cost"], COST_BINS, right=False, labels=cost_labels()).value_counts(sort=False)
+    return {
+        "rows": len(d),
+        "top_cuisines": _rank_counts(_explode_cuisines(d["cuisines"]).value_counts()),
+        "city_ratings": city_ratings,
+        "cost_distribution": pd.Series(cost.values.astype(np.int64), index=cost_labels(), name="count"),
+    }
+
+
+# -------------------- Parallel engine --------------------
+def _aggregate_file(path: str, columns: dict, chunksize: int) -> dict:
+    """Worker body for partition mode: reduce a whole file locally."""
+    total = empty_partial()
+    for chunk in _read_chunks(path, columns, chunksize):
+        total = merge_partials(total, partial_aggregate(chunk, columns))
+    return total
+
+
+def _read_chunks(path: str, columns: dict, chunksize: int):
+    usecols = sorted(set(columns.values()))
+    return pd.read_csv(path, usecols=usecols, dtype=str, chunksize=chunksize)
+
+
+def reduce_tasks(pool_tasks, workers: int, max_pending: int | None,
+                 empty=empty_partial, merge=merge_partials):
+    """Submit (fn, *args) tasks with bounded in-flight work and merge results.
+
+    `empty()` and `merge(a, b)` define the partial type (Insights partials by
+    default; the sentiment pipeline passes its own).
+    """
+    total = empty()
+    if workers <= 1:
+        for fn, *args in pool_tasks:
+            total = merge(total, fn(*args))
+        return total
+
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for fn, *args in pool_tasks:
+            pending.add(pool.submit(fn, *args))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    total = merge(total, fut.result())
+        for fut in pending:
+            total = merge(total, fut.result())
+    return total
+
+
+def aggregate_chunks(chunks: Iterable[pd.DataFrame], columns: dict = ZOMATO_COLUMNS,
+                     workers: int | None = None, max_pending: int | None = None) -> dict:
+    """Aggregate an iterable of frames across a process pool.
+
+    At most `max_pending` chunks (default 2 x workers) are in flight, so memory
+    stays bounded no matter how long the iterable is.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = ((partial_aggregate, chunk, columns) for chunk in chunks)
+    return finalize(reduce_tasks(tasks, workers, max_pending))
+
+
+def aggregate_csv(path: str, columns: dict = ZOMATO_COLUMNS, chunksize: int = 50_000,
+                  workers: int | None = None, max_pending: int | None = None) -> dict:
+    """Stream one large CSV in chunks (only the needed columns) and aggregate."""
+    return aggregate_chunks(_read_chunks(path, columns, chunksize), columns, workers, max_pending)
+
+
+def aggregate_partitions(paths: Iterable[str], columns: dict = ZOMATO_COLUMNS,
+                         chunksize: int = 50_000, workers: int | None = None) -> dict:
+    """Aggregate pre-split CSV partitions; each worker reads its own files."""
+    workers = workers or os.cpu_count() or 1
+    tasks = ((_aggregate_file, p, columns, chunksize) for p in paths)
+    return finalize(reduce_tasks(tasks, workers, None))
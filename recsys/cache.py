@@ -0,0 +1,99 @@
+"""Result cache for recommendation queries.
+
+Queries are canonicalized first, so "Rice, chicken" and "chicken, rice,
+CHICKEN" share one entry. Entries live in a bounded LRU with a TTL; callers
+put the dataset / model version in the key, so a new version never serves
+an old result (and `invalidate` frees the stale ones early).
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# CountVectorizer's default token pattern: tokens the ingredient matrix can match.
+_TOKEN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def canonical_ingredients(text: str) -> str:
+    """Sorted, deduplicated, lower-cased ingredient tokens joined by spaces."""
+    return " ".join(sorted(set(_TOKEN.findall(str(text).lower()))))
+
+
+def canonical_aspects(aspects: list[str]) -> tuple[str, ...]:
+    """Title-cased aspects, duplicates dropped; order kept (it sets sort priority)."""
+    return tuple(dict.fromkeys(str(a).strip().title() for a in aspects))
+
+
+class ResultCache:
+    """Thread-safe LRU with per-entry TTL and per-operation hit/miss counters.
+
+    `maxsize=0` disables caching (every call computes, misses are counted).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: dict = {}
+
+    def _count(self, op: str, field: str) -> None:
+        stats = self._stats.setdefault(op, {"hits": 0, "misses": 0, "expired": 0, "evicted": 0})
+        stats[field] += 1
+
+    def get_or_compute(self, op: str, key, compute):
+        """Cached value for (op, key), calling `compute()` on a miss."""
+        full = (op, key)
+        with self._lock:
+            entry = self._data.get(full)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._data.move_to_end(full)
+                    self._count(op, "hits")
+                    return entry[1]
+                del self._data[full]
+                self._count(op, "expired")
+            self._count(op, "misses")
+
+        value = compute()  # outside the lock: concurrent misses on one key may both compute
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._data[full] = (self._clock() + self.ttl, value)
+                self._data.move_to_end(full)
+                while len(self._data) > self.maxsize:
+                    (evicted_op, _), _ = self._data.popitem(last=False)
+                    self._count(evicted_op, "evicted")
+        return value
+
+    def invalidate(self, op: str | None = None) -> int:
+        """Drop every entry (or those of one operation); returns how many."""
+        with self._lock:
+            keys = [k for k in self._data if op is None or k[0] == op]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Per-operation counters plus hit ratio, and overall size / totals."""
+        with self._lock:
+            ops = {op: dict(s) for op, s in self._stats.items()}
+            size = len(self._data)
+        for s in ops.values():
+            lookups = s["hits"] + s["misses"]
+            s["hit_ratio"] = s["hits"] / lookups if lookups else 0.0
+        hits = sum(s["hits"] for s in ops.values())
+        lookups = hits + sum(s["misses"] for s in ops.values())
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "operations": ops,
+        }
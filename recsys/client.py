@@ -0,0 +1,105 @@
+"""Backend used by the pages: the HTTP service if configured, else an in-process engine.
+
+Set RECSYS_SERVICE_URL (e.g. http://127.0.0.1:8600) to route every page through
+`python -m recsys.service`; otherwise all sessions of this Streamlit process
+share one `RecommenderEngine`, whose datasets are memory-mapped from
+`recsys.shared` so further worker processes attach instead of copying.
+"""
+import json
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from recsys.engine import RecommenderEngine
+from recsys.sentiment import live_store_path
+from recsys.shared import default_store
+
+SERVICE_URL_ENV = "RECSYS_SERVICE_URL"
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+class ServiceError(RuntimeError):
+    """Error reported by the recommendation service."""
+
+
+class ServiceClient:
+    """Blocking JSON client with the same methods as RecommenderEngine."""
+
+    def __init__(self, base_url: str, timeout: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, path: str, payload: dict | None = None, params: dict | None = None):
+        url = self.base_url + path
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            raise ServiceError(message) from None
+        except urllib.error.URLError as e:
+            raise ServiceError(f"Recommendation service unreachable at {self.base_url}: {e.reason}") from None
+
+    def _seg(self, value: str) -> str:
+        return urllib.parse.quote(value, safe="")
+
+    def dishes(self, ingredients: str) -> list[dict]:
+        return self._call("/dishes", {"ingredients": ingredients})
+
+    def restaurant_names(self) -> list[str]:
+        return self._call("/restaurants/names")
+
+    def rank(self, q: float = 0.70, top_n: int = 10, exclude: str | None = None) -> dict:
+        return self._call("/restaurants/rank", {"q": q, "top_n": top_n, "exclude": exclude})
+
+    def evaluation(self, q: float = 0.70) -> dict | None:
+        return self._call("/restaurants/evaluation", {"q": q})
+
+    def similar(self, name: str, top_n: int = 10) -> list[dict]:
+        return self._call("/restaurants/similar", {"name": name, "top_n": top_n})
+
+    def state_names(self) -> list[str]:
+        return self._call("/states")
+
+    def state_restaurants(self, state: str, limit: int = 20) -> list[str]:
+        return self._call(f"/states/{self._seg(state)}/restaurants", params={"limit": limit})
+
+    def state_details(self, state: str, name: str) -> dict | None:
+        return self._call(f"/states/{self._seg(state)}/restaurants/{self._seg(name)}")
+
+    def aspects(self, aspects: list[str], top_n: int = 10) -> list[dict]:
+        return self._call("/aspects", {"aspects": aspects, "top_n": top_n})
+
+    def recent_feedback(self, limit: int = 10) -> list[dict]:
+        return self._call("/feedback", params={"limit": limit})
+
+    def add_feedback(self, rating: int, comment: str, restaurant: str | None = None) -> bool:
+        return self._call("/feedback", {"rating": rating, "comment": comment, "restaurant": restaurant})["stored"]
+
+    def cache_stats(self) -> dict:
+        return self._call("/cache/stats")
+
+
+def local_engine() -> RecommenderEngine:
+    """Process-wide engine shared by every session."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = RecommenderEngine(store=default_store(), sentiment_path=live_store_path())
+        return _engine
+
+
+def get_backend():
+    url = os.environ.get(SERVICE_URL_ENV)
+    return ServiceClient(url) if url else local_engine()
@@ -0,0 +1,110 @@
+"""Server-side marker clustering over a precomputed Web-Mercator grid hierarchy.
+
+At zoom `z` the world is split into `2**z * tile_cells` cells per axis, so each
+cell at `z - 1` is exactly the union of four cells at `z`. The finest level is
+built from the points once; coarser levels are summed up from it. A viewport
+query then only touches the cells of one level that fall inside the bounds.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+MAX_LAT = 85.05112878  # Web-Mercator limit
+
+
+def mercator_xy(lat, lon) -> tuple[np.ndarray, np.ndarray]:
+    """Project degrees to normalized Web-Mercator x, y in [0, 1) (y grows southwards)."""
+    lat = np.clip(np.asarray(lat, dtype=float), -MAX_LAT, MAX_LAT)
+    lon = np.asarray(lon, dtype=float)
+    x = (lon + 180.0) / 360.0
+    siny = np.sin(np.radians(lat))
+    y = 0.5 - np.log((1 + siny) / (1 - siny)) / (4 * math.pi)
+    return x, y
+
+
+def viewport_bounds(lat: float, lon: float, zoom: int, width_px: int = 700,
+                    height_px: int = 520) -> tuple[float, float, float, float]:
+    """Approximate (south, west, north, east) of a map centred at (lat, lon)."""
+    world_px = 256 * 2 ** zoom
+    x, y = mercator_xy(lat, lon)
+    dx, dy = width_px / 2 / world_px, height_px / 2 / world_px
+
+    def _lat(yy):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * yy))))
+
+    west = float(x - dx) * 360 - 180
+    east = float(x + dx) * 360 - 180
+    return _lat(min(1.0, float(y + dy))), max(-180.0, west), _lat(max(0.0, float(y - dy))), min(180.0, east)
+
+
+class ClusterIndex:
+    """Counts and centroids of points per grid cell for every zoom level."""
+
+    def __init__(self, lat, lon, min_zoom: int = 0, max_zoom: int = 18, tile_cells: int = 4):
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.tile_cells = tile_cells
+        self.levels: dict[int, pd.DataFrame] = {}
+
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        self.size = len(lat)
+
+        n = self._cells(max_zoom)
+        x, y = mercator_xy(lat, lon)
+        cells = pd.DataFrame({
+            "cx": np.clip((x * n).astype(np.int64), 0, n - 1),
+            "cy": np.clip((y * n).astype(np.int64), 0, n - 1),
+            "count": np.ones(len(lat), dtype=np.int64),
+            "lat_sum": lat,
+            "lon_sum": lon,
+            "idx": np.arange(len(lat)),
+        })
+        level = self._group(cells)
+        for z in range(max_zoom, min_zoom - 1, -1):
+            self.levels[z] = level
+            if z > min_zoom:
+                level = self._group(level.assign(cx=level["cx"] // 2, cy=level["cy"] // 2))
+
+    def _cells(self, zoom: int) -> int:
+        return 2 ** zoom * self.tile_cells
+
+    @staticmethod
+    def _group(cells: pd.DataFrame) -> pd.DataFrame:
+        return cells.groupby(["cx", "cy"], sort=False).agg(
+            count=("count", "sum"),
+            lat_sum=("lat_sum", "sum"),
+            lon_sum=("lon_sum", "sum"),
+            idx=("idx", "min"),
+        ).reset_index()
+
+    def visible(self, south: float, west: float, north: float, east: float,
+                zoom: int, pad_cells: int = 1) -> pd.DataFrame:
+        """Clusters inside the viewport at `zoom`.
+
+        Returns `lat`, `lon` (cluster centroid), `count` and `idx`; `idx` is the
+        original row position and identifies the point when `count == 1`.
+        """
+        zoom = int(min(max(zoom, self.min_zoom), self.max_zoom))
+        level = self.levels[zoom]
+        n = self._cells(zoom)
+        x, y = mercator_xy([south, north], [west, east])
+        x0, x1 = np.clip((x * n).astype(np.int64), 0, n - 1)
+        y1, y0 = np.clip((y * n).astype(np.int64), 0, n - 1)  # south has the larger y
+        x0, x1 = int(x0) - pad_cells, int(x1) + pad_cells
+        y0, y1 = int(y0) - pad_cells, int(y1) + pad_cells
+
+        cx, cy = level["cx"].to_numpy(), level["cy"].to_numpy()
+        in_y = (cy >= y0) & (cy <= y1)
+        if west <= east:
+            in_x = (cx >= x0) & (cx <= x1)
+        else:  # viewport crosses the antimeridian
+            in_x = (cx >= x0) | (cx <= x1)
+        hit = level[in_x & in_y]
+        return pd.DataFrame({
+            "lat": hit["lat_sum"] / hit["count"],
+            "lon": hit["lon_sum"] / hit["count"],
+            "count": hit["count"],
+            "idx": hit["idx"],
+        }).reset_index(drop=True)
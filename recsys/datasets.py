@@ -0,0 +1,94 @@
+"""Dataset paths and loaders shared by the pages and helper modules."""
+import os
+
+import pandas as pd
+
+# -------------------- Paths --------------------
+RECIPES = "data/raw/Food Ingredients and Recipe Dataset with Image Name Mapping.csv"
+TRIP = "data/raw/TripAdvisor_RestauarantRecommendation.csv"
+TRIP_SENTIMENT = "data/raw/TripAdvisor_RestauarantRecommendation1.csv"
+LAT_LON = "data/raw/df_with_lat_lon.xlsx"
+SENTIMENT = "data/raw/final_sentiment_df.xlsx"
+FEEDBACK = "data/raw/feedback.csv"
+ZOMATO = "data/raw/zomato.csv"
+RESTAURANT_IDS = "data/restaurant_ids.csv"  # written by `python -m recsys.resolve`
+
+STATES = {
+    "New York": "data/New York/New_York.csv",
+    "New Jersey": "data/New Jersey/New_Jersey.csv",
+    "California": "data/California/California.csv",
+    "Texas": "data/Texas/Texas.csv",
+    "Washington": "data/Washington/Washington.csv",
+}
+
+_LFS_HEADER = b"version https://git-lfs.github.com/spec/v1"
+
+
+def is_lfs_pointer(path: str) -> bool:
+    """True when `path` is a Git LFS pointer rather than the real file."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(_LFS_HEADER)) == _LFS_HEADER
+    except OSError:
+        return False
+
+
+def is_available(path: str) -> bool:
+    """True when `path` exists and holds real (non-pointer) data."""
+    return os.path.isfile(path) and not is_lfs_pointer(path)
+
+
+# -------------------- Loaders --------------------
+def load_state(path: str) -> pd.DataFrame:
+    """Read a state CSV and fold 'Street Address' into 'Location'."""
+    df = pd.read_csv(path)
+    if "Street Address" in df.columns and "Location" in df.columns:
+        df["Location"] = df["Street Address"] + ", " + df["Location"]
+        df = df.drop(columns=["Street Address"])
+    return df
+
+
+def attach_ids(df: pd.DataFrame, source: str, path: str,
+               ids_path: str = RESTAURANT_IDS) -> pd.DataFrame:
+    """`df` (read from `path`, indexed by file row) with a `restaurant_id` column.
+
+    Only when the id table is at least as new as `path`; otherwise `df` is
+    returned unchanged. `source` is the name `recsys.resolve` gave the file.
+    """
+    if not (is_available(ids_path) and os.path.getmtime(ids_path) >= os.path.getmtime(path)):
+        return df
+    from recsys import resolve  # imported lazily: resolve imports this module
+
+    return resolve.join_ids(df, source, resolve.load_ids(ids_path))
+
+
+def load_trip_sentiment(path: str = TRIP_SENTIMENT, ids_path: str = RESTAURANT_IDS) -> pd.DataFrame:
+    """TripAdvisor rows with sentiment columns, one row per restaurant.
+
+    The index stays the row in the file. With a current restaurant id table,
+    rows are deduplicated on `restaurant_id` (same-named branches stay,
+    spelling variants collapse); otherwise they fall back to one row per name.
+    """
+    df = pd.read_csv(path)
+    if "Name" not in df.columns:
+        return df
+    key = "Name"
+    df = attach_ids(df, "tripadvisor-sentiment", path, ids_path)
+    if "restaurant_id" in df.columns:
+        df["restaurant_id"] = df["restaurant_id"].fillna("name:" + df["Name"].astype(str))
+        key = "restaurant_id"
+    df = df.drop_duplicates(subset=key)
+    if {"Street Address", "Location"}.issubset(df.columns):
+        df["Location"] = df["Street Address"].astype(str) + ", " + df["Location"].astype(str)
+        df = df.drop(columns=["Street Address"], errors="ignore")
+    return df
+
+
+def load_sentiment(path: str = SENTIMENT, ids_path: str = RESTAURANT_IDS) -> pd.DataFrame:
+    """Aspect sentiment averages per restaurant (page 5), with `restaurant_id` when current."""
+    return attach_ids(pd.read_excel(path), "final-sentiment", path, ids_path)
+
+
+def load_lat_lon(path: str = LAT_LON, ids_path: str = RESTAURANT_IDS) -> pd.DataFrame:
+    """TripAdvisor rows with coordinates (page 6), with `restaurant_id` when current."""
+    return attach_ids(pd.read_excel(path), "lat-lon", path, ids_path)
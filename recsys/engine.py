@@ -0,0 +1,472 @@
+"""Headless recommendation engine: data and models loaded once, shared by all callers.
+
+Used in-process by the pages (see `recsys.client`) and behind the HTTP API in
+`recsys.service`. Every method returns plain JSON-able values (records,
+lists, dicts) so both paths look the same to a caller. Datasets and trained
+models are built lazily on first use, exactly once per key, and are safe to
+share between threads.
+
+Datasets are held as read-only column arrays (`recsys.shared.Table`). With a
+`SharedStore` they are published once and memory-mapped by every process,
+so extra Streamlit workers or service processes do not duplicate them.
+
+Dish, aspect and Top-N results are cached per canonical query and dataset
+version (`recsys.cache`). Source files are re-checked at most every
+`refresh_seconds`; a changed file drops the datasets, models and results
+built from it.
+
+With `sentiment_path` (opt-in, see `recsys.sentiment.live_store_path`),
+feedback comments are folded into the shipped aspect sentiment averages: a
+new comment is scored as soon as it is stored, and every refresh scores
+feedback rows appended since the last run. The review corpus itself is only
+scored by `python -m recsys.sentiment update`, never in a request.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from recsys import datasets, sentiment, similarity
+from recsys.cache import ResultCache, canonical_aspects, canonical_ingredients
+from recsys.feedback import COLUMNS as FEEDBACK_COLUMNS
+from recsys.feedback import append_feedback, ensure_feedback_file
+from recsys.recommenders import (
+    IngredientIndex,
+    aspect_columns,
+    label_matrix,
+    sentiment_columns,
+    top_by_aspects,
+    top_positions,
+    train_ranker,
+)
+from recsys.shared import Bundle, SharedStore, StringArray, Table
+from recsys.tracing import span
+
+STATE_TOP = 20
+
+# Cached result operations per dataset, dropped when that dataset changes.
+RESULT_OPS = {"recipes": ["dishes"], "trip": ["rank"], "sentiment": ["aspects"], "states": []}
+
+
+def records(df: pd.DataFrame) -> list[dict]:
+    """DataFrame -> list of dicts with NaN as None and numpy scalars as Python."""
+    return json.loads(df.to_json(orient="records"))
+
+
+def _slug(text: str) -> str:
+    return "-".join(text.lower().split())
+
+
+class RecommenderEngine:
+    """Ingredient, supervised-restaurant, state and aspect recommenders.
+
+    `frames` may pre-seed datasets (keys: recipes, trip, sentiment, states)
+    instead of reading them from `data/`, e.g. for synthetic load tests;
+    pre-seeded frames stay private to this process. `store` shares every
+    file-backed dataset across processes.
+
+    Every build-once key is a tuple whose first item names the dataset it
+    derives from (recipes, trip, sentiment, states), which is what `refresh`
+    drops when that dataset's files change. `sentiment_path` (a
+    `recsys.sentiment` store) folds scored feedback into the aspect averages
+    of trip and sentiment; None keeps the file values.
+    """
+
+    def __init__(self, frames: dict | None = None, feedback_path: str = datasets.FEEDBACK,
+                 store: SharedStore | None = None, cache_size: int = 1024,
+                 cache_ttl: float = 300.0, refresh_seconds: float = 30.0,
+                 sentiment_path: str | None = None):
+        self.feedback_path = feedback_path
+        self.store = store
+        self.sentiment_path = sentiment_path
+        self.results = ResultCache(cache_size, cache_ttl)
+        self.refresh_seconds = refresh_seconds
+        self._frames = dict(frames or {})
+        self._cache: dict = {}
+        self._versions: dict = {}
+        self._generations: dict = {}  # dataset -> refresh count, checked before caching a build
+        self._checked = float("-inf")  # the first call scores pending feedback rows
+        self._lock = threading.Lock()
+        self._key_locks: dict = {}
+        self._feedback_lock = threading.Lock()
+        self._sentiment_lock = threading.Lock()
+
+    # -------------------- build-once cache --------------------
+    def _once(self, key, build):
+        """`build()` once per key; a value built across a refresh of its dataset is not kept."""
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._cache:
+                    return self._cache[key]
+                generation = self._generations.get(key[0], 0)
+            value = build()
+            with self._lock:
+                if self._generations.get(key[0], 0) == generation:
+                    self._cache[key] = value
+            return value
+
+    # -------------------- versions --------------------
+    def _sources(self, dataset: str) -> list[str]:
+        """Files a dataset is read from (only the sentiment store when pre-seeded)."""
+        live = [self.sentiment_path] if self._live_sentiment() and dataset in ("trip", "sentiment") else []
+        if dataset in self._frames:
+            return live
+        if dataset == "states":
+            return list(datasets.STATES.values())
+        # joined to the restaurant id table once it exists
+        ids = [datasets.RESTAURANT_IDS] if os.path.isfile(datasets.RESTAURANT_IDS) else []
+        if dataset == "trip":
+            return [datasets.TRIP_SENTIMENT, *ids, *live]
+        if dataset == "sentiment":
+            return [datasets.SENTIMENT, *ids, *live]
+        return [{"recipes": datasets.RECIPES}[dataset]]
+
+    def _fingerprint(self, dataset: str) -> tuple:
+        out = []
+        for path in self._sources(dataset):
+            if path == self.sentiment_path:  # the sums, not the file: watermark writes do not count
+                with self._sentiment_store() as store:
+                    out.append(store.version())
+                continue
+            try:
+                st = os.stat(path)
+                out.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    def version(self, dataset: str) -> str:
+        """Short id of the dataset version in use (stable for pre-seeded frames)."""
+        with self._lock:
+            if dataset not in self._versions:
+                self._versions[dataset] = self._fingerprint(dataset)
+            seen = self._versions[dataset]
+        return hashlib.sha1(repr(seen).encode("utf-8")).hexdigest()[:12]
+
+    # -------------------- live sentiment --------------------
+    def _live_sentiment(self) -> bool:
+        return self.sentiment_path is not None and os.path.isfile(self.sentiment_path)
+
+    @contextlib.contextmanager
+    def _sentiment_store(self):
+        store = sentiment.SentimentStore(self.sentiment_path)
+        try:
+            yield store
+        finally:
+            store.close()
+
+    def update_sentiment(self) -> int:
+        """Score feedback rows appended since the last run, in this thread; returns how many."""
+        if self.sentiment_path is None:
+            return 0
+        _, name_col, text_col = sentiment.default_sources()["feedback"]
+        with self._sentiment_lock, self._sentiment_store() as store, span("sentiment_update"):
+            return sentiment.update_source(store, "feedback", self.feedback_path, name_col, text_col,
+                                           workers=1)
+
+    def _live(self, df: pd.DataFrame, name_col: str) -> pd.DataFrame:
+        """`df` with scored feedback folded into its aspect averages."""
+        if not self._live_sentiment() or name_col not in df.columns:
+            return df
+        with self._sentiment_store() as store:
+            live, base = store.sums(sentiment.LIVE_SOURCES), store.sums([sentiment.REVIEWS])
+        return sentiment.overlay(df, live, base, name_col)
+
+    def refresh(self) -> list[str]:
+        """Score new feedback rows, then drop datasets whose sources changed,
+        with the models and results built on them."""
+        self.update_sentiment()
+        changed = []
+        with self._lock:
+            for dataset, seen in list(self._versions.items()):
+                current = self._fingerprint(dataset)
+                if current != seen:
+                    self._versions[dataset] = current
+                    self._generations[dataset] = self._generations.get(dataset, 0) + 1
+                    for key in [k for k in self._cache if k[0] == dataset]:
+                        del self._cache[key]
+                    changed.append(dataset)
+            self._checked = time.monotonic()
+        for dataset in changed:
+            for op in RESULT_OPS[dataset]:
+                self.results.invalidate(op)
+        return changed
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._checked >= self.refresh_seconds:
+            self.refresh()
+
+    def cache_stats(self) -> dict:
+        """Result-cache size, hit/miss counts and ratios (overall and per operation)."""
+        return self.results.stats()
+
+    def preload(self) -> None:
+        """Load every dataset and the default model up front (service start-up)."""
+        self._recipes_index()
+        self._ranker(0.70)
+        self._similarity()
+        for state in datasets.STATES:
+            self._state(state)
+        self._sentiment()
+
+    # -------------------- datasets --------------------
+    def _frame(self, key: str, load):
+        return self._frames[key] if key in self._frames else load()
+
+    def _dataset(self, key: tuple, name: str, sources: list[str], build) -> Bundle:
+        """`build() -> Bundle` once per process, or attached from the shared store."""
+        def make():
+            self.version(key[0])  # fingerprint the sources this build reads
+            if self.store is None or not sources or key[0] in self._frames:
+                return build()
+            with span("attach", dataset=name):
+                return self.store.bundle(name, sources, build)
+        return self._once(key, make)
+
+    def _recipes_index(self) -> IngredientIndex:
+        def build():
+            recipes = self._frame("recipes", lambda: pd.read_csv(datasets.RECIPES))
+            parts = IngredientIndex(recipes).parts()
+            vocabulary = parts.pop("vocabulary")
+            parts["titles"] = StringArray.from_values(parts["titles"])
+            parts["ingredients"] = StringArray.from_values(parts["ingredients"])
+            return Bundle(parts, {"vocabulary": vocabulary})
+
+        def make():
+            b = self._dataset(("recipes", "bundle"), "recipes", self._sources("recipes"), build)
+            return IngredientIndex.from_parts(b.meta["vocabulary"], b["matrix"], b["norms"],
+                                              b["titles"], b["ingredients"])
+        return self._once(("recipes", "index"), make)
+
+    def _trip(self) -> Table:
+        """Name plus the sentiment feature matrix, rows with complete sentiments only."""
+        def build():
+            df = self._live(self._frame("trip", datasets.load_trip_sentiment), "Name")
+            cols = sentiment_columns(df)
+            if not cols:
+                raise ValueError(
+                    "No sentiment columns found. Expected columns containing 'Sentiment' "
+                    "(e.g., 'Average Food Sentiment', 'Average Service Sentiment')."
+                )
+            df_use = df.dropna(subset=cols)
+            if df_use.empty:
+                raise ValueError("All rows have missing sentiment values. Please check your dataset.")
+            arrays = {"X": df_use[cols].astype(float).to_numpy()}
+            if "Name" in df_use.columns:
+                arrays["Name"] = StringArray.from_values(df_use["Name"])
+            return Bundle(arrays, {"cols": cols})
+
+        def make():
+            b = self._dataset(("trip", "bundle"), "trip", self._sources("trip"), build)
+            X = b["X"]
+            columns = {"X": X, **{c: X[:, j] for j, c in enumerate(b.meta["cols"])}}
+            if "Name" in b.arrays:
+                columns["Name"] = b["Name"]
+            return Table(columns)
+        return self._once(("trip", "table"), make)
+
+    def _state(self, state: str) -> Table:
+        if state not in datasets.STATES:
+            raise KeyError(f"Unknown state: {state}")
+
+        def build():
+            if "states" in self._frames:
+                df = self._frames["states"][state]
+            else:
+                df = datasets.load_state(datasets.STATES[state])
+            table = Table.from_frame(df)
+            return Bundle({c: table[c] for c in table.columns}, {"columns": table.columns})
+
+        def make():
+            sources = [datasets.STATES[state]] if self._sources("states") else []
+            b = self._dataset(("states", "bundle", state), f"state-{_slug(state)}", sources, build)
+            return b.table(b.meta["columns"])
+        return self._once(("states", "table", state), make)
+
+    def _sentiment(self) -> Table:
+        def build():
+            df = self._frame("sentiment", datasets.load_sentiment)
+            table = Table.from_frame(self._live(df, "name"))
+            return Bundle({c: table[c] for c in table.columns}, {"columns": table.columns})
+
+        def make():
+            b = self._dataset(("sentiment", "bundle"), "sentiment", self._sources("sentiment"), build)
+            return b.table(b.meta["columns"])
+        return self._once(("sentiment", "table"), make)
+
+    # -------------------- supervised ranker --------------------
+    def _ranker(self, q: float) -> dict:
+        q = round(float(q), 4)
+
+        def build():
+            table = self._trip()
+            cols = [c for c in table.columns if c not in ("X", "Name")]
+            X = table["X"]
+            y, composite = label_matrix(X, q)
+            bundle = {"table": table, "cols": cols, "X": X, "composite": composite, "clf": None}
+            if 0 < y.sum() < len(y):
+                bundle["clf"], bundle["X_test"], bundle["y_test"] = train_ranker(X, y)
+            return bundle
+
+        return self._once(("trip", "ranker", q), build)
+
+    def restaurant_names(self) -> list[str]:
+        self._maybe_refresh()
+
+        def build():
+            table = self._trip()
+            if "Name" not in table:
+                return []
+            return list(dict.fromkeys(n for n in table["Name"] if n is not None))
+        return self._once(("trip", "names"), build)
+
+    def rank(self, q: float = 0.70, top_n: int = 10, exclude: str | None = None) -> dict:
+        """Top-N by model probability, or by composite score if labels degenerate."""
+        self._maybe_refresh()
+        q, top_n = round(float(q), 4), int(top_n)
+        key = (self.version("trip"), q, top_n, exclude)
+        return self.results.get_or_compute("rank", key, lambda: self._rank(q, top_n, exclude))
+
+    def _rank(self, q: float, top_n: int, exclude: str | None) -> dict:
+        b = self._ranker(q)
+        table, cols = b["table"], b["cols"]
+        if b["clf"] is None:
+            top = top_positions(b["composite"], top_n)
+            out = table.take(top, ["Name"] + cols).assign(Composite=b["composite"][top])
+            return {"fallback": True, "sentiment_cols": cols,
+                    "rows": records(out[["Name", "Composite"] + cols])}
+        with span("predict", rows=len(b["X"])):
+            proba = b["clf"].predict_proba(b["X"])[:, 1]
+        skip = None
+        if exclude is not None and "Name" in table:
+            skip = table.find_all("Name", exclude)  # every branch of that name
+        top = top_positions(proba, top_n, skip)
+        out = table.take(top, ["Name"] + cols).assign(**{"Match Probability": proba[top]})
+        return {"fallback": False, "sentiment_cols": cols,
+                "rows": records(out[["Name", "Match Probability"] + cols])}
+
+    def _similarity(self) -> similarity.CommentSimilarity:
+        k = similarity.SIMILAR_K
+
+        def build():
+            return similarity.build(self._live(self._frame("trip", datasets.load_trip_sentiment), "Name"), k)
+
+        def make():
+            b = self._dataset(("trip", "similarity-bundle"), f"comment-similarity-k{k}",
+                              self._sources("trip"), build)
+            return similarity.CommentSimilarity(b)
+        return self._once(("trip", "similarity"), make)
+
+    def similar(self, name: str, top_n: int = 10) -> list[dict]:
+        """Restaurants whose review comments are most similar (precomputed top-K, TF-IDF)."""
+        self._maybe_refresh()
+        return records(self._similarity().similar(name, top_n))
+
+    def evaluation(self, q: float = 0.70) -> dict | None:
+        """Test-set report, confusion matrix and ROC curve for the q model."""
+        from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
+
+        self._maybe_refresh()
+        b = self._ranker(q)
+        if b["clf"] is None:
+            return None
+
+        def build():
+            y_test = b["y_test"]
+            with span("evaluate"):
+                y_prob = b["clf"].predict_proba(b["X_test"])[:, 1]
+            y_pred = (y_prob >= 0.5).astype(int)
+            fpr, tpr, _ = roc_curve(y_test, y_prob)
+            return {
+                "report": classification_report(y_test, y_pred, digits=3),
+                "confusion": confusion_matrix(y_test, y_pred).tolist(),
+                "auc": float(roc_auc_score(y_test, y_prob)),
+                "fpr": fpr.tolist(),
+                "tpr": tpr.tolist(),
+            }
+        return self._once(("trip", "evaluation", round(float(q), 4)), build)
+
+    # -------------------- ingredients --------------------
+    def dishes(self, ingredients: str) -> list[dict]:
+        """Matching dishes; order, case and repeats of the ingredients do not matter."""
+        self._maybe_refresh()
+        query = canonical_ingredients(ingredients)
+        return self.results.get_or_compute(
+            "dishes", (self.version("recipes"), query),
+            lambda: records(self._recipes_index().query(query)),
+        )
+
+    # -------------------- states --------------------
+    def state_names(self) -> list[str]:
+        self._maybe_refresh()
+        return list(datasets.STATES)
+
+    def state_restaurants(self, state: str, limit: int = STATE_TOP) -> list[str]:
+        self._maybe_refresh()
+        names = []
+        for name in self._state(state)["Name"]:
+            if name not in names:
+                names.append(name)
+                if len(names) == limit:
+                    break
+        return names
+
+    def state_details(self, state: str, name: str) -> dict | None:
+        self._maybe_refresh()
+        table = self._state(state)
+        i = table.find("Name", name)
+        if i < 0:
+            return None
+        return records(table.take([i]))[0]
+
+    # -------------------- aspects --------------------
+    def aspects(self, aspects: list[str], top_n: int = 10) -> list[dict]:
+        self._maybe_refresh()
+        aspects, top_n = canonical_aspects(aspects), int(top_n)
+        if not aspects:
+            raise ValueError("Select at least one aspect.")
+
+        def compute():
+            table = self._sentiment()
+            cols = aspect_columns(list(aspects))
+            top = top_by_aspects([table[c] for c in cols], top_n)
+            return records(table.take(top, ["name", *cols, "url"]))
+        return self.results.get_or_compute("aspects", (self.version("sentiment"), aspects, top_n), compute)
+
+    # -------------------- feedback --------------------
+    def recent_feedback(self, limit: int = 10) -> list[dict]:
+        """Last `limit` non-empty comments."""
+        # read under the writers' lock so a half-written row is never parsed
+        with self._feedback_lock, span("feedback_read"):
+            if not os.path.isfile(self.feedback_path):
+                return []
+            df = pd.read_csv(self.feedback_path)
+        if df.empty:
+            return []
+        df["Comments"] = df["Comments"].astype(str)
+        comments = df["Comments"].str.strip()
+        df = df[comments.ne("") & comments.str.lower().ne("nan")]
+        return records(df.reindex(columns=FEEDBACK_COLUMNS).tail(limit))
+
+    def add_feedback(self, rating: int, comment: str, restaurant: str | None = None) -> bool:
+        """Serialized so concurrent sessions never lose each other's writes.
+
+        With live sentiment the new comment is scored right away; if it moves
+        a restaurant's averages, the datasets and results built on them are
+        refreshed.
+        """
+        with self._feedback_lock:
+            ensure_feedback_file(self.feedback_path)
+            stored = append_feedback(self.feedback_path, int(rating), comment, restaurant)
+        if stored and self.sentiment_path is not None:
+            self.refresh()
+        return stored
@@ -0,0 +1,49 @@
+"""Feedback CSV shared by the restaurant pages."""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from recsys.tracing import span
+
+# 'Restaurant' is optional (older files lack it); it lets recsys.sentiment attribute comments.
+COLUMNS = ["Reviews", "Comments", "Restaurant"]
+
+
+def ensure_feedback_file(path: str) -> None:
+    """Create the feedback CSV (with header) if it does not exist yet."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if not os.path.isfile(path):
+        pd.DataFrame(columns=COLUMNS).to_csv(path, index=False)
+
+
+def append_feedback(path: str, rating: int, comment, restaurant: str | None = None) -> bool:
+    """Append a '<rating> of 5 bubbles' review; False if the comment is empty.
+
+    Rows are appended in place (header only when the file is new), so
+    byte-offset readers such as recsys.sentiment can resume where they stopped.
+    """
+    comment_clean = str(comment).strip()
+    if not comment_clean or comment_clean.lower() == "nan":
+        return False
+    with span("feedback_write"):
+        new_file = not os.path.isfile(path) or os.path.getsize(path) == 0
+        if new_file:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            columns = COLUMNS
+        else:
+            columns = list(pd.read_csv(path, nrows=0).columns)
+            if not set(COLUMNS) <= set(columns):  # older file: add the missing columns once
+                df_fb = pd.read_csv(path).reindex(columns=[*columns, *(c for c in COLUMNS if c not in columns)])
+                df_fb.to_csv(path, index=False)
+                columns = list(df_fb.columns)
+        row = pd.DataFrame([{"Reviews": f"{rating} of 5 bubbles", "Comments": comment_clean,
+                             "Restaurant": restaurant}]).reindex(columns=columns)
+        with open(path, "a+b") as fh:
+            fh.seek(0, os.SEEK_END)
+            if fh.tell():
+                fh.seek(-1, os.SEEK_END)
+                if fh.read(1) != b"\n":  # last row written without a newline
+                    fh.write(b"\n")
+            fh.write(row.to_csv(index=False, header=new_file, lineterminator="\n").encode("utf-8"))
+    return True
@@ -0,0 +1,179 @@
+"""Radius and k-nearest restaurant lookups over a haversine ball tree."""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.neighbors import BallTree
+
+EARTH_RADIUS_KM = 6371.0088
+WIDEN_ROUNDS = 2  # kNN fetches widened ×4 this often before scanning the filtered rows
+
+# Candidate column names across the TripAdvisor / Zomato / geocoded frames.
+LAT_COLUMNS = ["lat", "latitude", "Lat", "Latitude", "LAT"]
+LON_COLUMNS = ["lon", "lng", "long", "longitude", "Lon", "Lng", "Longitude", "LON"]
+NAME_COLUMNS = ["Name", "name"]
+CUISINE_COLUMNS = ["Type", "cuisines", "Cuisines"]
+RATING_COLUMNS = ["Reviews", "rate", "Rating", "rating"]
+
+
+def _first_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
+    for c in candidates:
+        if c in df.columns:
+            return c
+    return None
+
+
+def parse_rating(s: pd.Series) -> pd.Series:
+    """'4.5 of 5 bubbles' or '4.1/5' -> float; anything else -> NaN."""
+    num = s.astype(str).str.extract(r"(\d+(?:\.\d+)?)", expand=False)
+    return pd.to_numeric(num, errors="coerce")
+
+
+def split_cuisines(s: pd.Series) -> pd.Series:
+    """Comma-separated cuisine strings -> tuple of lower-cased tokens."""
+    return s.fillna("").astype(str).map(
+        lambda t: tuple(tok.strip().lower() for tok in t.split(",") if tok.strip())
+    )
+
+
+def standardize_coords(df: pd.DataFrame, lat_col: str | None = None,
+                       lon_col: str | None = None) -> pd.DataFrame:
+    """Copy of `df` with numeric `lat` / `lon` columns and only valid coordinates."""
+    lat_col = lat_col or _first_column(df, LAT_COLUMNS)
+    lon_col = lon_col or _first_column(df, LON_COLUMNS)
+    if lat_col is None or lon_col is None:
+        raise ValueError("No latitude/longitude columns found.")
+
+    lat = pd.to_numeric(df[lat_col], errors="coerce")
+    lon = pd.to_numeric(df[lon_col], errors="coerce")
+    valid = lat.between(-90, 90) & lon.between(-180, 180)
+
+    out = df.loc[valid].drop(columns=[lat_col, lon_col]).reset_index(drop=True)
+    out["lat"] = lat[valid].to_numpy()
+    out["lon"] = lon[valid].to_numpy()
+    return out
+
+
+class GeoIndex:
+    """Ball tree over restaurant coordinates with optional cuisine/rating filters.
+
+    Cuisine membership is a sparse row × cuisine matrix; a cuisine-filtered
+    kNN query runs on a ball tree over that cuisine's rows only (built on first
+    use). A rating filter widens the candidate set a few times and then falls
+    back to scanning the rows that pass, so sparse matches never cost a
+    full-tree query.
+    """
+
+    def __init__(self, df: pd.DataFrame, lat_col: str | None = None, lon_col: str | None = None):
+        self.df = standardize_coords(df, lat_col, lon_col)
+        rating_col = _first_column(self.df, RATING_COLUMNS)
+        cuisine_col = _first_column(self.df, CUISINE_COLUMNS)
+        self.name_col = _first_column(self.df, NAME_COLUMNS)
+        self._rating = (parse_rating(self.df[rating_col]).to_numpy()
+                        if rating_col else np.full(len(self.df), np.nan))
+        cuisines = self.df[cuisine_col] if cuisine_col else pd.Series("", index=self.df.index)
+        self._vocab, self._members = self._membership(split_cuisines(cuisines))
+
+        self._coords = np.radians(self.df[["lat", "lon"]].to_numpy(dtype=float))
+        self._tree = BallTree(self._coords, metric="haversine") if len(self._coords) else None
+        self._subsets: dict = {}  # cuisine -> (rows, ball tree over them)
+
+    @staticmethod
+    def _membership(tokens: pd.Series) -> tuple[dict, sp.csc_matrix]:
+        """Cuisine -> column, and a boolean CSC matrix of rows × cuisines."""
+        vocab = {c: j for j, c in enumerate(sorted({c for t in tokens for c in t}))}
+        rows = np.repeat(np.arange(len(tokens)), tokens.map(len).to_numpy())
+        cols = np.fromiter((vocab[c] for t in tokens for c in t), dtype=np.int64, count=len(rows))
+        members = sp.csc_matrix((np.ones(len(rows), dtype=bool), (rows, cols)),
+                                shape=(len(tokens), len(vocab)))
+        members.sum_duplicates()
+        return vocab, members
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def cuisines(self) -> list[str]:
+        """Distinct cuisine tokens, for filter widgets."""
+        return list(self._vocab)
+
+    def center(self) -> tuple[float, float]:
+        return float(self.df["lat"].median()), float(self.df["lon"].median())
+
+    def _cuisine_rows(self, cuisine: str) -> np.ndarray:
+        """Sorted positions of the rows serving `cuisine`."""
+        j = self._vocab.get(cuisine.strip().lower())
+        if j is None:
+            return np.array([], dtype=np.int64)
+        m = self._members
+        return m.indices[m.indptr[j]:m.indptr[j + 1]]
+
+    def _subset(self, cuisine: str | None) -> tuple[np.ndarray | None, BallTree | None]:
+        """(rows, tree) to search: every row, or one cuisine's rows and their own tree."""
+        if not cuisine:
+            return None, self._tree
+        key = cuisine.strip().lower()
+        if key not in self._subsets:
+            rows = self._cuisine_rows(key)
+            tree = BallTree(self._coords[rows], metric="haversine") if len(rows) else None
+            self._subsets[key] = (rows, tree)
+        return self._subsets[key]
+
+    def _mask(self, idx: np.ndarray, cuisine: str | None, min_rating: float | None) -> np.ndarray:
+        keep = np.ones(len(idx), dtype=bool)
+        if min_rating is not None:
+            keep &= self._rating[idx] >= min_rating
+        if cuisine:
+            keep &= np.isin(idx, self._cuisine_rows(cuisine))
+        return keep
+
+    def _distances(self, point: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """Haversine distances in radians from `point` (lat, lon radians) to rows `idx`."""
+        lat, lon = self._coords[idx, 0], self._coords[idx, 1]
+        a = (np.sin((lat - point[0]) / 2) ** 2
+             + np.cos(point[0]) * np.cos(lat) * np.sin((lon - point[1]) / 2) ** 2)
+        return 2 * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    def _result(self, idx: np.ndarray, dist_rad: np.ndarray) -> pd.DataFrame:
+        out = self.df.iloc[idx].copy()
+        out["distance_km"] = dist_rad * EARTH_RADIUS_KM
+        out["rating"] = self._rating[idx]
+        return out
+
+    def radius(self, lat: float, lon: float, km: float, cuisine: str | None = None,
+               min_rating: float | None = None, limit: int | None = None) -> pd.DataFrame:
+        """All restaurants within `km` of (lat, lon), nearest first."""
+        if self._tree is None:
+            return self._result(np.array([], dtype=int), np.array([]))
+        point = np.radians([[lat, lon]])
+        idx, dist = self._tree.query_radius(point, r=km / EARTH_RADIUS_KM,
+                                            return_distance=True, sort_results=True)
+        idx, dist = idx[0], dist[0]
+        keep = self._mask(idx, cuisine, min_rating)
+        idx, dist = idx[keep], dist[keep]
+        if limit is not None:
+            idx, dist = idx[:limit], dist[:limit]
+        return self._result(idx, dist)
+
+    def nearest(self, lat: float, lon: float, k: int = 10, cuisine: str | None = None,
+                min_rating: float | None = None) -> pd.DataFrame:
+        """The `k` closest restaurants to (lat, lon) that pass the filters."""
+        rows, tree = self._subset(cuisine)
+        if tree is None or k <= 0:
+            return self._result(np.array([], dtype=int), np.array([]))
+        n = tree.data.shape[0]
+        point = np.radians([[lat, lon]])
+        fetch = min(n, k if min_rating is None else k * 4)
+        for _ in range(WIDEN_ROUNDS + 1):
+            dist, idx = tree.query(point, k=fetch)
+            idx, dist = idx[0], dist[0]
+            if rows is not None:
+                idx = rows[idx]
+            keep = self._mask(idx, None, min_rating)
+            if keep.sum() >= k or fetch == n:
+                return self._result(idx[keep][:k], dist[keep][:k])
+            fetch = min(n, fetch * 4)
+        # few rows pass the rating filter: rank just those
+        idx = np.arange(len(self)) if rows is None else rows
+        idx = idx[self._rating[idx] >= min_rating]
+        dist = self._distances(point[0], idx)
+        order = np.argsort(dist, kind="stable")[:k]
+        return self._result(idx[order], dist[order])
@@ -0,0 +1,235 @@
+"""Persistent geocode cache with batched resolution of misses.
+
+Addresses are normalized before lookup so formatting variants share a cache
+row. Misses are deduplicated and sent to a pluggable backend in batches;
+addresses the backend reports as unknown are cached as misses, so nothing is
+paid for twice, while transient errors stay uncached and are retried later.
+Stub coordinates are fake: they are stored with `source='stub'` and only
+served back to a cache whose backend is the stub itself.
+
+Warm the cache for every state dataset from the repo root with:
+
+    python -m recsys.geocode --backend stub      # offline, fake coordinates
+    python -m recsys.geocode --backend google    # needs GOOGLE_MAPS_API_KEY
+"""
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+import pandas as pd
+
+from recsys import datasets
+
+CACHE_PATH = "data/geocode_cache.sqlite"
+
+Coords = tuple[float, float] | None
+
+
+def normalize_address(address) -> str:
+    """Lower-case, strip punctuation and collapse whitespace around commas."""
+    s = unicodedata.normalize("NFKC", str(address)).lower()
+    s = re.sub(r"[^\w\s,]", " ", s)
+    s = re.sub(r"\s*,\s*", ", ", s)
+    s = re.sub(r"\s+", " ", s)
+    return s.strip(" ,")
+
+
+# -------------------- Backends --------------------
+class StubBackend:
+    """Deterministic offline geocoder for tests and disconnected machines.
+
+    Places each address near the centroid of the state it mentions (or the
+    continental-US centre), offset by a hash of the address.
+    """
+    name = "stub"
+
+    CENTROIDS = {
+        "ny": (40.75, -73.98), "new york": (40.75, -73.98),
+        "nj": (40.06, -74.41), "new jersey": (40.06, -74.41),
+        "ca": (36.78, -119.42), "california": (36.78, -119.42),
+        "tx": (31.00, -99.00), "texas": (31.00, -99.00),
+        "wa": (47.40, -120.50), "washington": (47.40, -120.50),
+    }
+    DEFAULT = (39.83, -98.58)
+    SPREAD = 0.5  # degrees
+
+    def _centroid(self, key: str) -> tuple[float, float]:
+        for part in reversed(key.split(", ")):
+            for token in [part, *part.split(" ")]:
+                if token in self.CENTROIDS:
+                    return self.CENTROIDS[token]
+        return self.DEFAULT
+
+    def geocode_batch(self, addresses: list[str]) -> dict[str, Coords]:
+        out = {}
+        for a in addresses:
+            if not a:
+                out[a] = None
+                continue
+            h = hashlib.sha1(a.encode("utf-8")).digest()
+            dx = int.from_bytes(h[:4], "big") / 2**32 - 0.5
+            dy = int.from_bytes(h[4:8], "big") / 2**32 - 0.5
+            lat, lon = self._centroid(a)
+            out[a] = (lat + dx * self.SPREAD, lon + dy * self.SPREAD)
+        return out
+
+
+class GoogleMapsBackend:
+    """Google Geocoding API via `googlemaps`; requests in a batch run concurrently."""
+    name = "google"
+
+    def __init__(self, api_key: str | None = None, max_workers: int = 8):
+        import googlemaps  # imported lazily: optional at runtime
+
+        api_key = api_key or os.environ.get("GOOGLE_MAPS_API_KEY")
+        if not api_key:
+            raise ValueError("Set GOOGLE_MAPS_API_KEY or pass api_key.")
+        self.client = googlemaps.Client(key=api_key)
+        self.max_workers = max_workers
+
+    def _one(self, address: str):
+        """Coordinates, None for ZERO_RESULTS, or the exception of a failed request."""
+        from googlemaps.exceptions import ApiError, HTTPError, Timeout, TransportError
+
+        try:
+            hits = self.client.geocode(address)  # ZERO_RESULTS comes back as []
+        except (ApiError, HTTPError, Timeout, TransportError) as exc:
+            return exc
+        if not hits:
+            return None
+        loc = hits[0]["geometry"]["location"]
+        return float(loc["lat"]), float(loc["lng"])
+
+    def geocode_batch(self, addresses: list[str]) -> dict[str, Coords]:
+        """Results for the addresses that were answered; failed requests are left out."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = dict(zip(addresses, pool.map(self._one, addresses)))
+        return {a: r for a, r in results.items() if not isinstance(r, Exception)}
+
+
+def make_backend(name: str):
+    if name == "stub":
+        return StubBackend()
+    if name == "google":
+        return GoogleMapsBackend()
+    raise ValueError(f"Unknown geocoding backend: {name}")
+
+
+# -------------------- Cache --------------------
+class GeocodeCache:
+    """SQLite-backed map of normalized address -> (lat, lon) or a cached miss."""
+
+    def __init__(self, path: str = CACHE_PATH, backend=None, batch_size: int = 100):
+        self.path = path
+        self.backend = backend
+        self.batch_size = batch_size
+        self.include_stub = getattr(backend, "name", None) == StubBackend.name
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            " address TEXT PRIMARY KEY, lat REAL, lon REAL,"
+            " source TEXT, updated REAL)"
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()[0]
+
+    def lookup(self, keys: Iterable[str]) -> dict[str, Coords]:
+        """Cached entries for already-normalized keys (absent keys are omitted).
+
+        Rows written by the stub backend are skipped unless this cache uses it.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        real = "" if self.include_stub else " AND source != 'stub'"
+        for i in range(0, len(keys), 500):  # stay under SQLite's parameter limit
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT address, lat, lon FROM geocode WHERE address IN ({marks}){real}", chunk
+            )
+            for address, lat, lon in rows:
+                found[address] = None if lat is None else (lat, lon)
+        return found
+
+    def store(self, results: dict[str, Coords], source: str) -> None:
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)",
+            [(k, *(v if v else (None, None)), source, now) for k, v in results.items()],
+        )
+        self._conn.commit()
+
+    def resolve(self, addresses: Iterable, offline: bool = False) -> dict[str, Coords]:
+        """Coordinates for raw addresses, keyed by normalized address.
+
+        Misses go to the backend in batches of `batch_size` unless `offline`
+        is set (or no backend is configured), in which case they stay absent.
+        """
+        keys = [normalize_address(a) for a in addresses if pd.notna(a)]
+        found = self.lookup(keys)
+        misses = [k for k in dict.fromkeys(keys) if k not in found]
+        if misses and self.backend is not None and not offline:
+            for i in range(0, len(misses), self.batch_size):
+                batch = self.backend.geocode_batch(misses[i:i + self.batch_size])
+                self.store(batch, self.backend.name)
+                found.update(batch)
+        return found
+
+    def backfill(self, df: pd.DataFrame, address_col: str = "Location",
+                 offline: bool = False) -> pd.DataFrame:
+        """Return `df` with `lat` / `lon` columns resolved through the cache."""
+        resolved = self.resolve(df[address_col], offline=offline)
+        coords = df[address_col].map(
+            lambda a: resolved.get(normalize_address(a)) if pd.notna(a) else None
+        )
+        out = df.copy()
+        out["lat"] = [c[0] if c else None for c in coords]
+        out["lon"] = [c[1] if c else None for c in coords]
+        return out
+
+
+# -------------------- State datasets --------------------
+def load_states_with_coords(cache: GeocodeCache, offline: bool = True) -> pd.DataFrame:
+    """All available state datasets with cached coordinates and a `State` column."""
+    frames = []
+    for state, path in datasets.STATES.items():
+        if not datasets.is_available(path):
+            continue
+        frames.append(cache.backfill(datasets.load_state(path), offline=offline).assign(State=state))
+    if not frames:
+        return pd.DataFrame(columns=["State", "lat", "lon"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Geocode state datasets into the local cache.")
+    parser.add_argument("--backend", choices=["stub", "google"], required=True,
+                        help="'google' for real coordinates; 'stub' writes fake ones for offline testing")
+    parser.add_argument("--cache", default=CACHE_PATH)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    cache = GeocodeCache(args.cache, make_backend(args.backend), args.batch_size)
+    before = len(cache)
+    df = load_states_with_coords(cache, offline=False)
+    resolved = int(df["lat"].notna().sum()) if len(df) else 0
+    print(f"{len(df)} rows, {resolved} with coordinates; "
+          f"{len(cache) - before} new cache entries ({len(cache)} total).")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
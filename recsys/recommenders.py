@@ -0,0 +1,161 @@
+"""Recommendation logic shared by the pages (kept free of Streamlit calls)."""
+import numpy as np
+import pandas as pd
+
+from recsys.tracing import span
+
+SIMILARITY_THRESHOLD = 0.3
+
+ASPECTS = ["Food", "Price", "Service", "Ambiance"]
+
+
+# -------------------- Ingredient-based dishes --------------------
+class IngredientIndex:
+    """Bag-of-words ingredient matrix, fitted once and queried many times.
+
+    Query terms count once however often they repeat, so a query's word order
+    and repeats do not change its results (the result cache relies on this).
+
+    Queries only read `matrix`, `norms`, `titles` and `ingredients`, so an
+    index rebuilt with `from_parts` over memory-mapped arrays (see
+    `recsys.shared`) answers without copying them.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        # sklearn is only needed once dishes are actually recommended
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        with span("vectorize", rows=len(data)):
+            vectorizer = CountVectorizer()
+            matrix = vectorizer.fit_transform(data['Cleaned_Ingredients']).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1), dtype=float).ravel())
+        self._attach(vectorizer, matrix, norms,
+                     data['Title'].to_numpy(), data['Cleaned_Ingredients'].to_numpy())
+
+    @classmethod
+    def from_parts(cls, vocabulary: dict, matrix, norms, titles, ingredients) -> "IngredientIndex":
+        """Index over prebuilt parts (e.g. shared arrays) without refitting."""
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        index = cls.__new__(cls)
+        index._attach(CountVectorizer(vocabulary=vocabulary), matrix, norms, titles, ingredients)
+        return index
+
+    def _attach(self, vectorizer, matrix, norms, titles, ingredients) -> None:
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.norms = norms
+        self.titles = titles
+        self.ingredients = ingredients
+
+    def parts(self) -> dict:
+        """Everything `from_parts` needs (vocabulary as plain ints, JSON-able)."""
+        return {
+            "vocabulary": {term: int(i) for term, i in self.vectorizer.vocabulary_.items()},
+            "matrix": self.matrix,
+            "norms": self.norms,
+            "titles": self.titles,
+            "ingredients": self.ingredients,
+        }
+
+    def query(self, user_input: str, threshold: float = SIMILARITY_THRESHOLD) -> pd.DataFrame:
+        """Dishes whose ingredients are cosine-similar (>= threshold) to `user_input`."""
+        user_vector = self.vectorizer.transform([user_input.lower()])
+        user_vector.data[:] = 1  # a term is in the query or not
+        with span("similarity"):
+            # cosine = dot / (|row| * |user|), with dot computed sparse against the stored matrix
+            dots = np.asarray((self.matrix @ user_vector.T).todense(), dtype=float).ravel()
+            denom = self.norms * np.sqrt(user_vector.multiply(user_vector).sum())
+            similarities = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+        hits = np.flatnonzero(similarities >= threshold)
+        return pd.DataFrame(
+            {'Title': self.titles[hits], 'Cleaned_Ingredients': self.ingredients[hits]},
+            index=hits,
+        )
+
+
+def recommend_dishes(data: pd.DataFrame, user_input: str,
+                     threshold: float = SIMILARITY_THRESHOLD) -> pd.DataFrame:
+    """One-shot form of IngredientIndex(data).query(user_input)."""
+    return IngredientIndex(data).query(user_input, threshold)
+
+
+# -------------------- Supervised restaurant ranking --------------------
+def sentiment_columns(df: pd.DataFrame) -> list[str]:
+    """Columns whose name contains 'Sentiment' (the model features)."""
+    return [c for c in df.columns if "Sentiment" in c]
+
+
+def label_matrix(X: np.ndarray, q: float):
+    """Binary labels (composite score >= q-quantile) and the composite for features `X`."""
+    composite = X.mean(axis=1)
+    threshold = float(np.quantile(composite, q))
+    return (composite >= threshold).astype(int), composite
+
+
+def make_labels(df_use: pd.DataFrame, sentiment_cols: list[str], q: float):
+    """Features, binary labels (composite score >= q-quantile) and the composite."""
+    X = df_use[sentiment_cols].astype(float).values
+    y, composite = label_matrix(X, q)
+    return X, y, pd.Series(composite, index=df_use.index)
+
+
+def train_ranker(X: np.ndarray, y: np.ndarray):
+    """Fit the gradient-boosting ranker; returns (clf, X_test, y_test)."""
+    from sklearn.model_selection import train_test_split
+    from sklearn.ensemble import GradientBoostingClassifier
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.25, stratify=y, random_state=42
+    )
+    clf = GradientBoostingClassifier(
+        n_estimators=200,
+        learning_rate=0.05,
+        max_depth=3,
+        random_state=42,
+    )
+    with span("train", rows=len(X_train)):
+        clf.fit(X_train, y_train)
+    return clf, X_test, y_test
+
+
+def top_positions(scores: np.ndarray, top_n: int, skip: np.ndarray | None = None) -> np.ndarray:
+    """Positions of the `top_n` highest scores, best first, leaving out `skip` positions."""
+    with span("sort", rows=len(scores)):
+        order = np.argsort(-np.asarray(scores, dtype=float), kind="stable")
+        if skip is not None and len(skip):
+            order = order[~np.isin(order, skip)]
+        return order[:top_n]
+
+
+def rank_restaurants(clf, df_use: pd.DataFrame, X: np.ndarray, top_n: int,
+                     exclude: str | None = None) -> pd.DataFrame:
+    """Top-N rows of `df_use` by predicted probability of the positive class."""
+    with span("predict", rows=len(X)):
+        proba = clf.predict_proba(X)[:, 1]
+    skip = None
+    if exclude is not None and "Name" in df_use.columns:
+        skip = np.flatnonzero(df_use["Name"].to_numpy() == exclude)
+    top = top_positions(proba, top_n, skip)
+    return df_use.iloc[top].assign(**{"Match Probability": proba[top]})
+
+
+# -------------------- Aspect-based ranking --------------------
+def aspect_columns(aspects: list[str]) -> list[str]:
+    return [f'Average {aspect} Sentiment' for aspect in aspects]
+
+
+def top_by_aspects(columns: list[np.ndarray], top_n: int) -> np.ndarray:
+    """Positions of the top-N rows sorted descending by `columns` (first column first).
+
+    Array form of `recommend_restaurants`, usable on shared read-only columns.
+    """
+    with span("sort", rows=len(columns[0]) if columns else 0):
+        # lexsort's primary key is the last one; NaN sorts last, as in pandas
+        return np.lexsort([-np.asarray(c, dtype=float) for c in reversed(columns)])[:top_n]
+
+
+def recommend_restaurants(df: pd.DataFrame, aspects: list[str], top_n: int) -> pd.DataFrame:
+    """Top-N restaurants sorted by the selected aspect sentiments (in order)."""
+    with span("sort", rows=len(df)):
+        return df.sort_values(by=aspect_columns(aspects), ascending=False).head(top_n)
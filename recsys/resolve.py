@@ -0,0 +1,348 @@
+"""Cross-source restaurant deduplication (entity resolution).
+
+The per-state CSVs, both TripAdvisor files, the sentiment and coordinate
+workbooks and Zomato list many of the same restaurants, spelled slightly
+differently. Every record is reduced to a normalized name, street key (house
+number + street word) and city. Exact repeats collapse first; fuzzy candidates are then only generated inside blocks
+that share a rare name-token prefix and the city (split further by street key
+when a block is too large), and scored on character trigrams. Branches of a
+chain with the same name but a different street address are never merged, and
+a record without an address only joins a cluster whose addresses all agree.
+The pages join the id table through the `recsys.datasets` loaders.
+
+Work grows with the block sizes (capped at `max_block`), not with n², and
+block pairs are scored in bounded batches, so millions of rows stay feasible.
+
+From the repo root:
+
+    python -m recsys.resolve                      # writes data/restaurant_ids.csv
+    python -m recsys.resolve --sources zomato --out /tmp/zomato_ids.csv
+"""
+import argparse
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from recsys import datasets
+from recsys.tracing import span
+
+IDS_PATH = datasets.RESTAURANT_IDS
+
+PREFIX = 4              # characters of a name token used as a blocking key
+TOKENS_PER_RECORD = 2   # rarest blocking keys per record
+MAX_BLOCK = 500         # larger blocks are split by street key, then skipped
+THRESHOLD = 0.8         # trigram Jaccard (+ street bonus) needed for a match
+STREET_BONUS = 0.15
+PAIR_BATCH = 2_000_000  # candidate pairs materialized and scored at a time
+
+# Words too generic to identify a restaurant on their own.
+STOP_WORDS = {
+    "the", "and", "of", "at", "on", "by", "a", "an", "restaurant", "restaurants",
+    "cafe", "bar", "grill", "kitchen", "bistro", "eatery", "house", "co",
+}
+
+# Compass words dropped from street keys ('205 E Houston' == '205 East Houston').
+DIRECTIONS = r"\b(?:n|s|e|w|ne|nw|se|sw|north|south|east|west)\b"
+
+# Field -> column for `standardize`. "address" is one 'street, city, ST zip' string.
+TRIPADVISOR_COLUMNS = {"name": "Name", "street": "Street Address", "locality": "Location"}
+TRIP_COLUMNS = {"name": "Name", "address": "address"}
+SENTIMENT_COLUMNS = {"name": "name"}  # names only: joins a cluster whose addresses agree
+ZOMATO_COLUMNS = {"name": "name", "street": "address", "locality": "location"}
+
+ID_COLUMNS = ["restaurant_id", "source", "row", "name", "street", "locality"]
+
+
+# -------------------- Normalization --------------------
+def normalize(s: pd.Series) -> pd.Series:
+    """ASCII-folded lower-case words; '&' -> 'and', apostrophes dropped."""
+    s = s.fillna("").astype(str).str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    s = s.str.lower().str.replace("&", " and ", regex=False).str.replace(r"['`’]", "", regex=True)
+    return s.str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+
+
+def core_names(names: pd.Series) -> pd.Series:
+    """Normalized names without generic words (the full name if nothing is left)."""
+    names = normalize(names)
+    stop = r"\b(?:" + "|".join(sorted(STOP_WORDS)) + r")\b"
+    core = names.str.replace(stop, " ", regex=True).str.replace(r"\s+", " ", regex=True).str.strip()
+    return core.where(core != "", names)
+
+
+def street_keys(streets: pd.Series) -> pd.Series:
+    """'123 E. Main St' -> '123 main'; '' when there is no house number."""
+    streets = normalize(streets).str.replace(DIRECTIONS, " ", regex=True)
+    parts = streets.str.extract(r"\b(\d+[a-z]*)\s+([a-z0-9]+)")
+    return (parts[0] + " " + parts[1]).fillna("")
+
+
+def localities(locations: pd.Series) -> pd.Series:
+    """City part of a location: 'Austin, TX 78701' -> 'austin'."""
+    return normalize(locations.fillna("").astype(str).str.split(",").str[0])
+
+
+def split_address(addresses: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """'12 Main St, Austin, TX 78701' -> ('12 Main St', 'Austin'); no street without a city."""
+    parts = addresses.fillna("").astype(str).str.split(",")
+    n = parts.str.len()
+    street = parts.str[0].where(n >= 3, "")
+    city = parts.str[-2].where(n >= 2, parts.str[0])
+    return street.str.strip(), city.str.strip()
+
+
+def standardize(df: pd.DataFrame, source: str, columns: dict) -> pd.DataFrame:
+    """One row per record with the raw name plus its blocking / matching keys.
+
+    `columns` maps name (required) and either street + locality or one full
+    address to columns of `df`; `row` is `df`'s index, i.e. the row in the
+    file for a plain read.
+    """
+    def col(field):
+        c = columns.get(field)
+        return df[c] if c in df.columns else pd.Series("", index=df.index)
+
+    if "address" in columns:
+        street, locality = split_address(col("address"))
+    else:
+        street, locality = col("street"), col("locality")
+    out = pd.DataFrame({
+        "source": source,
+        "row": df.index.to_numpy(),
+        "name": df[columns["name"]].to_numpy(),
+        "street": street.to_numpy(),
+        "core": core_names(df[columns["name"]]).to_numpy(),
+        "street_key": street_keys(street).to_numpy(),
+        "locality": localities(locality).to_numpy(),
+    })
+    return out[out["core"] != ""].reset_index(drop=True)
+
+
+# -------------------- Sources --------------------
+def default_sources() -> dict[str, tuple[str, dict]]:
+    """Source name -> (csv / xlsx path, column mapping for `standardize`)."""
+    sources = {
+        "tripadvisor": (datasets.TRIP, TRIP_COLUMNS),
+        "tripadvisor-sentiment": (datasets.TRIP_SENTIMENT, TRIPADVISOR_COLUMNS),
+        "final-sentiment": (datasets.SENTIMENT, SENTIMENT_COLUMNS),
+        "lat-lon": (datasets.LAT_LON, TRIPADVISOR_COLUMNS),
+        "zomato": (datasets.ZOMATO, ZOMATO_COLUMNS),
+    }
+    for state, path in datasets.STATES.items():
+        sources[f"state:{state}"] = (path, TRIPADVISOR_COLUMNS)
+    return sources
+
+
+def load_records(sources: dict[str, tuple[str, dict]]) -> pd.DataFrame:
+    """Standardized records of every available source (LFS pointers are skipped)."""
+    frames = []
+    for source, (path, columns) in sources.items():
+        if not datasets.is_available(path):
+            continue
+        wanted = set(columns.values())
+        read = pd.read_excel if path.endswith(".xlsx") else pd.read_csv
+        with span("read_source", source=source):
+            df = read(path, usecols=lambda c: c in wanted, dtype=str)
+        frames.append(standardize(df, source, columns))
+    if not frames:
+        raise FileNotFoundError("None of the restaurant sources is available (Git LFS pointers?).")
+    return pd.concat(frames, ignore_index=True)
+
+
+# -------------------- Matching --------------------
+def _blocks(entities: pd.DataFrame, max_block: int) -> tuple[pd.DataFrame, int]:
+    """(entity, key) rows of the usable blocks, and how many blocks were too large.
+
+    A block over `max_block` (a chain in a big city) is split by street key:
+    records at different addresses could never match anyway. Only groups that
+    are still too large after the split are skipped. A record without a city
+    (a names-only source) meets every record sharing its name prefix.
+    """
+    tokens = entities["core"].str.split().explode().dropna()
+    prefix = tokens.str[:PREFIX].to_numpy()
+    locality = entities["locality"].to_numpy()[tokens.index]
+    keys = pd.DataFrame({"entity": tokens.index.to_numpy(), "key": prefix + "|" + locality})
+    keys = keys.drop_duplicates()
+    big = (keys.groupby("key")["entity"].transform("size") > max_block).to_numpy()
+    street = entities["street_key"].iloc[keys["entity"].to_numpy()].set_axis(keys.index)
+    keys.loc[big, "key"] = keys.loc[big, "key"] + "|" + street[big]
+    keys["size"] = keys.groupby("key")["entity"].transform("size")
+    keys = keys.sort_values(["entity", "size"], kind="stable").groupby("entity").head(TOKENS_PER_RECORD)
+    unlocated = entities["locality"].to_numpy()[keys["entity"].to_numpy()] == ""
+    loose = keys.loc[unlocated, "key"].unique()
+    if len(loose):
+        joins = (locality != "") & np.isin(prefix + "|", loose)
+        extra = pd.DataFrame({"entity": tokens.index.to_numpy()[joins], "key": prefix[joins] + "|"})
+        keys = pd.concat([keys[["entity", "key"]], extra]).drop_duplicates()
+    sizes = keys.groupby("key")["entity"].transform("size")
+    skipped = int(keys.loc[sizes > max_block, "key"].nunique())
+    return keys.loc[(sizes > 1) & (sizes <= max_block), ["entity", "key"]], skipped
+
+
+def _pair_batches(blocks: pd.DataFrame, batch: int = PAIR_BATCH):
+    """(left, right) entity arrays, left < right, a bounded number of pairs at a time."""
+    sizes = blocks["key"].value_counts()
+    batch_of = pd.Series((sizes.to_numpy() ** 2).cumsum() // batch, index=sizes.index)
+    for _, part in blocks.groupby(blocks["key"].map(batch_of), sort=False):
+        pairs = part.merge(part, on="key")
+        pairs = pairs[pairs["entity_x"] < pairs["entity_y"]].drop_duplicates(["entity_x", "entity_y"])
+        yield pairs["entity_x"].to_numpy(), pairs["entity_y"].to_numpy()
+
+
+def _matches(entities: pd.DataFrame, trigrams, sizes: np.ndarray, left: np.ndarray,
+             right: np.ndarray, threshold: float) -> np.ndarray:
+    """Mask of candidate pairs that are the same restaurant."""
+    inter = np.asarray(trigrams[left].multiply(trigrams[right]).sum(axis=1)).ravel()
+    score = inter / np.maximum(sizes[left] + sizes[right] - inter, 1)
+    street = entities["street_key"].to_numpy()
+    known = (street[left] != "") & (street[right] != "")
+    same = street[left] == street[right]
+    score = score + STREET_BONUS * (known & same)
+    city = entities["locality"].to_numpy()
+    other_city = (city[left] != "") & (city[right] != "") & (city[left] != city[right])
+    return ~(known & ~same) & ~other_city & (score >= threshold)
+
+
+def _clusters(n: int, left: np.ndarray, right: np.ndarray, rank: np.ndarray) -> np.ndarray:
+    """Cluster label per entity from matched pairs.
+
+    `rank` is how precisely an entity is located: 2 with a street key, 1 with
+    only a city, 0 with neither. Ranks are clustered from the most precise
+    down. Entities of one rank first form clusters among themselves; such a
+    cluster then joins an already placed one only when that is the one placed
+    cluster it matched, so a record that matched two branches of a chain (or
+    the same name in two cities) stays separate instead of bridging them.
+    """
+    import scipy.sparse as sp
+    from scipy.sparse.csgraph import connected_components
+
+    label = np.full(n, -1, dtype=np.int64)
+    placed = np.zeros(n, dtype=bool)
+    next_label = 0
+    for level in sorted(set(rank.tolist()), reverse=True):
+        here = rank == level
+        pure = here[left] & here[right]
+        edges = (np.ones(int(pure.sum())), (left[pure], right[pure]))
+        component = connected_components(sp.coo_matrix(edges, shape=(n, n)), directed=False)[1]
+        label[here] = component[here] + next_label
+        next_label = int(label.max()) + 1
+
+        cross = (here[left] & placed[right]) | (here[right] & placed[left])
+        l, r = left[cross], right[cross]
+        links = pd.DataFrame({
+            "loose": label[np.where(here[l], l, r)],
+            "anchor": label[np.where(here[l], r, l)],
+        }).drop_duplicates()
+        single = links[links.groupby("loose")["anchor"].transform("size") == 1]
+        joined = pd.Series(single["anchor"].to_numpy(), index=single["loose"].to_numpy())
+        label[here] = pd.Series(label[here]).map(joined).fillna(pd.Series(label[here])).to_numpy()
+        placed |= here
+    return np.unique(label, return_inverse=True)[1]
+
+
+def resolve(records: pd.DataFrame, max_block: int = MAX_BLOCK,
+            threshold: float = THRESHOLD) -> tuple[pd.DataFrame, dict]:
+    """`restaurant_id` for every standardized record, plus counts of each stage."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    with span("collapse", rows=len(records)):
+        exact = ["core", "street_key", "locality"]
+        entity = records.groupby(exact, sort=False).ngroup().to_numpy()
+        first = np.unique(entity, return_index=True)[1]
+        entities = records.iloc[first].reset_index(drop=True)
+
+    with span("block", entities=len(entities)):
+        blocks, skipped = _blocks(entities, max_block)
+
+    with span("score"):
+        trigrams = CountVectorizer(analyzer="char_wb", ngram_range=(3, 3), binary=True,
+                                   dtype=np.float32).fit_transform(entities["core"]).tocsr()
+        sizes = np.asarray(trigrams.sum(axis=1)).ravel()
+        candidates, left_all, right_all = 0, [], []
+        for left, right in _pair_batches(blocks):
+            candidates += len(left)
+            keep = _matches(entities, trigrams, sizes, left, right, threshold)
+            left_all.append(left[keep])
+            right_all.append(right[keep])
+        left = np.concatenate(left_all) if left_all else np.zeros(0, dtype=np.int64)
+        right = np.concatenate(right_all) if right_all else np.zeros(0, dtype=np.int64)
+
+    with span("cluster"):
+        n = len(entities)
+        located = np.where(entities["locality"].to_numpy() != "", 1, 0)
+        rank = np.where(entities["street_key"].to_numpy() != "", 2, located)
+        label = _clusters(n, left, right, rank)
+        clusters = int(label.max()) + 1 if n else 0
+        # The smallest key of a cluster names it, so ids do not depend on source order.
+        key = (entities["core"] + "|" + entities["street_key"] + "|" + entities["locality"]).to_numpy(dtype=object)
+        order = np.argsort(key, kind="stable")
+        first = np.unique(label[order], return_index=True)[1]
+        smallest = np.empty(clusters, dtype=object)
+        smallest[label[order[first]]] = key[order[first]]
+        ids = np.array(["r" + hashlib.sha1(k.encode("utf-8")).hexdigest()[:12] for k in smallest], dtype=object)
+
+    out = records.assign(restaurant_id=ids[label[entity]])[ID_COLUMNS]
+    stats = {
+        "records": len(records),
+        "entities": n,
+        "blocks": int(blocks["key"].nunique()),
+        "skipped_blocks": skipped,
+        "candidate_pairs": candidates,
+        "all_pairs": n * (n - 1) // 2,
+        "matched_pairs": len(left),
+        "restaurants": int(out["restaurant_id"].nunique()),
+    }
+    return out, stats
+
+
+# -------------------- Output --------------------
+def restaurants(ids: pd.DataFrame) -> pd.DataFrame:
+    """One row per restaurant_id: most common name, locality, record and source counts."""
+    name = (ids.groupby(["restaurant_id", "name"]).size().reset_index(name="n")
+            .sort_values(["restaurant_id", "n", "name"], ascending=[True, False, True])
+            .drop_duplicates("restaurant_id").set_index("restaurant_id")["name"])
+    grouped = ids.groupby("restaurant_id")
+    return pd.DataFrame({
+        "name": name,
+        "locality": grouped["locality"].first(),
+        "records": grouped.size(),
+        "sources": grouped["source"].agg(lambda s: ", ".join(sorted(set(s)))),
+    }).reset_index()
+
+
+def load_ids(path: str = IDS_PATH) -> pd.DataFrame:
+    return pd.read_csv(path, dtype={"restaurant_id": str, "source": str, "row": "int64"},
+                       keep_default_na=False)
+
+
+def join_ids(df: pd.DataFrame, source: str, ids: pd.DataFrame) -> pd.DataFrame:
+    """`df` (a source frame still indexed by file row) with a restaurant_id column."""
+    mapping = ids.loc[ids["source"] == source].set_index("row")["restaurant_id"]
+    return df.assign(restaurant_id=df.index.map(mapping))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Assign canonical restaurant ids across sources.")
+    parser.add_argument("--sources", default="", help="Comma-separated subset of: " + ", ".join(default_sources()))
+    parser.add_argument("--out", default=IDS_PATH)
+    parser.add_argument("--max-block", type=int, default=MAX_BLOCK)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    sources = default_sources()
+    names = [s for s in args.sources.split(",") if s] or list(sources)
+    unknown = set(names) - set(sources)
+    if unknown:
+        parser.error(f"Unknown sources: {', '.join(sorted(unknown))}")
+
+    started = time.perf_counter()
+    ids, stats = resolve(load_records({s: sources[s] for s in names}), args.max_block, args.threshold)
+    ids.to_csv(args.out, index=False)
+    for name, value in stats.items():
+        print(f"{name:<20}{value:>14,}")
+    print(f"{len(ids):,} records -> {args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""Incremental aspect-sentiment scoring of review comments.
+
+Comments are split into clauses; each clause gets a lexicon polarity in
+[-1, 1] (negation and intensifiers aware, VADER-style normalization) that
+counts towards every aspect (Food, Price, Service, Ambiance) it mentions.
+Chunks of comments are scored in a process pool and reduced to per-restaurant
+sums and counts, which a SQLite store accumulates per source together with a
+byte-offset watermark. Re-running only reads and scores rows appended since
+the last run, so a new feedback comment costs one comment, not the whole
+corpus. An untouched file (same size and mtime) is skipped without reading it;
+if the bytes before the watermark no longer hash the same (file edited or
+replaced), that source is rescored from scratch.
+
+The shipped `Average <Aspect> Sentiment` values stay the baseline: `overlay`
+treats them as running sums weighted by how many review comments mention the
+aspect (from the "tripadvisor" source once the CLI has scored it, else 1) and
+folds in only the new feedback comments. Scoring the review corpus is a batch
+job for the CLI; the app only scores feedback, and only when
+RECSYS_LIVE_SENTIMENT=1.
+
+From the repo root:
+
+    python -m recsys.sentiment update            # score new rows of every source
+    python -m recsys.sentiment update --full     # forget the sums and rescore
+    python -m recsys.sentiment show --top 20
+    python -m recsys.sentiment export data/raw/live_sentiment.csv
+"""
+import argparse
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import time
+
+import pandas as pd
+
+from recsys import datasets
+from recsys.aggregate import reduce_tasks
+from recsys.recommenders import ASPECTS, aspect_columns
+
+STORE_PATH = "data/sentiment_state.sqlite"
+LIVE_ENV = "RECSYS_LIVE_SENTIMENT"
+REVIEWS = "tripadvisor"  # source whose counts weight the shipped averages
+LIVE_SOURCES = ["feedback"]  # sources folded into the shipped averages
+
+# -------------------- Lexicon --------------------
+ASPECT_TERMS = {
+    "Food": {
+        "food", "dish", "dishes", "meal", "meals", "taste", "tasty", "flavor", "flavour",
+        "flavors", "delicious", "menu", "portion", "portions", "dessert", "desserts", "pizza",
+        "burger", "steak", "sushi", "pasta", "fresh", "bland", "cooked", "breakfast", "lunch",
+        "dinner", "brunch", "drinks", "wine", "coffee", "cocktails", "appetizers", "seafood",
+    },
+    "Price": {
+        "price", "prices", "priced", "pricey", "expensive", "cheap", "value", "cost", "costly",
+        "overpriced", "affordable", "bill", "worth", "money", "reasonable", "budget",
+    },
+    "Service": {
+        "service", "staff", "waiter", "waiters", "waitress", "server", "servers", "friendly",
+        "rude", "attentive", "slow", "manager", "host", "hostess", "bartender", "served",
+        "welcoming", "helpful",
+    },
+    "Ambiance": {
+        "ambiance", "ambience", "atmosphere", "decor", "music", "loud", "noisy", "cozy", "view",
+        "views", "quiet", "vibe", "setting", "interior", "romantic", "clean", "dirty", "patio",
+        "crowded", "spacious",
+    },
+}
+POLARITY = {
+    "great": 0.9, "good": 0.6, "excellent": 1.0, "amazing": 1.0, "delicious": 1.0,
+    "tasty": 0.8, "friendly": 0.8, "attentive": 0.8, "fresh": 0.6, "cozy": 0.7, "clean": 0.5,
+    "nice": 0.6, "lovely": 0.8, "perfect": 1.0, "best": 1.0, "affordable": 0.6,
+    "reasonable": 0.5, "worth": 0.5, "quick": 0.5, "fast": 0.4, "quiet": 0.4, "romantic": 0.6,
+    "beautiful": 0.8, "wonderful": 1.0, "fantastic": 1.0, "outstanding": 1.0, "recommend": 0.6,
+    "love": 0.9, "loved": 0.9, "cheap": 0.3, "helpful": 0.7, "awesome": 1.0, "enjoyed": 0.7,
+    "welcoming": 0.7, "spacious": 0.5,
+    "bad": -0.7, "terrible": -1.0, "awful": -1.0, "rude": -0.9, "slow": -0.6, "bland": -0.6,
+    "cold": -0.4, "expensive": -0.5, "overpriced": -0.9, "pricey": -0.4, "costly": -0.5,
+    "dirty": -0.8, "loud": -0.4, "noisy": -0.5, "crowded": -0.3, "worst": -1.0, "poor": -0.7,
+    "disappointing": -0.8, "disappointed": -0.8, "mediocre": -0.5, "average": -0.1,
+    "horrible": -1.0, "stale": -0.7, "greasy": -0.4, "salty": -0.3, "burnt": -0.6,
+}
+NEGATIONS = {"not", "no", "never", "hardly", "nothing", "isn't", "wasn't", "aren't", "weren't",
+             "don't", "didn't", "doesn't", "can't", "couldn't", "won't"}
+INTENSIFIERS = {"very": 1.3, "really": 1.2, "extremely": 1.5, "so": 1.2, "super": 1.3, "too": 1.2}
+NEGATION_SCOPE = 3  # tokens after a negation whose polarity is flipped
+NORMALIZATION_ALPHA = 15
+
+_CLAUSES = re.compile(r"[.!?;\n]+|\bbut\b|\bhowever\b")
+_TOKENS = re.compile(r"[a-z']+")
+
+
+def clause_polarity(tokens: list[str]) -> float:
+    """Lexicon polarity of one clause, normalized to (-1, 1); 0 when neutral."""
+    total = 0.0
+    negate_until = -1
+    for i, tok in enumerate(tokens):
+        if tok in NEGATIONS:
+            negate_until = i + NEGATION_SCOPE
+            continue
+        weight = POLARITY.get(tok)
+        if weight is None:
+            continue
+        if i > 0 and tokens[i - 1] in INTENSIFIERS:
+            weight *= INTENSIFIERS[tokens[i - 1]]
+        if i <= negate_until:
+            weight *= -0.75
+        total += weight
+    return total / math.sqrt(total * total + NORMALIZATION_ALPHA) if total else 0.0
+
+
+def score_comment(text) -> dict[str, float]:
+    """Aspect -> mean polarity of the clauses mentioning it (unmentioned aspects omitted)."""
+    if pd.isna(text):
+        return {}
+    scores: dict[str, list[float]] = {}
+    for clause in _CLAUSES.split(str(text).lower()):
+        tokens = _TOKENS.findall(clause)
+        if not tokens:
+            continue
+        words = set(tokens)
+        mentioned = [a for a, terms in ASPECT_TERMS.items() if words & terms]
+        if not mentioned:
+            continue
+        polarity = clause_polarity(tokens)
+        for aspect in mentioned:
+            scores.setdefault(aspect, []).append(polarity)
+    return {a: sum(v) / len(v) for a, v in scores.items()}
+
+
+# -------------------- Partials --------------------
+# name -> {aspect: [sum, count]}; sums of per-comment aspect scores. The
+# COMMENTS pseudo-aspect counts scored comments ([0.0, count]).
+COMMENTS = "*"
+
+
+def empty_partial() -> dict:
+    return {}
+
+
+def score_chunk(names: list, texts: list) -> dict:
+    """Worker body: reduce one chunk of (restaurant, comment) pairs to sums and counts."""
+    partial: dict = {}
+    for name, text in zip(names, texts):
+        if pd.isna(name) or not str(name).strip():
+            continue
+        scores = score_comment(text)
+        if not scores:
+            continue
+        per_name = partial.setdefault(str(name).strip(), {})
+        for aspect, value in scores.items():
+            acc = per_name.setdefault(aspect, [0.0, 0])
+            acc[0] += value
+            acc[1] += 1
+        per_name.setdefault(COMMENTS, [0.0, 0])[1] += 1
+    return partial
+
+
+def merge_partials(a: dict, b: dict) -> dict:
+    """Combine two partials; associative and commutative."""
+    if len(a) < len(b):
+        a, b = b, a
+    for name, aspects in b.items():
+        per_name = a.setdefault(name, {})
+        for aspect, (total, n) in aspects.items():
+            acc = per_name.setdefault(aspect, [0.0, 0])
+            acc[0] += total
+            acc[1] += n
+    return a
+
+
+def _digest(fh, start: int, stop: int, h=None):
+    """Fold bytes [start, stop) of `fh` into the sha1 `h` (a new one when None)."""
+    h = h or hashlib.sha1()
+    fh.seek(start)
+    remaining = stop - start
+    while remaining > 0:
+        block = fh.read(min(remaining, 1 << 20))
+        if not block:
+            break
+        h.update(block)
+        remaining -= len(block)
+    return h
+
+
+# -------------------- Store --------------------
+class SentimentStore:
+    """SQLite running sums per (source, restaurant, aspect) plus per-source watermarks."""
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        legacy = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sources'"
+        ).fetchone()
+        if legacy:  # tail-only watermarks and no comment counts: rescore everything
+            self._conn.executescript("DROP TABLE sources; DROP TABLE IF EXISTS sums;")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS sums ("
+            " source TEXT, name TEXT, aspect TEXT, total REAL, n INTEGER,"
+            " PRIMARY KEY (source, name, aspect));"
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            " source TEXT PRIMARY KEY, rows INTEGER, offset INTEGER, digest TEXT,"
+            " size INTEGER, mtime_ns INTEGER, updated REAL);"
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def watermark(self, source: str) -> tuple:
+        """(rows scored, byte offset reached, sha1 of the bytes before it, file size,
+        file mtime_ns) for `source`."""
+        row = self._conn.execute(
+            "SELECT rows, offset, digest, size, mtime_ns FROM watermarks WHERE source = ?", (source,)
+        ).fetchone()
+        return tuple(row) if row else (0, 0, None, None, None)
+
+    def reset(self, source: str | None = None) -> None:
+        """Forget the sums and watermark of one source (or of all)."""
+        where, args = ("WHERE source = ?", (source,)) if source else ("", ())
+        with self._conn:
+            self._conn.execute(f"DELETE FROM sums {where}", args)
+            self._conn.execute(f"DELETE FROM watermarks {where}", args)
+
+    def add(self, source: str, partial: dict, rows: int, offset: int, digest: str,
+            size: int, mtime_ns: int) -> None:
+        """Fold a partial into the sums and advance the watermark, atomically."""
+        values = [(source, name, aspect, total, n)
+                  for name, aspects in partial.items() for aspect, (total, n) in aspects.items()]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO sums VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, name, aspect) DO UPDATE SET "
+                "total = total + excluded.total, n = n + excluded.n",
+                values,
+            )
+            self._conn.execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               (source, rows, offset, digest, size, mtime_ns, time.time()))
+
+    def version(self) -> tuple:
+        """Changes whenever the sums do (watermark-only updates leave it alone)."""
+        return tuple(self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(n), 0), COALESCE(SUM(total), 0) FROM sums"
+        ).fetchone())
+
+    def sums(self, sources: list[str] | None = None) -> pd.DataFrame:
+        """Long frame of name, aspect, total, n summed over `sources` (default: all)."""
+        where, args = "", ()
+        if sources is not None:
+            where = f"WHERE source IN ({','.join('?' * len(sources))})"
+            args = tuple(sources)
+        return pd.read_sql_query(
+            f"SELECT name, aspect, SUM(total) AS total, SUM(n) AS n FROM sums {where} GROUP BY name, aspect",
+            self._conn, params=args,
+        )
+
+    def averages(self, sources: list[str] | None = None) -> pd.DataFrame:
+        """One row per restaurant: 'Average <Aspect> Sentiment' and how many comments were scored."""
+        df = self.sums(sources)
+        cols = aspect_columns(ASPECTS)
+        if df.empty:
+            return pd.DataFrame(columns=["name", *cols, "comments"])
+        counts = df[df["aspect"] == COMMENTS].set_index("name")["n"]
+        df = df[df["aspect"] != COMMENTS].assign(mean=lambda d: d["total"] / d["n"])
+        out = df.pivot(index="name", columns="aspect", values="mean")
+        out = out.reindex(columns=ASPECTS).set_axis(cols, axis=1)
+        out["comments"] = counts.reindex(out.index).fillna(0).astype(int)
+        return out.reset_index().rename_axis(None, axis=1)
+
+
+# -------------------- Pipeline --------------------
+def default_sources() -> dict[str, tuple[str, str, str]]:
+    """Source name -> (csv path, restaurant column, comment column).
+
+    The state CSVs are left out: their reviews are also in the TripAdvisor file.
+    """
+    return {
+        "tripadvisor": (datasets.TRIP_SENTIMENT, "Name", "Comments"),
+        "feedback": (datasets.FEEDBACK, "Restaurant", "Comments"),
+    }
+
+
+def live_store_path() -> str | None:
+    """Store the pages and the service overlay; None unless RECSYS_LIVE_SENTIMENT=1."""
+    return STORE_PATH if os.environ.get(LIVE_ENV) == "1" else None
+
+
+def _by_name(sums: pd.DataFrame, value: str) -> pd.DataFrame:
+    """name x aspect column frame of one sums field (aspects without rows are NaN)."""
+    wide = sums[sums["aspect"] != COMMENTS].pivot(index="name", columns="aspect", values=value)
+    return wide.reindex(columns=ASPECTS).set_axis(aspect_columns(ASPECTS), axis=1)
+
+
+def overlay(df: pd.DataFrame, live: pd.DataFrame, base: pd.DataFrame, name_col: str) -> pd.DataFrame:
+    """`df` with new comments folded into its aspect averages.
+
+    `live` holds the sums of the new comments and `base` the per-aspect comment
+    counts behind the shipped averages (a missing count weighs 1). Restaurants
+    without new comments keep their values exactly.
+    """
+    cols = [c for c in aspect_columns(ASPECTS) if c in df.columns]
+    if not cols or live.empty:
+        return df
+    total, n = _by_name(live, "total"), _by_name(live, "n")
+    weight = _by_name(base, "n") if not base.empty else n.iloc[:0]
+    names = df[name_col].astype(str).str.strip()
+    out = df.copy()
+    for c in cols:
+        t, k = names.map(total[c]).fillna(0.0), names.map(n[c]).fillna(0)
+        w = names.map(weight[c]).fillna(1)
+        shipped = pd.to_numeric(df[c], errors="coerce")
+        merged = (shipped * w + t) / (w + k)
+        merged = merged.where(shipped.notna(), t / k.where(k > 0))
+        out[c] = shipped.where(k == 0, merged)
+    return out
+
+
+def update_source(store: SentimentStore, source: str, path: str, name_col: str, text_col: str,
+                  chunksize: int = 20_000, workers: int | None = None) -> int:
+    """Score rows of `path` added since the last run; returns how many were scored.
+
+    A file with the recorded size and mtime is skipped unread. Otherwise
+    reading resumes at the stored byte offset, provided every byte before it
+    still hashes the same; if not (file edited, replaced or truncated), the
+    source's sums are dropped and it is rescored from the start.
+    """
+    if not datasets.is_available(path):
+        return 0
+    header = list(pd.read_csv(path, nrows=0).columns)
+    if name_col not in header or text_col not in header:
+        return 0
+
+    st = os.stat(path)
+    done, offset, digest, size, mtime_ns = store.watermark(source)
+    if digest is not None and (size, mtime_ns) == (st.st_size, st.st_mtime_ns):
+        return 0
+    with open(path, "rb") as fh:
+        prefix = _digest(fh, 0, offset)
+        if offset > st.st_size or (digest is not None and prefix.hexdigest() != digest):
+            store.reset(source)
+            done, offset, prefix = 0, 0, hashlib.sha1()
+        fh.seek(offset)
+        options = dict(usecols=[name_col, text_col], dtype=str, chunksize=chunksize)
+        if offset:
+            options.update(header=None, names=header)
+        seen = {"rows": 0}
+
+        def tasks():
+            for chunk in pd.read_csv(fh, **options):
+                seen["rows"] += len(chunk)
+                yield score_chunk, chunk[name_col].tolist(), chunk[text_col].tolist()
+
+        workers = workers or os.cpu_count() or 1
+        partial = reduce_tasks(tasks(), workers, None, empty=empty_partial, merge=merge_partials)
+        end = fh.tell()
+        digest = _digest(fh, offset, end, prefix).hexdigest()
+        store.add(source, partial, done + seen["rows"], end, digest, st.st_size, st.st_mtime_ns)
+    return seen["rows"]
+
+
+def update_all(store: SentimentStore, sources: dict | None = None, chunksize: int = 20_000,
+               workers: int | None = None) -> dict[str, int]:
+    """`update_source` for every source; returns rows scored per source."""
+    sources = sources or default_sources()
+    return {
+        name: update_source(store, name, path, name_col, text_col, chunksize, workers)
+        for name, (path, name_col, text_col) in sources.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental aspect-sentiment pipeline.")
+    parser.add_argument("--store", default=STORE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("update", help="Score rows added since the last run.")
+    up.add_argument("--full", action="store_true", help="Drop all sums and rescore everything.")
+    up.add_argument("--workers", type=int, default=None)
+    up.add_argument("--chunksize", type=int, default=20_000)
+    show = sub.add_parser("show", help="Print the restaurants with the most scored comments.")
+    show.add_argument("--top", type=int, default=20)
+    export = sub.add_parser("export", help="Write the averages as CSV.")
+    export.add_argument("out")
+    args = parser.parse_args()
+
+    store = SentimentStore(args.store)
+    if args.command == "update":
+        if args.full:
+            store.reset()
+        started = time.perf_counter()
+        for source, rows in update_all(store, chunksize=args.chunksize, workers=args.workers).items():
+            print(f"{source:<24}{rows:>10} new rows")
+        print(f"done in {time.perf_counter() - started:.1f}s")
+    elif args.command == "show":
+        df = store.averages().sort_values("comments", ascending=False).head(args.top)
+        print(df.to_string(index=False))
+    else:
+        df = store.averages()
+        df.to_csv(args.out, index=False)
+        print(f"{len(df)} restaurants -> {args.out}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
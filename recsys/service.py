@@ -0,0 +1,261 @@
+"""Async HTTP API over one shared RecommenderEngine.
+
+    python -m recsys.service --port 8600 --preload
+    RECSYS_SERVICE_URL=http://127.0.0.1:8600 streamlit run Homepage.py
+
+Set RECSYS_LIVE_SENTIMENT=1 to fold scored feedback into the aspect averages
+(`recsys.sentiment`).
+
+The event loop only parses requests and serializes responses; engine calls
+(pandas / sklearn) run on a thread pool, so slow requests never block the
+loop and independent requests proceed concurrently.
+
+Endpoints (JSON in / JSON out):
+    GET  /health
+    POST /dishes                       {"ingredients": "chicken, rice"}
+    GET  /restaurants/names
+    POST /restaurants/rank             {"q": 0.7, "top_n": 10, "exclude": null}
+    POST /restaurants/evaluation       {"q": 0.7}
+    POST /restaurants/similar          {"name": "...", "top_n": 10}
+    GET  /states
+    GET  /states/{state}/restaurants?limit=20
+    GET  /states/{state}/restaurants/{name}
+    POST /aspects                      {"aspects": ["Food"], "top_n": 10}
+    GET  /feedback?limit=10
+    POST /feedback                     {"rating": 4, "comment": "...", "restaurant": null}
+    POST /batch                        {"requests": [{"op": "dishes", "args": {...}}, ...]}
+    GET  /cache/stats
+"""
+import argparse
+import asyncio
+import functools
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from recsys.engine import RecommenderEngine
+from recsys.sentiment import live_store_path
+from recsys.shared import default_store
+
+ENGINE = web.AppKey("engine", RecommenderEngine)
+POOL = web.AppKey("pool", ThreadPoolExecutor)
+
+# Operations callable through /batch: op name -> engine method name.
+BATCH_OPS = {
+    "dishes": "dishes",
+    "rank": "rank",
+    "evaluation": "evaluation",
+    "similar": "similar",
+    "restaurant_names": "restaurant_names",
+    "state_names": "state_names",
+    "state_restaurants": "state_restaurants",
+    "state_details": "state_details",
+    "aspects": "aspects",
+    "recent_feedback": "recent_feedback",
+}
+
+MAX_RESULTS = 100  # upper bound on top_n / limit
+
+
+def _count(value) -> int:
+    """A top_n / limit parameter, capped at MAX_RESULTS."""
+    n = int(value)
+    if n < 1:
+        raise ValueError("top_n / limit must be at least 1.")
+    return min(n, MAX_RESULTS)
+
+
+# Coercion for every parameter a /batch op may take, matching the endpoints.
+BATCH_ARGS = {
+    "ingredients": str,
+    "q": float,
+    "top_n": _count,
+    "limit": _count,
+    "exclude": lambda v: None if v is None else str(v),
+    "name": str,
+    "state": str,
+    "aspects": list,
+}
+
+
+async def _run(request: web.Request, method: str, **kwargs):
+    engine = request.app[ENGINE]
+    loop = asyncio.get_running_loop()
+    fn = functools.partial(getattr(engine, method), **kwargs)
+    return await loop.run_in_executor(request.app[POOL], fn)
+
+
+async def _json(request: web.Request) -> dict:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text='{"error": "Body must be JSON."}', content_type="application/json")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text='{"error": "Body must be a JSON object."}', content_type="application/json")
+    return body
+
+
+@web.middleware
+async def errors(request: web.Request, handler):
+    """Map engine exceptions to JSON errors (400 for bad input, 500 otherwise)."""
+    try:
+        return await handler(request)
+    except web.HTTPException:
+        raise
+    except (ValueError, KeyError, TypeError) as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except Exception as e:
+        return web.json_response({"error": f"{type(e).__name__}: {e}"}, status=500)
+
+
+# -------------------- Handlers --------------------
+async def health(request):
+    return web.json_response({"status": "ok"})
+
+
+async def dishes(request):
+    body = await _json(request)
+    return web.json_response(await _run(request, "dishes", ingredients=str(body["ingredients"])))
+
+
+async def restaurant_names(request):
+    return web.json_response(await _run(request, "restaurant_names"))
+
+
+async def rank(request):
+    body = await _json(request)
+    return web.json_response(await _run(
+        request, "rank",
+        q=float(body.get("q", 0.70)), top_n=_count(body.get("top_n", 10)), exclude=body.get("exclude"),
+    ))
+
+
+async def evaluation(request):
+    body = await _json(request)
+    return web.json_response(await _run(request, "evaluation", q=float(body.get("q", 0.70))))
+
+
+async def similar(request):
+    body = await _json(request)
+    return web.json_response(await _run(request, "similar",
+                                        name=str(body["name"]), top_n=_count(body.get("top_n", 10))))
+
+
+async def state_names(request):
+    return web.json_response(await _run(request, "state_names"))
+
+
+async def state_restaurants(request):
+    limit = _count(request.query.get("limit", 20))
+    return web.json_response(await _run(request, "state_restaurants",
+                                        state=request.match_info["state"], limit=limit))
+
+
+async def state_details(request):
+    return web.json_response(await _run(request, "state_details",
+                                        state=request.match_info["state"], name=request.match_info["name"]))
+
+
+async def aspects(request):
+    body = await _json(request)
+    return web.json_response(await _run(request, "aspects",
+                                        aspects=list(body["aspects"]), top_n=_count(body.get("top_n", 10))))
+
+
+async def recent_feedback(request):
+    limit = _count(request.query.get("limit", 10))
+    return web.json_response(await _run(request, "recent_feedback", limit=limit))
+
+
+async def add_feedback(request):
+    body = await _json(request)
+    stored = await _run(request, "add_feedback", rating=int(body["rating"]),
+                        comment=str(body.get("comment", "")), restaurant=body.get("restaurant"))
+    return web.json_response({"stored": stored})
+
+
+async def cache_stats(request):
+    return web.json_response(request.app[ENGINE].cache_stats())
+
+
+def _batch_args(engine: RecommenderEngine, method: str, args) -> dict:
+    """`args` checked against the method's parameters and coerced like the endpoints."""
+    if not isinstance(args, dict):
+        raise TypeError("args must be a JSON object.")
+    params = inspect.signature(getattr(engine, method)).parameters
+    unknown = sorted(set(args) - set(params))
+    if unknown:
+        raise TypeError(f"Unexpected args: {', '.join(unknown)}")
+    missing = [p for p, spec in params.items() if spec.default is inspect.Parameter.empty and p not in args]
+    if missing:
+        raise TypeError(f"Missing args: {', '.join(missing)}")
+    return {k: BATCH_ARGS[k](v) for k, v in args.items()}
+
+
+async def batch(request):
+    """Run several read operations concurrently; results keep request order."""
+    body = await _json(request)
+
+    async def one(item):
+        op = item.get("op") if isinstance(item, dict) else None
+        if op not in BATCH_OPS:
+            return {"error": f"Unknown op: {op}"}
+        try:
+            args = _batch_args(request.app[ENGINE], BATCH_OPS[op], item.get("args", {}))
+            return {"result": await _run(request, BATCH_OPS[op], **args)}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    results = await asyncio.gather(*(one(item) for item in body.get("requests", [])))
+    return web.json_response({"results": results})
+
+
+def create_app(engine: RecommenderEngine | None = None, threads: int | None = None) -> web.Application:
+    app = web.Application(middlewares=[errors])
+    app[ENGINE] = engine or RecommenderEngine(store=default_store(), sentiment_path=live_store_path())
+    app[POOL] = ThreadPoolExecutor(max_workers=threads or min(32, (os.cpu_count() or 1) + 4))
+
+    async def shutdown(app):
+        app[POOL].shutdown(wait=False)
+
+    app.on_cleanup.append(shutdown)
+    app.add_routes([
+        web.get("/health", health),
+        web.post("/dishes", dishes),
+        web.get("/restaurants/names", restaurant_names),
+        web.post("/restaurants/rank", rank),
+        web.post("/restaurants/evaluation", evaluation),
+        web.post("/restaurants/similar", similar),
+        web.get("/states", state_names),
+        web.get("/states/{state}/restaurants", state_restaurants),
+        web.get("/states/{state}/restaurants/{name}", state_details),
+        web.post("/aspects", aspects),
+        web.get("/feedback", recent_feedback),
+        web.post("/feedback", add_feedback),
+        web.post("/batch", batch),
+        web.get("/cache/stats", cache_stats),
+    ])
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recommendation HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--threads", type=int, default=None, help="Worker threads for engine calls.")
+    parser.add_argument("--preload", action="store_true", help="Load data and train the default model at start-up.")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Cached results (0 disables the cache).")
+    parser.add_argument("--cache-ttl", type=float, default=300.0, help="Seconds a cached result stays valid.")
+    args = parser.parse_args()
+
+    engine = RecommenderEngine(store=default_store(), cache_size=args.cache_size, cache_ttl=args.cache_ttl,
+                               sentiment_path=live_store_path())
+    if args.preload:
+        engine.preload()
+    web.run_app(create_app(engine, args.threads), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Read-only datasets shared zero-copy between worker processes.
+
+The first process that needs a dataset builds it once and publishes its
+arrays under data/shared/: numeric columns and sparse-matrix parts as .npy,
+text columns as one UTF-8 blob plus offsets. Every process then memory-maps
+those files read-only, so however many Streamlit workers attach, the OS page
+cache holds a single copy.
+
+Bundles are keyed by their source files' size and mtime; changing a source
+publishes a fresh bundle on next use and removes the stale one (processes
+that still map it keep working). Warm every bundle from the repo root with:
+
+    python -m recsys.shared
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock; the final rename stays atomic
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+SHARED_DIR = "data/shared"
+SHARED_ENV = "RECSYS_SHARED"
+SHARED_DIR_ENV = "RECSYS_SHARED_DIR"
+FORMAT = 1
+
+
+# -------------------- Columns --------------------
+class StringArray:
+    """Immutable strings stored as one UTF-8 blob plus int64 offsets.
+
+    Indexing with an int returns one str (None for missing values); indexing
+    with an array or slice returns an object ndarray, decoding only those rows.
+    """
+
+    def __init__(self, blob, offsets: np.ndarray, valid: np.ndarray):
+        self.blob = blob  # bytes or a read-only mmap; both support slicing and find()
+        self.offsets = offsets
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values) -> "StringArray":
+        values = list(values)
+        valid = np.fromiter((not pd.isna(v) for v in values), dtype=bool, count=len(values))
+        encoded = [str(v).encode("utf-8") if ok else b"" for v, ok in zip(values, valid)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets, valid)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _get(self, i: int):
+        if not self.valid[i]:
+            return None
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self._get(int(key) % len(self))
+        if isinstance(key, slice):
+            positions = range(*key.indices(len(self)))
+        else:
+            positions = np.asarray(key)
+            if positions.dtype == bool:
+                positions = np.flatnonzero(positions)
+        out = np.empty(len(positions), dtype=object)
+        out[:] = [self._get(i) for i in positions]
+        return out
+
+    def __iter__(self):
+        return (self._get(i) for i in range(len(self)))
+
+    def _matches(self, value: str):
+        """Positions of the elements equal to `value`, in order (searches the blob)."""
+        needle = str(value).encode("utf-8")
+        if not needle:
+            yield from (i for i, v in enumerate(self) if v == "")
+            return
+        pos = self.blob.find(needle)
+        while pos >= 0:
+            i = int(np.searchsorted(self.offsets, pos, side="right")) - 1
+            if (self.offsets[i] == pos and self.offsets[i + 1] == pos + len(needle)
+                    and self.valid[i]):
+                yield i
+            pos = self.blob.find(needle, pos + 1)
+
+    def find(self, value: str) -> int:
+        """Position of the first element equal to `value`, or -1."""
+        return next(self._matches(value), -1)
+
+    def find_all(self, value: str) -> np.ndarray:
+        """Positions of every element equal to `value`."""
+        return np.fromiter(self._matches(value), dtype=np.int64)
+
+
+class Table:
+    """Read-only column table over ndarrays and StringArrays (no pandas copy)."""
+
+    def __init__(self, columns: dict):
+        self._columns = columns
+        self.columns = list(columns)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: list[str] | None = None) -> "Table":
+        cols = {}
+        for c in columns or df.columns:
+            s = df[c]
+            cols[c] = s.to_numpy() if pd.api.types.is_numeric_dtype(s) else StringArray.from_values(s)
+        return cls(cols)
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    def __getitem__(self, column: str):
+        return self._columns[column]
+
+    def find(self, column: str, value) -> int:
+        col = self._columns[column]
+        if isinstance(col, StringArray):
+            return col.find(value)
+        hits = np.flatnonzero(col == value)
+        return int(hits[0]) if len(hits) else -1
+
+    def find_all(self, column: str, value) -> np.ndarray:
+        """Positions of every row whose `column` equals `value`."""
+        col = self._columns[column]
+        if isinstance(col, StringArray):
+            return col.find_all(value)
+        return np.flatnonzero(col == value)
+
+    def take(self, positions, columns: list[str] | None = None) -> pd.DataFrame:
+        """Small pandas frame holding only `positions` (index = positions)."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return pd.DataFrame(
+            {c: self._columns[c][positions] for c in columns or self.columns},
+            index=positions,
+        )
+
+
+# -------------------- Bundles --------------------
+class Bundle:
+    """Named arrays (ndarray, StringArray or scipy CSR) plus JSON metadata."""
+
+    def __init__(self, arrays: dict, meta: dict | None = None):
+        self.arrays = arrays
+        self.meta = meta or {}
+
+    def __getitem__(self, name: str):
+        return self.arrays[name]
+
+    def table(self, names: list[str]) -> Table:
+        return Table({n: self.arrays[n] for n in names})
+
+
+def _write(path: str, bundle: Bundle) -> None:
+    manifest = []
+    for i, (name, value) in enumerate(bundle.arrays.items()):
+        stem = os.path.join(path, f"a{i}")
+        if isinstance(value, StringArray):
+            with open(stem + ".bin", "wb") as fh:
+                fh.write(bytes(value.blob))
+            np.save(stem + ".offsets.npy", value.offsets)
+            np.save(stem + ".valid.npy", value.valid)
+            manifest.append({"name": name, "kind": "strings"})
+        elif hasattr(value, "tocsr"):
+            csr = value.tocsr()
+            for part in ("data", "indices", "indptr"):
+                np.save(f"{stem}.{part}.npy", getattr(csr, part))
+            manifest.append({"name": name, "kind": "csr", "shape": list(csr.shape)})
+        else:
+            np.save(stem + ".npy", np.ascontiguousarray(value))
+            manifest.append({"name": name, "kind": "ndarray"})
+    with open(os.path.join(path, "bundle.json"), "w") as fh:
+        json.dump({"format": FORMAT, "arrays": manifest, "meta": bundle.meta}, fh)
+
+
+def _map_bytes(path: str):
+    if os.path.getsize(path) == 0:
+        return b""
+    with open(path, "rb") as fh:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def attach(path: str) -> Bundle:
+    """Memory-map a published bundle read-only."""
+    with open(os.path.join(path, "bundle.json")) as fh:
+        spec = json.load(fh)
+    arrays = {}
+    for i, entry in enumerate(spec["arrays"]):
+        stem = os.path.join(path, f"a{i}")
+        if entry["kind"] == "strings":
+            arrays[entry["name"]] = StringArray(
+                _map_bytes(stem + ".bin"),
+                np.load(stem + ".offsets.npy", mmap_mode="r"),
+                np.load(stem + ".valid.npy", mmap_mode="r"),
+            )
+        elif entry["kind"] == "csr":
+            import scipy.sparse as sp
+
+            parts = [np.load(f"{stem}.{p}.npy", mmap_mode="r") for p in ("data", "indices", "indptr")]
+            arrays[entry["name"]] = sp.csr_matrix(tuple(parts), shape=tuple(entry["shape"]), copy=False)
+        else:
+            arrays[entry["name"]] = np.load(stem + ".npy", mmap_mode="r")
+    return Bundle(arrays, spec["meta"])
+
+
+class SharedStore:
+    """Directory of published bundles, built once across processes."""
+
+    def __init__(self, root: str = SHARED_DIR):
+        self.root = root
+
+    def _version(self, name: str, sources: list[str]) -> str:
+        h = hashlib.sha1(f"{FORMAT}:{name}".encode("utf-8"))
+        for path in sources:
+            st = os.stat(path)
+            h.update(f"|{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8"))
+        return h.hexdigest()[:16]
+
+    @contextlib.contextmanager
+    def _lock(self, name: str, shared: bool = False):
+        """Per-name lock: shared while attaching, exclusive while publishing and pruning."""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.root, f".{name}.lock"), "w") as fh:
+            fcntl.flock(fh, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def bundle(self, name: str, sources: list[str], build) -> Bundle:
+        """Attach `name` for these `sources`, running `build() -> Bundle` only if unpublished."""
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, f"{name}-{self._version(name, sources)}")
+        # a concurrent publish prunes other versions; mapped files survive, so
+        # only the attach itself needs to exclude it
+        with self._lock(name, shared=True):
+            if os.path.isfile(os.path.join(path, "bundle.json")):
+                return attach(path)
+        with self._lock(name):
+            if not os.path.isfile(os.path.join(path, "bundle.json")):
+                self._publish(path, build())
+                self._prune(name, keep=path)
+            return attach(path)
+
+    def _publish(self, path: str, bundle: Bundle) -> None:
+        tmp = tempfile.mkdtemp(dir=self.root, prefix=".publish-")
+        try:
+            _write(tmp, bundle)
+            os.replace(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isfile(os.path.join(path, "bundle.json")):
+                raise
+
+    def _prune(self, name: str, keep: str) -> None:
+        prefix = f"{name}-"
+        for entry in os.listdir(self.root):
+            full = os.path.join(self.root, entry)
+            if entry.startswith(prefix) and full != keep and len(entry) == len(prefix) + 16:
+                shutil.rmtree(full, ignore_errors=True)
+
+    def sizes(self) -> dict[str, int]:
+        """Bytes on disk per published bundle."""
+        out = {}
+        if not os.path.isdir(self.root):
+            return out
+        for entry in sorted(os.listdir(self.root)):
+            full = os.path.join(self.root, entry)
+            if not entry.startswith(".") and os.path.isdir(full):
+                out[entry] = sum(os.path.getsize(os.path.join(full, f)) for f in os.listdir(full))
+        return out
+
+
+def default_store() -> SharedStore | None:
+    """Store used by the pages and the service; RECSYS_SHARED=0 disables sharing."""
+    if os.environ.get(SHARED_ENV, "1") == "0":
+        return None
+    return SharedStore(os.environ.get(SHARED_DIR_ENV, SHARED_DIR))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish every dataset bundle to the shared store.")
+    parser.add_argument("--root", default=os.environ.get(SHARED_DIR_ENV, SHARED_DIR))
+    args = parser.parse_args()
+
+    from recsys.engine import RecommenderEngine
+
+    store = SharedStore(args.root)
+    RecommenderEngine(store=store).preload()
+    for name, size in store.sizes().items():
+        print(f"{name:<40}{size / 2**20:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
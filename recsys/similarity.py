@@ -0,0 +1,176 @@
+"""Restaurant-to-restaurant similarity from review comments (TF-IDF).
+
+Each restaurant's comments become one L2-normalized TF-IDF row, so a sparse
+dot product is the cosine similarity. The top-K neighbours of every
+restaurant are precomputed block by block (a few thousand rows times all
+rows at a time), so peak memory is set by `block_cells` whatever the corpus
+size: about 12 bytes per cell, for the float32 slab plus either the sparse
+product it is densified from or the int64 partition indices. The result is
+two n x K arrays (neighbour positions and scores), published through
+`recsys.shared` so it is persisted on disk and memory-mapped by every
+worker; a lookup reads one row of each.
+
+From the repo root:
+
+    python -m recsys.similarity "Restaurant Name" --top 10
+"""
+import argparse
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from recsys.recommenders import sentiment_columns
+from recsys.shared import Bundle, StringArray
+from recsys.tracing import span
+
+SIMILAR_K = 50
+BLOCK_CELLS = 5_000_000  # dense similarity cells per block (~60 MB peak at 12 bytes per cell)
+
+
+def comment_matrix(texts: list, max_features: int | None = 50_000):
+    """L2-normalized TF-IDF rows (empty comments give all-zero rows)."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True,
+                                 max_features=max_features, dtype=np.float32)
+    docs = ["" if pd.isna(t) else str(t) for t in texts]
+    try:
+        return vectorizer.fit_transform(docs).tocsr()
+    except ValueError:  # empty vocabulary: no comments, or only stop words
+        import scipy.sparse as sp
+        return sp.csr_matrix((len(docs), 1), dtype=np.float32)
+
+
+def top_k_neighbours(X, k: int = SIMILAR_K, block_cells: int = BLOCK_CELLS):
+    """(neighbours, scores): each row's k most similar other rows, best first.
+
+    Rows are processed in blocks of `block_cells // n` so only one dense
+    block x n similarity slab exists at a time.
+    """
+    n = X.shape[0]
+    k = max(0, min(k, n - 1))
+    neighbours = np.zeros((n, k), dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return neighbours, scores
+
+    XT = X.T.tocsc()
+    block = max(1, block_cells // n)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        with span("similarity_block", rows=stop - start):
+            S = (X[start:stop] @ XT).toarray()
+            np.negative(S, out=S)  # in place: smallest first is most similar
+            S[np.arange(stop - start), np.arange(start, stop)] = np.inf  # never yourself
+            if k < n - 1:
+                part = np.argpartition(S, k - 1, axis=1)[:, :k]
+            else:
+                part = np.tile(np.arange(n), (stop - start, 1))
+                part = part[part != np.arange(start, stop)[:, None]].reshape(stop - start, k)
+            part_scores = np.take_along_axis(S, part, axis=1)
+            del S
+            order = np.argsort(part_scores, axis=1, kind="stable")
+            neighbours[start:stop] = np.take_along_axis(part, order, axis=1)
+            scores[start:stop] = -np.take_along_axis(part_scores, order, axis=1)
+    return neighbours, scores
+
+
+def build(df: pd.DataFrame, k: int = SIMILAR_K, block_cells: int = BLOCK_CELLS) -> Bundle:
+    """Similarity bundle for a TripAdvisor frame, one row per restaurant.
+
+    Rows are grouped on `restaurant_id` when present, else on Name (the key
+    `datasets.load_trip_sentiment` deduplicates on); a group keeps its first
+    row and the concatenation of its comments.
+    """
+    df = df.dropna(subset=["Name"])
+    key = df["Name"].astype(str)
+    if "restaurant_id" in df.columns:
+        key = df["restaurant_id"].fillna("name:" + key)
+    comments = df["Comments"] if "Comments" in df.columns else pd.Series(None, index=df.index)
+    if not key.is_unique:
+        comments = comments.fillna("").astype(str).groupby(key, sort=False).agg(" ".join)
+        df = df[~key.duplicated()]
+    df = df.reset_index(drop=True)
+    cols = sentiment_columns(df)
+    with span("tfidf", rows=len(df)):
+        X = comment_matrix(comments.tolist())
+    neighbours, scores = top_k_neighbours(X, k, block_cells)
+    names = df["Name"].astype(str)
+    arrays = {
+        "Name": StringArray.from_values(names),
+        "by_name": np.argsort(names.to_numpy(), kind="stable").astype(np.int64),
+        "neighbours": neighbours,
+        "scores": scores,
+    }
+    if cols:
+        arrays["sentiments"] = df[cols].astype(float).to_numpy()
+    return Bundle(arrays, {"k": int(neighbours.shape[1]), "cols": cols})
+
+
+class CommentSimilarity:
+    """Lookups over a built or attached similarity bundle."""
+
+    def __init__(self, bundle: Bundle):
+        self.names = bundle["Name"]
+        self.by_name = bundle["by_name"]
+        self.neighbours = bundle["neighbours"]
+        self.scores = bundle["scores"]
+        self.cols = bundle.meta["cols"]
+        self.sentiments = bundle.arrays.get("sentiments")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def position(self, name: str) -> int:
+        """Row of `name` (binary search over the sorted order), or -1."""
+        sorted_names = _SortedView(self.names, self.by_name)
+        i = bisect.bisect_left(sorted_names, name)
+        if i < len(sorted_names) and sorted_names[i] == name:
+            return int(self.by_name[i])
+        return -1
+
+    def similar(self, name: str, top_n: int = 10) -> pd.DataFrame:
+        """Up to `top_n` restaurants whose comments are closest to `name`'s."""
+        row = self.position(name)
+        if row < 0:
+            raise KeyError(f"Unknown restaurant: {name}")
+        idx = np.asarray(self.neighbours[row, :top_n])
+        sim = np.asarray(self.scores[row, :top_n], dtype=float)
+        keep = sim > 0
+        idx, sim = idx[keep], sim[keep]
+        out = pd.DataFrame({"Name": self.names[idx], "Comment Similarity": sim})
+        if self.sentiments is not None:
+            out[self.cols] = np.asarray(self.sentiments[idx])
+        return out
+
+
+class _SortedView:
+    """Names in sorted order, decoded on access (for bisect)."""
+
+    def __init__(self, names: StringArray, order: np.ndarray):
+        self.names = names
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[int(self.order[i])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Restaurants with the most similar review comments.")
+    parser.add_argument("name")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    from recsys.engine import RecommenderEngine
+    from recsys.shared import default_store
+
+    rows = RecommenderEngine(store=default_store()).similar(args.name, args.top)
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
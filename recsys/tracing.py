@@ -0,0 +1,176 @@
+"""Lightweight per-rerun stage timing.
+
+A page calls `begin(page)` at the top of each rerun and wraps stages in
+`with span("load_csv"):`. Finished spans are kept for the current rerun
+(shown by `debug_panel()` when the URL has `?debug=timing`). With RECSYS_TRACE=1
+they are also appended to a JSON-lines log, one Chrome trace "complete"
+event per line:
+
+    {"name": "train", "ph": "X", "ts": <us>, "dur": <us>, "pid": ..., "tid": ...,
+     "args": {"page": "...", "rerun": "...", "depth": 0}}
+
+Outside a rerun (scripts, benchmarks) `span` does nothing but check a
+thread-local. RECSYS_TRACE_FILE moves the log; once it passes
+RECSYS_TRACE_MAX_MB (default 50) it is rotated to `<file>.1`, replacing the
+previous one, so at most two files are kept.
+
+Offline analysis:
+
+    python -m recsys.tracing summary logs/trace.jsonl
+    python -m recsys.tracing chrome logs/trace.jsonl trace.json   # chrome://tracing, Perfetto
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+TRACE_FILE = os.environ.get("RECSYS_TRACE_FILE", "logs/trace.jsonl")
+LOG_ENABLED = os.environ.get("RECSYS_TRACE", "0") == "1"
+MAX_BYTES = int(float(os.environ.get("RECSYS_TRACE_MAX_MB", "50")) * 2**20)
+DEBUG_VALUES = {"1", "true", "timing"}
+
+_local = threading.local()
+_lock = threading.Lock()
+_fh = None
+
+
+def begin(page: str) -> None:
+    """Start a new trace for this thread's rerun of `page`."""
+    _local.trace = {"page": page, "rerun": uuid.uuid4().hex[:12], "spans": [], "depth": 0}
+
+
+def current() -> dict | None:
+    return getattr(_local, "trace", None)
+
+
+def _rotate() -> None:
+    """Close the log and move it to `<file>.1` (caller holds `_lock`)."""
+    global _fh
+    ours = os.fstat(_fh.fileno()).st_ino
+    _fh.close()
+    _fh = None
+    try:
+        # another worker may have rotated first; then our file is already `.1`
+        if os.stat(TRACE_FILE).st_ino == ours:
+            os.replace(TRACE_FILE, TRACE_FILE + ".1")
+    except FileNotFoundError:
+        pass
+
+
+def _write(event: dict) -> None:
+    global _fh
+    line = json.dumps(event, separators=(",", ":")) + "\n"
+    try:
+        with _lock:
+            if _fh is None:
+                if os.path.dirname(TRACE_FILE):
+                    os.makedirs(os.path.dirname(TRACE_FILE), exist_ok=True)
+                _fh = open(TRACE_FILE, "a", buffering=1, encoding="utf-8")
+            _fh.write(line)
+            if _fh.tell() >= MAX_BYTES:
+                _rotate()
+    except OSError:
+        pass  # tracing must never break a page
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the enclosed block as stage `name` of the current rerun."""
+    trace = current()
+    if trace is None:
+        yield
+        return
+    depth = trace["depth"]
+    trace["depth"] = depth + 1
+    ts = time.time_ns() // 1000
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        dur = (time.perf_counter_ns() - start) // 1000
+        trace["depth"] = depth
+        event = {
+            "name": name, "ph": "X", "ts": ts, "dur": dur,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+            "args": {"page": trace["page"], "rerun": trace["rerun"], "depth": depth, **attrs},
+        }
+        trace["spans"].append(event)
+        if LOG_ENABLED:
+            _write(event)
+
+
+def debug_panel() -> None:
+    """Sidebar breakdown of the current rerun; opt in with `?debug=timing`."""
+    import pandas as pd
+    import streamlit as st
+
+    trace = current()
+    if trace is None or str(st.query_params.get("debug", "")).lower() not in DEBUG_VALUES:
+        return
+    spans = sorted(trace["spans"], key=lambda e: e["ts"])
+    rows = [{"Stage": " " * e["args"]["depth"] + e["name"], "ms": round(e["dur"] / 1000, 2)}
+            for e in spans]
+    total = sum(e["dur"] for e in spans if e["args"]["depth"] == 0) / 1000
+    with st.sidebar.expander("Rerun timing", expanded=True):
+        st.caption(f"{trace['page']} · rerun {trace['rerun']} · {total:.1f} ms in top-level stages")
+        st.dataframe(pd.DataFrame(rows, columns=["Stage", "ms"]), hide_index=True, use_container_width=True)
+
+
+# -------------------- Offline analysis --------------------
+def read_events(path: str) -> list[dict]:
+    events = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # torn last line from a killed worker
+    return events
+
+
+def summarize(events: list[dict]):
+    """p50 / p95 / max duration (ms) and count per (page, stage)."""
+    import pandas as pd
+
+    df = pd.DataFrame({
+        "page": [e["args"]["page"] for e in events],
+        "stage": [e["name"] for e in events],
+        "ms": [e["dur"] / 1000 for e in events],
+    })
+    if df.empty:
+        return df
+    g = df.groupby(["page", "stage"])["ms"]
+    return pd.DataFrame({
+        "count": g.size(),
+        "p50_ms": g.quantile(0.5),
+        "p95_ms": g.quantile(0.95),
+        "max_ms": g.max(),
+    }).round(2).sort_values("p95_ms", ascending=False)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analyse recsys trace logs.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_sum = sub.add_parser("summary", help="Per-page/stage latency table.")
+    p_sum.add_argument("log", nargs="?", default=TRACE_FILE)
+    p_chr = sub.add_parser("chrome", help="Convert to a Chrome trace JSON file.")
+    p_chr.add_argument("log", nargs="?", default=TRACE_FILE)
+    p_chr.add_argument("out")
+    args = parser.parse_args()
+
+    events = read_events(args.log)
+    if args.cmd == "summary":
+        print(summarize(events).to_string())
+    else:
+        with open(args.out, "w") as fh:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+        print(f"{len(events)} events written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from recsys import aggregate
+
+
+@pytest.fixture(scope="module")
+def zomato():
+    return synthetic.zomato(2000)
+
+
+def _assert_same(got, want):
+    assert got["rows"] == want["rows"]
+    pd.testing.assert_series_equal(got["top_cuisines"], want["top_cuisines"])
+    pd.testing.assert_frame_equal(got["city_ratings"], want["city_ratings"])
+    pd.testing.assert_series_equal(got["cost_distribution"], want["cost_distribution"])
+
+
+def test_chunked_csv_matches_in_memory(zomato, tmp_path):
+    path = tmp_path / "zomato.csv"
+    zomato.to_csv(path, index=False)
+    want = aggregate.aggregate_in_memory(pd.read_csv(path, dtype=str))
+    _assert_same(aggregate.aggregate_csv(str(path), chunksize=300, workers=2), want)
+
+
+def test_partitions_match_in_memory(zomato, tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"part{i}.csv"))
+        zomato.iloc[i::3].to_csv(paths[-1], index=False)
+    want = aggregate.aggregate_in_memory(pd.concat(pd.read_csv(p, dtype=str) for p in paths))
+    _assert_same(aggregate.aggregate_partitions(paths, chunksize=250, workers=1), want)
@@ -0,0 +1,71 @@
+from benchmarks import synthetic
+from recsys.cache import ResultCache, canonical_ingredients
+from recsys.recommenders import IngredientIndex
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expires_entries():
+    clock = Clock()
+    cache = ResultCache(maxsize=10, ttl=5, clock=clock)
+    assert cache.get_or_compute("op", 1, lambda: "a") == "a"
+    clock.now = 4.9
+    assert cache.get_or_compute("op", 1, lambda: "b") == "a"
+    clock.now = 5.0
+    assert cache.get_or_compute("op", 1, lambda: "c") == "c"
+    stats = cache.stats()["operations"]["op"]
+    assert (stats["hits"], stats["misses"], stats["expired"]) == (1, 2, 1)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2, ttl=60)
+    cache.get_or_compute("op", 1, lambda: 1)
+    cache.get_or_compute("op", 2, lambda: 2)
+    cache.get_or_compute("op", 1, lambda: None)  # 1 is now the most recent
+    cache.get_or_compute("op", 3, lambda: 3)
+    assert len(cache) == 2
+    assert cache.get_or_compute("op", 1, lambda: "recomputed") == 1
+    assert cache.get_or_compute("op", 2, lambda: "recomputed") == "recomputed"
+    assert cache.stats()["operations"]["op"]["evicted"] == 2
+
+
+def test_invalidate_one_operation():
+    cache = ResultCache()
+    cache.get_or_compute("dishes", 1, lambda: 1)
+    cache.get_or_compute("rank", 1, lambda: 1)
+    assert cache.invalidate("dishes") == 1
+    assert cache.get_or_compute("dishes", 1, lambda: 2) == 2
+    assert cache.get_or_compute("rank", 1, lambda: 2) == 1
+
+
+def test_zero_maxsize_disables_caching():
+    cache = ResultCache(maxsize=0)
+    assert cache.get_or_compute("op", 1, lambda: 1) == 1
+    assert cache.get_or_compute("op", 1, lambda: 2) == 2
+    assert len(cache) == 0
+
+
+def test_canonical_query_gives_the_same_dishes():
+    index = IngredientIndex(synthetic.recipes(500))
+    for raw in ["Chicken, rice, CHICKEN", "garlic garlic onion, olive oil, Olive", "salt"]:
+        canonical = canonical_ingredients(raw)
+        assert list(index.query(raw).index) == list(index.query(canonical).index)
+
+
+def test_dishes_match_the_original_count_vector_scoring():
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    recipes = synthetic.recipes(2000)
+    vectorizer = CountVectorizer()
+    matrix = vectorizer.fit_transform(recipes["Cleaned_Ingredients"])
+    index = IngredientIndex(recipes)
+    for query in ["chicken, salt, rice, tomato, lettuce, pepper, cucumber", "cup flour sugar", "salt"]:
+        sims = cosine_similarity(vectorizer.transform([query]), matrix)[0]
+        assert list(index.query(query).index) == list((sims >= 0.3).nonzero()[0])
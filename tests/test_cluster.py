@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from benchmarks import synthetic
+from recsys.cluster import ClusterIndex
+
+
+@pytest.fixture(scope="module")
+def points():
+    return synthetic.lat_lon(2000)
+
+
+@pytest.mark.parametrize("zoom", [0, 4, 9, 18])
+def test_world_view_counts_every_point(points, zoom):
+    clusters = ClusterIndex(points["lat"], points["lon"]).visible(-85, -180, 85, 180, zoom)
+    assert clusters["count"].sum() == len(points)
+
+
+def test_clusters_are_centroids_of_their_points(points):
+    index = ClusterIndex(points["lat"], points["lon"])
+    clusters = index.visible(-85, -180, 85, 180, 2)
+    np.testing.assert_allclose((clusters["lat"] * clusters["count"]).sum(), points["lat"].sum())
+    singles = clusters[clusters["count"] == 1]
+    np.testing.assert_allclose(singles["lat"], points["lat"].to_numpy()[singles["idx"]])
+
+
+def test_viewport_only_returns_nearby_clusters(points):
+    clusters = ClusterIndex(points["lat"], points["lon"]).visible(40.5, -74.5, 41.0, -73.5, 9, pad_cells=0)
+    assert len(clusters)
+    assert clusters["lat"].between(40.0, 41.5).all() and clusters["lon"].between(-75.0, -73.0).all()
@@ -0,0 +1,56 @@
+import asyncio
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from benchmarks import synthetic
+from recsys import service
+from recsys.engine import RecommenderEngine
+
+
+def _engine():
+    return RecommenderEngine(frames={"sentiment": synthetic.final_sentiment(30)})
+
+
+def test_build_across_refresh_is_not_cached():
+    engine = _engine()
+    engine.version("sentiment")
+
+    def build():
+        # a refresh lands while this build is running
+        engine._versions["sentiment"] = ("stale",)
+        engine.refresh()
+        return "old"
+
+    assert engine._once(("sentiment", "probe"), build) == "old"
+    assert engine._once(("sentiment", "probe"), lambda: "new") == "new"
+
+
+def _post_batch(requests):
+    async def go():
+        async with TestClient(TestServer(service.create_app(_engine(), threads=2))) as client:
+            resp = await client.post("/batch", json={"requests": requests})
+            return (await resp.json())["results"]
+    return asyncio.run(go())
+
+
+def test_batch_validates_args():
+    results = _post_batch([
+        {"op": "aspects", "args": {"aspects": ["Food"], "top_n": 10**9}},
+        {"op": "aspects", "args": {"aspects": ["Food"], "self": 1}},
+        {"op": "aspects", "args": {}},
+        {"op": "aspects", "args": {"aspects": ["Food"], "top_n": 0}},
+    ])
+    assert len(results[0]["result"]) == 30  # capped, not an error
+    assert "Unexpected args: self" in results[1]["error"]
+    assert "Missing args: aspects" in results[2]["error"]
+    assert "at least 1" in results[3]["error"]
+
+
+def test_rank_excludes_every_row_with_the_name():
+    trip = synthetic.tripadvisor(200)
+    trip.loc[[0, 1], "Name"] = "Restaurant 0"
+    trip.loc[[0, 1], [c for c in trip.columns if "Sentiment" in c]] = 1.0  # both would rank first
+    engine = RecommenderEngine(frames={"trip": trip})
+    names = [r["Name"] for r in engine.rank(top_n=20, exclude="Restaurant 0")["rows"]]
+    assert "Restaurant 0" not in names
+    assert len(names) == 20
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from benchmarks import synthetic
+from recsys.geo import EARTH_RADIUS_KM, GeoIndex
+
+POINT = (40.75, -73.98)
+
+
+@pytest.fixture(scope="module")
+def index():
+    return GeoIndex(synthetic.lat_lon(3000))
+
+
+def _brute(index, cuisine=None, min_rating=None):
+    """(positions, km) of every row passing the filters, nearest first."""
+    lat, lon = np.radians(index.df["lat"].to_numpy()), np.radians(index.df["lon"].to_numpy())
+    plat, plon = np.radians(POINT)
+    a = np.sin((lat - plat) / 2) ** 2 + np.cos(plat) * np.cos(lat) * np.sin((lon - plon) / 2) ** 2
+    km = 2 * np.arcsin(np.sqrt(a)) * EARTH_RADIUS_KM
+    keep = np.ones(len(km), dtype=bool)
+    if cuisine:
+        keep &= index.df["Type"].fillna("").str.lower().str.split(r"\s*,\s*").map(lambda t: cuisine in t).to_numpy()
+    if min_rating is not None:
+        keep &= index._rating >= min_rating
+    idx = np.flatnonzero(keep)
+    order = np.argsort(km[idx], kind="stable")
+    return idx[order], km[idx][order]
+
+
+FILTERS = [{}, {"cuisine": "pizza"}, {"min_rating": 4.5}, {"cuisine": "pizza", "min_rating": 5.0},
+           {"cuisine": "no such cuisine"}]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_nearest_matches_brute_force(index, filters):
+    idx, km = _brute(index, **filters)
+    got = index.nearest(*POINT, k=15, **filters)
+    np.testing.assert_allclose(got["distance_km"].to_numpy(), km[:15], rtol=1e-9, atol=1e-9)
+    assert list(got.index) == list(idx[:15])
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_radius_matches_brute_force(index, filters):
+    idx, km = _brute(index, **filters)
+    got = index.radius(*POINT, 25, **filters)
+    assert set(got.index) == set(idx[km <= 25])
+
+
+def test_sparse_rating_matches_fall_back_to_a_scan(index, monkeypatch):
+    monkeypatch.setattr("recsys.geo.WIDEN_ROUNDS", 0)
+    idx, km = _brute(index, cuisine="pizza", min_rating=5.0)
+    got = index.nearest(*POINT, k=15, cuisine="pizza", min_rating=5.0)
+    assert list(got.index) == list(idx[:15])
+    np.testing.assert_allclose(got["distance_km"].to_numpy(), km[:15], rtol=1e-9, atol=1e-9)
@@ -0,0 +1,57 @@
+from recsys.geocode import GeocodeCache, StubBackend, normalize_address
+
+
+class FakeBackend:
+    """Answers `known`, reports `unknown` as ZERO_RESULTS; any other request fails (left out)."""
+    name = "fake"
+
+    def __init__(self, known: dict, unknown=()):
+        self.known, self.unknown = known, set(unknown)
+        self.requests = []
+
+    def geocode_batch(self, addresses):
+        self.requests += addresses
+        out = {a: self.known[a] for a in addresses if a in self.known}
+        out.update({a: None for a in addresses if a in self.unknown})
+        return out
+
+
+def test_stub_rows_are_hidden_from_other_backends(tmp_path):
+    path = str(tmp_path / "geocode.sqlite")
+    stub = GeocodeCache(path, StubBackend())
+    key = normalize_address("1 Main St, Austin, TX")
+    assert stub.resolve(["1 Main St, Austin, TX"])[key] is not None
+    stub.close()
+
+    backend = FakeBackend({key: (30.27, -97.74)})
+    real = GeocodeCache(path, backend)
+    assert real.lookup([key]) == {}
+    other_stub = GeocodeCache(path, StubBackend())
+    assert other_stub.lookup([key]) != {}
+    other_stub.close()
+    assert real.resolve(["1 Main St, Austin, TX"]) == {key: (30.27, -97.74)}
+    assert backend.requests == [key]
+    real.close()
+
+
+def test_zero_results_are_cached_and_errors_retried(tmp_path):
+    backend = FakeBackend({}, unknown=["nowhere"])
+    cache = GeocodeCache(str(tmp_path / "geocode.sqlite"), backend)
+    assert cache.resolve(["Nowhere", "Flaky"]) == {"nowhere": None}
+    assert len(cache) == 1
+
+    backend.requests.clear()
+    backend.known["flaky"] = (1.0, 2.0)
+    assert cache.resolve(["Nowhere", "Flaky"]) == {"nowhere": None, "flaky": (1.0, 2.0)}
+    assert backend.requests == ["flaky"]
+    cache.close()
+
+
+def test_formatting_variants_share_a_row(tmp_path):
+    key = normalize_address("12 Pike St, Seattle, WA")
+    backend = FakeBackend({key: (47.6, -122.3)})
+    cache = GeocodeCache(str(tmp_path / "geocode.sqlite"), backend)
+    variants = ["12 Pike St, Seattle, WA", "12 pike st.,seattle ,WA", "  12 PIKE ST, SEATTLE, WA "]
+    assert cache.resolve(variants) == {key: (47.6, -122.3)}
+    assert backend.requests == [key] and len(cache) == 1
+    cache.close()
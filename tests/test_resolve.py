@@ -0,0 +1,81 @@
+import pandas as pd
+
+from recsys import resolve
+
+
+def _ids(frames):
+    records = pd.concat([resolve.standardize(df, source, columns) for source, df, columns in frames],
+                        ignore_index=True)
+    ids, _ = resolve.resolve(records)
+    return ids["restaurant_id"].tolist()
+
+
+def _trip(names, streets, city="Seattle, WA 98101"):
+    return pd.DataFrame({"Name": names, "Street Address": streets, "Location": city})
+
+
+def test_chain_branches_stay_apart():
+    ids = _ids([("a", _trip(["Starbucks", "Starbucks"], ["100 Pike St", "900 Pine St"]),
+                 resolve.TRIPADVISOR_COLUMNS)])
+    assert ids[0] != ids[1]
+
+
+def test_record_without_address_does_not_bridge_branches():
+    ids = _ids([("a", _trip(["Starbucks"] * 3, ["100 Pike St", "900 Pine St", ""]),
+                 resolve.TRIPADVISOR_COLUMNS)])
+    assert len(set(ids)) == 3
+
+
+def test_record_without_address_joins_single_branch():
+    ids = _ids([("a", _trip(["Starbucks", "Starbucks"], ["100 Pike St", ""]),
+                 resolve.TRIPADVISOR_COLUMNS)])
+    assert ids[0] == ids[1]
+
+
+def test_spelling_variants_across_sources_merge():
+    ids = _ids([
+        ("a", _trip(["Joe's Pizza"], ["7 Carmine St"], "New York City, NY 10014"), resolve.TRIPADVISOR_COLUMNS),
+        ("b", pd.DataFrame({"Name": ["Joes Piza"], "address": ["7 Carmine Street, New York City, NY 10014"]}),
+         resolve.TRIP_COLUMNS),
+    ])
+    assert ids[0] == ids[1]
+
+
+def test_oversized_block_is_split_by_street():
+    n = resolve.MAX_BLOCK + 100
+    names = ["Starbucks"] * n + ["STARBUCKS COFFEE"]
+    streets = [f"{i} Pike St" for i in range(n)] + ["5 Pike Street"]
+    records = resolve.standardize(_trip(names, streets), "a", resolve.TRIPADVISOR_COLUMNS)
+    _, stats = resolve.resolve(records)
+    assert stats["skipped_blocks"] == 0
+    assert stats["candidate_pairs"] == 1  # only the two records at 5 Pike St
+
+
+def test_workbook_sources_join_the_id_table(tmp_path):
+    from recsys import datasets
+
+    trip = _trip(["Joe's Pizza", "Starbucks"], ["7 Carmine St", "100 Pike St"])
+    trip_path, ids_path = tmp_path / "trip.csv", tmp_path / "ids.csv"
+    sentiment_path = tmp_path / "sentiment.xlsx"
+    trip.to_csv(trip_path, index=False)
+    sentiment = pd.DataFrame({"name": ["Starbucks", "JOES PIZZA"], "url": ["u1", "u2"]})
+    sentiment.to_excel(sentiment_path, index=False)
+    sources = {"tripadvisor-sentiment": (str(trip_path), resolve.TRIPADVISOR_COLUMNS),
+               "final-sentiment": (str(sentiment_path), resolve.SENTIMENT_COLUMNS)}
+    ids, _ = resolve.resolve(resolve.load_records(sources))
+    ids.to_csv(ids_path, index=False)
+
+    sentiment = datasets.load_sentiment(str(sentiment_path), str(ids_path))
+    trip = datasets.load_trip_sentiment(str(trip_path), str(ids_path))
+    trip_ids = trip.set_index("Name")["restaurant_id"]
+    assert sentiment["restaurant_id"].tolist() == [trip_ids["Starbucks"], trip_ids["Joe's Pizza"]]
+
+
+def test_name_only_record_does_not_bridge_cities():
+    ids = _ids([
+        ("a", pd.DataFrame({"Name": ["Lula Cafe", "Lula Cafe"], "Street Address": ["", ""],
+                            "Location": ["Chicago, IL 60647", "Austin, TX 78701"]}),
+         resolve.TRIPADVISOR_COLUMNS),
+        ("b", pd.DataFrame({"name": ["Lula Cafe"]}), resolve.SENTIMENT_COLUMNS),
+    ])
+    assert len(set(ids)) == 3
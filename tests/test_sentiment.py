@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from recsys import datasets, sentiment
+from recsys.engine import RecommenderEngine
+from recsys.feedback import append_feedback
+
+
+def _scored(tmp_path, name, path):
+    store = sentiment.SentimentStore(str(tmp_path / name))
+    sentiment.update_source(store, "feedback", str(path), "Restaurant", "Comments", chunksize=50, workers=1)
+    df = store.averages().sort_values("name").reset_index(drop=True)
+    store.close()
+    return df
+
+
+def test_incremental_matches_full_rescore(tmp_path):
+    path = tmp_path / "feedback.csv"
+    synthetic.feedback(300).to_csv(path, index=False)
+    store = sentiment.SentimentStore(str(tmp_path / "live.sqlite"))
+    assert sentiment.update_source(store, "feedback", str(path), "Restaurant", "Comments", workers=1) == 300
+    for i in range(5):
+        append_feedback(str(path), 1, "the food was terrible and the service slow", f"Restaurant {i}")
+    assert sentiment.update_source(store, "feedback", str(path), "Restaurant", "Comments", workers=1) == 5
+    assert sentiment.update_source(store, "feedback", str(path), "Restaurant", "Comments", workers=1) == 0
+    live = store.averages().sort_values("name").reset_index(drop=True)
+    store.close()
+    pd.testing.assert_frame_equal(live, _scored(tmp_path, "full.sqlite", path))
+
+
+def test_edit_before_watermark_rescores(tmp_path):
+    path = tmp_path / "feedback.csv"
+    synthetic.feedback(200).to_csv(path, index=False)
+    store = sentiment.SentimentStore(str(tmp_path / "live.sqlite"))
+    sentiment.update_source(store, "feedback", str(path), "Restaurant", "Comments", workers=1)
+    text = path.read_text()
+    path.write_text(text.replace("great", "awful", 1))  # same size, early in the file
+    sentiment.update_source(store, "feedback", str(path), "Restaurant", "Comments", workers=1)
+    live = store.averages().sort_values("name").reset_index(drop=True)
+    store.close()
+    pd.testing.assert_frame_equal(live, _scored(tmp_path, "full.sqlite", path))
+
+
+def test_comments_counts_scored_comments(tmp_path):
+    path = tmp_path / "feedback.csv"
+    append_feedback(str(path), 5, "great food", "A")
+    append_feedback(str(path), 4, "friendly service and tasty food", "A")
+    append_feedback(str(path), 3, "we came on a tuesday", "A")  # mentions no aspect
+    assert _scored(tmp_path, "s.sqlite", path).set_index("name").loc["A", "comments"] == 2
+
+
+def _engine(tmp_path, monkeypatch, frame):
+    monkeypatch.setattr(datasets, "TRIP_SENTIMENT", str(tmp_path / "missing.csv"))
+    return RecommenderEngine(frames={"sentiment": frame}, feedback_path=str(tmp_path / "feedback.csv"),
+                             sentiment_path=str(tmp_path / "live.sqlite"))
+
+
+def _food(engine):
+    return {r["name"]: r["Average Food Sentiment"] for r in engine.aspects(["Food"], 200)}
+
+
+def test_shipped_averages_are_kept_without_feedback(tmp_path, monkeypatch):
+    frame = synthetic.final_sentiment(200)
+    path = tmp_path / "feedback.csv"
+    append_feedback(str(path), 4, "nice place", None)  # general feedback, no restaurant
+    engine = _engine(tmp_path, monkeypatch, frame)
+    assert _food(engine) == pytest.approx(dict(zip(frame["name"], frame["Average Food Sentiment"])))
+
+
+def test_engine_folds_feedback_into_shipped_averages(tmp_path, monkeypatch):
+    frame = synthetic.final_sentiment(20).assign(**{"Average Food Sentiment": 0.9})
+    engine = _engine(tmp_path, monkeypatch, frame)
+    assert _food(engine)["Restaurant 3"] == 0.9
+    engine.add_feedback(1, "the food was terrible", "Restaurant 3")
+    score = sentiment.score_comment("the food was terrible")["Food"]
+    after = _food(engine)
+    assert after["Restaurant 3"] == pytest.approx((0.9 + score) / 2)  # shipped value weighs 1
+    assert after["Restaurant 4"] == 0.9
+
+
+def test_overlay_weights_shipped_averages_by_review_counts():
+    df = pd.DataFrame({"name": ["A", "B"], "Average Food Sentiment": [0.5, None]})
+    live = pd.DataFrame({"name": ["A", "B"], "aspect": ["Food", "Food"], "total": [-1.0, -0.4], "n": [1, 2]})
+    base = pd.DataFrame({"name": ["A"], "aspect": ["Food"], "total": [2.0], "n": [3]})
+    out = sentiment.overlay(df, live, base, "name")
+    assert out["Average Food Sentiment"].tolist() == pytest.approx([(0.5 * 3 - 1.0) / 4, -0.2])
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from recsys.shared import Bundle, SharedStore, StringArray
+
+
+def _source(tmp_path, text: str) -> str:
+    path = tmp_path / "source.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def _builder(calls: list):
+    def build():
+        calls.append(1)
+        return Bundle({
+            "name": StringArray.from_values(["Joe's Pizza", None, "Café"]),
+            "score": np.array([1.5, 2.5, 3.5]),
+            "matrix": sp.csr_matrix(np.eye(3)),
+        }, {"rows": 3})
+    return build
+
+
+def test_bundle_is_published_once_then_attached_read_only(tmp_path):
+    store, calls = SharedStore(str(tmp_path / "shared")), []
+    source = _source(tmp_path, "a")
+    first = store.bundle("trip", [source], _builder(calls))
+    second = store.bundle("trip", [source], _builder(calls))
+
+    assert len(calls) == 1
+    assert second.meta == {"rows": 3}
+    assert list(second["name"]) == ["Joe's Pizza", None, "Café"]
+    assert second["matrix"].toarray().tolist() == np.eye(3).tolist()
+    assert isinstance(second["score"], np.memmap) and isinstance(second["name"].offsets, np.memmap)
+    for array in (second["score"], second["name"].offsets, second["matrix"].data):
+        with pytest.raises(ValueError):  # read-only mapping
+            array[0] = 0
+    with pytest.raises(TypeError):
+        second["name"].blob[0] = 0
+    assert first["score"].tolist() == second["score"].tolist()
+
+
+def test_source_change_publishes_a_new_version_and_prunes_the_old(tmp_path):
+    root = tmp_path / "shared"
+    store, calls = SharedStore(str(root)), []
+    source = _source(tmp_path, "a")
+    store.bundle("trip", [source], _builder(calls))
+    old = [e for e in os.listdir(root) if e.startswith("trip-")]
+
+    _source(tmp_path, "a longer file")
+    store.bundle("trip", [source], _builder(calls))
+    new = [e for e in os.listdir(root) if e.startswith("trip-")]
+
+    assert len(calls) == 2
+    assert len(old) == len(new) == 1 and old != new
+    assert list(store.sizes()) == new
+
+
+def test_find_matches_whole_elements_only():
+    names = StringArray.from_values(["abc", "ab", "xab", "ab", None, ""])
+    assert names.find("ab") == 1
+    assert names.find_all("ab").tolist() == [1, 3]
+    assert names.find("abc") == 0
+    assert names.find("b") == -1
+    assert names.find("") == 5
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic
+from recsys import similarity
+
+
+@pytest.fixture(scope="module")
+def X():
+    return similarity.comment_matrix(synthetic.tripadvisor(300)["Comments"].tolist())
+
+
+def _dense(X):
+    S = (X @ X.T).toarray().astype(np.float64)
+    np.fill_diagonal(S, -np.inf)
+    return S
+
+
+@pytest.mark.parametrize("k,block_cells", [(10, 300 * 7), (10, 10**9), (299, 300 * 50)])
+def test_top_k_matches_dense(X, k, block_cells):
+    neighbours, scores = similarity.top_k_neighbours(X, k, block_cells)
+    S = _dense(X)
+    np.testing.assert_allclose(scores, -np.sort(-S, axis=1)[:, :k], rtol=1e-5, atol=1e-6)
+    # each neighbour is another row, scored with its actual similarity
+    assert not (neighbours == np.arange(X.shape[0])[:, None]).any()
+    np.testing.assert_allclose(scores, np.take_along_axis(S, neighbours, axis=1), rtol=1e-5, atol=1e-6)
+
+
+def test_build_groups_comments_per_restaurant():
+    df = pd.DataFrame({
+        "Name": ["Joe's", "Joe's", "Joes", "Luigi's"],
+        "restaurant_id": ["r1", "r2", "r1", None],
+        "Comments": ["thin crust pizza", "spicy ramen noodles", "garlic knots",
+                     "thin crust pizza garlic knots"],
+    })
+    index = similarity.CommentSimilarity(similarity.build(df))
+    assert list(index.names) == ["Joe's", "Joe's", "Luigi's"]  # same-named branches both kept
+    top = index.similar("Luigi's", 1)
+    assert top["Name"].tolist() == ["Joe's"]
+    assert top["Comment Similarity"].iloc[0] == pytest.approx(1.0, abs=1e-5)  # r1's comments joined
+
+    by_name = similarity.build(df.drop(columns="restaurant_id"))
+    assert list(by_name["Name"]) == ["Joe's", "Joes", "Luigi's"]
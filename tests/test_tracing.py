@@ -0,0 +1,40 @@
+import os
+import threading
+
+from recsys import tracing
+
+
+def _run(names):
+    tracing.begin("Test")
+    for name in names:
+        with tracing.span(name):
+            pass
+    return tracing.current()["spans"]
+
+
+def _reset(monkeypatch, tmp_path, enabled: bool, max_bytes: int = 2**20) -> str:
+    path = str(tmp_path / "logs" / "trace.jsonl")
+    monkeypatch.setattr(tracing, "TRACE_FILE", path)
+    monkeypatch.setattr(tracing, "LOG_ENABLED", enabled)
+    monkeypatch.setattr(tracing, "MAX_BYTES", max_bytes)
+    monkeypatch.setattr(tracing, "_fh", None)
+    monkeypatch.setattr(tracing, "_local", threading.local())  # no trace left behind
+    return path
+
+
+def test_spans_are_kept_in_memory_without_a_log(monkeypatch, tmp_path):
+    path = _reset(monkeypatch, tmp_path, enabled=False)
+    spans = _run(["load", "rank"])
+    assert [e["name"] for e in spans] == ["load", "rank"]
+    assert not os.path.exists(path)
+
+
+def test_log_rotates_past_the_size_cap(monkeypatch, tmp_path):
+    path = _reset(monkeypatch, tmp_path, enabled=True, max_bytes=1000)
+    _run([f"stage{i}" for i in range(40)])
+    tracing._fh.close()
+
+    names = [e["name"] for e in tracing.read_events(path + ".1") + tracing.read_events(path)]
+    assert os.path.getsize(path) < 1000 and os.path.getsize(path + ".1") < 1200
+    assert names == [f"stage{i}" for i in range(40 - len(names), 40)]
+    assert not os.path.exists(path + ".2")